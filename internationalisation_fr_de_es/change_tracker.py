@@ -0,0 +1,222 @@
+"""
+CHANGE TRACKER FILE
+
+Answers "has anything changed since the last commit?" without a full
+git status. After each commit the (path, mtime, size) of every tracked file,
+the mtime of every folder and the git index/HEAD state are saved to a
+manifest next to the clone. Any difference means "maybe changed" and the
+caller falls back to git; no difference means nothing changed. When
+inotify_simple is installed and I18N_CHANGE_WATCH=1, a watcher process
+flags the first change so the check does not even stat the tree.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tracing
+
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+# Files modified this close to the recording are "racily clean" and re-checked by git
+RACY_WINDOW_NS = 2 * 10**9
+
+# Manifest Location
+def manifest_path_for(repo_path):
+    repo_path = os.path.abspath(repo_path)
+    return os.path.join(os.path.dirname(repo_path), f".{os.path.basename(repo_path)}.manifest.json")
+
+def marker_path_for(repo_path):
+    """File the inotify watcher writes its pid into, and 'changed' on the first event."""
+    return manifest_path_for(repo_path)[:-len(".manifest.json")] + ".watch"
+
+def stat_key(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+# Folder Walk
+def iter_folders(repo_path):
+    """Yield every work tree folder (relative, '' for the root), skipping .git."""
+    for root, dirs, _files in os.walk(repo_path):
+        dirs[:] = [name for name in dirs if name != ".git"]
+        yield "" if root == repo_path else os.path.relpath(root, repo_path).replace(os.sep, "/")
+
+# Git State
+def git_state(repo_path):
+    """Index and HEAD mtimes: staging or moving HEAD changes git status without touching files."""
+    git_dir = os.path.join(repo_path, ".git")
+    return {"index": stat_key(os.path.join(git_dir, "index")), "head": stat_key(os.path.join(git_dir, "HEAD"))}
+
+# Record Manifest
+def record(repo_path):
+    """Save the manifest of the current (clean) tree.
+
+    Call after a successful commit, and after git confirmed a "maybe changed" tree is clean.
+    """
+    result = tracing.run(['git', '-C', repo_path, 'ls-files', '-z'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True)
+    recorded_ns = time.time_ns()
+    files = {}
+    for rel_path in result.stdout.decode("utf-8", errors="surrogateescape").split("\0"):
+        if rel_path:
+            key = stat_key(os.path.join(repo_path, rel_path))
+            # A racily clean file could change again within the same mtime tick
+            files[rel_path] = None if key and key[0] >= recorded_ns - RACY_WINDOW_NS else key
+    manifest = {
+        "recorded_ns": recorded_ns,
+        "files": files,
+        "folders": {folder: stat_key(os.path.join(repo_path, folder))[0] for folder in iter_folders(repo_path)},
+        "git": git_state(repo_path),
+    }
+    manifest_path = manifest_path_for(repo_path)
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    start_watcher(repo_path)
+    return manifest
+
+def load_manifest(repo_path):
+    try:
+        with open(manifest_path_for(repo_path), "r", encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+
+# Watcher Answer
+def watcher_answer(repo_path):
+    """True/False from a live inotify watcher, or None when no watcher is running."""
+    try:
+        with open(marker_path_for(repo_path), "r", encoding="utf-8") as marker:
+            content = marker.read().strip()
+    except OSError:
+        return None
+    if content == "changed":
+        return True
+    if not content.isdigit() or not is_watcher(int(content), repo_path):
+        return None
+    return False
+
+def is_watcher(pid, repo_path):
+    """True when pid is a live `change_tracker.py watch <repo>` process, not a reused pid."""
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as cmdline:
+            args = cmdline.read().decode("utf-8", "surrogateescape").split("\0")
+    except OSError:
+        return False  # Dead, or no /proc: inotify watchers only run on Linux anyway
+    args = [arg for arg in args if arg]
+    return (len(args) >= 3 and os.path.basename(args[-3]) == os.path.basename(__file__)
+            and args[-2] == "watch" and args[-1] == os.path.abspath(repo_path))
+
+# Has Changes
+def has_changes(repo_path):
+    """Return False only when nothing changed since the last record(); None without a manifest.
+
+    True means "maybe changed": the caller should ask git.
+    """
+    manifest = load_manifest(repo_path)
+    if manifest is None:
+        return None
+    watched = watcher_answer(repo_path)
+    if watched is not None:
+        return watched
+    return tree_differs(repo_path, manifest)
+
+def tree_differs(repo_path, manifest, racy_after_record=False):
+    """Compare the tree with the manifest; True means "maybe changed".
+
+    Racily clean files always count as changed, unless racy_after_record:
+    then only a modification after the recording does.
+    """
+    if git_state(repo_path) != manifest["git"]:
+        return True
+    for rel_path, key in manifest["files"].items():
+        current = stat_key(os.path.join(repo_path, rel_path))
+        if key is None:
+            if not racy_after_record or current is None or current[0] > manifest["recorded_ns"]:
+                return True
+        elif current != key:
+            return True
+    # A new, removed or renamed file changes the mtime of its folder
+    folders = manifest["folders"]
+    for folder in iter_folders(repo_path):
+        if folders.get(folder) != stat_key(os.path.join(repo_path, folder))[0]:
+            return True
+    return False
+
+# Inotify Watcher
+def start_watcher(repo_path):
+    """Start a background inotify watcher when enabled and available."""
+    if inotify_simple is None or os.environ.get("I18N_CHANGE_WATCH") != "1":
+        return False
+    if watcher_answer(repo_path) is False:
+        return True  # A live watcher has not seen any change yet
+    try:
+        os.remove(marker_path_for(repo_path))
+    except OSError:
+        pass
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "watch", os.path.abspath(repo_path)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    return True
+
+def watch(repo_path):
+    """Block until the first change in the work tree, then mark it and exit."""
+    flags = inotify_simple.flags
+    mask = (flags.MODIFY | flags.ATTRIB | flags.CREATE | flags.DELETE | flags.MOVED_FROM
+            | flags.MOVED_TO | flags.CLOSE_WRITE | flags.DELETE_SELF)
+    marker_path = marker_path_for(repo_path)
+    with inotify_simple.INotify() as notifier:
+        for folder in iter_folders(repo_path):
+            notifier.add_watch(os.path.join(repo_path, folder), mask)
+        # The index and HEAD change on staging and on commits made outside the scripts
+        notifier.add_watch(os.path.join(repo_path, ".git"), flags.MODIFY | flags.CREATE | flags.MOVED_TO)
+        # Edits made between record() and arming the watches raised no event
+        manifest = load_manifest(repo_path)
+        if manifest is not None and not tree_differs(repo_path, manifest, racy_after_record=True):
+            with open(marker_path, "w", encoding="utf-8") as marker:
+                marker.write(str(os.getpid()))
+            for event in notifier.read():
+                if event.name.endswith(".lock"):
+                    continue
+                break
+        with open(marker_path, "w", encoding="utf-8") as marker:
+            marker.write("changed")
+
+# Verify Against Git
+def verify(repo_path):
+    """Compare the tracker with git status; returns (tracker answer, git answer, consistent)."""
+    tracked = has_changes(repo_path)
+    result = tracing.run(['git', '--no-optional-locks', '-C', repo_path, 'status', '--porcelain'], stdout=subprocess.PIPE, text=True, check=True)
+    git_changed = bool(result.stdout.strip())
+    # The tracker may over-report (then git is asked) but must never miss a change
+    return tracked, git_changed, not (git_changed and tracked is False)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Track work tree changes without running git status.")
+    parser.add_argument("command", choices=["record", "check", "verify", "watch"], help="Tracker command")
+    parser.add_argument("repo_path", type=str, help="Path of the local repository")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        print(f"Recorded {len(record(args.repo_path)['files'])} tracked files")
+    elif args.command == "check":
+        print({True: "Changes detected", False: "No changes", None: "No manifest"}[has_changes(args.repo_path)])
+    elif args.command == "verify":
+        tracked, git_changed, consistent = verify(args.repo_path)
+        print(f"tracker={tracked} git={git_changed} {'OK' if consistent else 'MISSED CHANGE'}")
+        sys.exit(0 if consistent else 1)
+    elif inotify_simple is None:
+        sys.exit("inotify_simple is not installed")
+    else:
+        watch(args.repo_path)
+
+#  python3 change_tracker.py verify MortgageApplication
@@ -11,9 +11,13 @@ CHECKOUT FILE
 import os
 import subprocess
 import argparse
-import gettext
 from datetime import datetime
 from langdetect import detect, DetectorFactory
+import push_queue
+import workspace_state
+import tracing
+import metrics
+import message_format
 
 DetectorFactory.seed = 0  # Ensures consistent language detection
 
@@ -33,12 +37,7 @@ def detect_language(user_input):
 
 # Setup Translation
 def setup_translation(selected_lang):
-    output_lang = f"en-{selected_lang}"
-    translation = gettext.translation(
-        "messages", localedir=LOCALE_PATH, languages=[output_lang], fallback=True
-    )
-    translation.install()
-    return translation.gettext
+    return message_format.formatter(selected_lang).gettext
 
 # Log Messages
 def log_to_file(message, LOG_FILE):
@@ -60,9 +59,9 @@ def is_git_repo(folder_path, LOG_FILE):
 def list_branches(repo_path, LOG_FILE):
     """List all available branches in the repository."""
     try:
-        result = subprocess.run(['git', '-C', repo_path, 'branch', '-a'], check=True, text=True, capture_output=True)
+        result = tracing.run(['git', '-C', repo_path, 'branch', '-a'], check=True, text=True, capture_output=True)
         branches = result.stdout.strip().split('\n')
-        log_to_file(_("Listed branches in repository {repo_path}.").format(repo_path=repo_path), LOG_FILE)
+        log_to_file(fmt.nformat("Listed {n} branch in repository {repo_path}.", "Listed {n} branches in repository {repo_path}.", len(branches), repo_path=repo_path), LOG_FILE)
         return branches
     except subprocess.CalledProcessError as e:
         log_to_file(_("Error listing branches in {repo_path}: {error}").format(repo_path=repo_path, error=e), LOG_FILE)
@@ -72,7 +71,7 @@ def list_branches(repo_path, LOG_FILE):
 def checkout_branch(repo_path, branch_name, LOG_FILE):
     """Try to checkout a branch, handle errors, and fallback if needed."""
     try:
-        subprocess.run(['git', '-C', repo_path, 'checkout', branch_name], check=True)
+        tracing.run(['git', '-C', repo_path, 'checkout', branch_name], check=True)
         message = _("Checked out branch '{branch_name}'.").format(branch_name=branch_name)
         log_to_file(message, LOG_FILE)
         return message
@@ -80,7 +79,7 @@ def checkout_branch(repo_path, branch_name, LOG_FILE):
         log_to_file(_("Error checking out branch '{branch_name}': {error}").format(branch_name=branch_name, error=e), LOG_FILE)
         fallback_branch = "main"  
         try:
-            subprocess.run(['git', '-C', repo_path, 'checkout', fallback_branch], check=True)
+            tracing.run(['git', '-C', repo_path, 'checkout', fallback_branch], check=True)
             message = _("Checked out fallback branch '{fallback_branch}' successfully.").format(fallback_branch=fallback_branch)
             log_to_file(message, LOG_FILE)
             return message
@@ -90,21 +89,22 @@ def checkout_branch(repo_path, branch_name, LOG_FILE):
 
 # Push Git Branch
 def push_branch(repo_path, branch_name, LOG_FILE):
-    """Push a new branch to the remote repository."""
-    try:
-        subprocess.run(['git', '-C', repo_path, 'push', '-u', 'origin', branch_name], check=True)
-        message = _("Branch '{branch_name}' pushed to remote repository.").format(branch_name=branch_name)
-        log_to_file(message, LOG_FILE)
-        print(message)
-    except subprocess.CalledProcessError as e:
-        log_to_file(_("Error pushing branch '{branch_name}': {error}").format(branch_name=branch_name, error=e), LOG_FILE)
+    """Queue a push of the branch; the background worker pushes it and retries while offline."""
+    pending = push_queue.enqueue(repo_path, branch_name, set_upstream=True)
+    message = _("Branch '{branch_name}' queued for push to remote repository ({pending} pending).").format(branch_name=branch_name, pending=pending)
+    log_to_file(message, LOG_FILE)
+    return message
 
 # Main Execution
 def main(repo_name, base_url, branch_name, active_path, user_input):
     """Main function to process the repository."""
-    selected_lang = detect_language(user_input)
-    global _  # Set the global translation function
-    _ = setup_translation(selected_lang)
+    metrics.install(active_path)
+    with tracing.span("detect_language"):
+        selected_lang = detect_language(user_input)
+    global _, fmt  # Set the global translation function and plural-aware formatter
+    with tracing.span("load_catalog", lang=selected_lang):
+        _ = setup_translation(selected_lang)
+        fmt = message_format.formatter(selected_lang)
 
     LOG_FILE = os.path.join(active_path, "internet_connection_log.txt")
     repo_url = f"{base_url}/{repo_name}.git"
@@ -115,7 +115,9 @@ def main(repo_name, base_url, branch_name, active_path, user_input):
         log_to_file(message, LOG_FILE)
         return message
 
-    return checkout_branch(clone_path, branch_name, LOG_FILE)
+    result = checkout_branch(clone_path, branch_name, LOG_FILE)
+    workspace_state.record(active_path, repo_name)
+    return result
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process repository name and base URL.")
@@ -126,7 +128,8 @@ if __name__ == "__main__":
     parser.add_argument("user_input", type=str, help="User input to detect language")
 
     args = parser.parse_args()
-    print(main(args.repo_name, args.base_url, args.branch_name, args.active_path, args.user_input))
+    with tracing.span("checkout_branch_detect"):
+        print(main(args.repo_name, args.base_url, args.branch_name, args.active_path, args.user_input))
 
 
 #   python3 checkout_branch_detect.py MortgageApplication https://github.com/gmsadmin-git Feature/Demo /Users/thrisham/Desktop/cobol_code/Internationalization "Guten Morgen"
@@ -10,9 +10,13 @@ import os
 import subprocess
 import shutil
 import argparse
-import gettext
 from datetime import datetime
 from langdetect import detect, DetectorFactory
+import workspace_state
+import tracing
+import message_format
+import metrics
+import codepage
 
 DetectorFactory.seed = 0  # Ensure consistent language detection
 
@@ -31,12 +35,7 @@ def detect_language(user_input):
 
 # Setup Translation
 def setup_translation(selected_lang):
-    output_lang = f"en-{selected_lang}"  
-    translation = gettext.translation(
-        "messages", localedir=LOCALE_PATH, languages=[output_lang], fallback=True
-    )
-    translation.install()
-    return translation.gettext
+    return message_format.formatter(selected_lang).gettext
 
 # Log Messages
 def log_to_file(message, log_file):
@@ -48,15 +47,16 @@ def log_to_file(message, log_file):
 
 # Clone Repository
 def clone_repo(repo_url, clone_path, _):
+    """Clone the repository; returns (ok, message)."""
     try:
         log_to_file(_("Cloning repository..."), log_file)
-        subprocess.run(['git', 'clone', repo_url, clone_path], check=True, stderr=subprocess.PIPE)
+        tracing.run(['git', 'clone', repo_url, clone_path], check=True, stderr=subprocess.PIPE)
         log_to_file(_("Repository cloned successfully."), log_file)
-        return _("Repository cloned successfully.")
+        return True, _("Repository cloned successfully.")
     except subprocess.CalledProcessError as e:
         error_message = _("Error cloning repository.")
         log_to_file(f"{error_message} - {e.stderr.decode().strip()}", log_file)
-        return error_message
+        return False, error_message
 
 # Check if Git Repository
 def is_git_repo(folder_path):
@@ -64,17 +64,18 @@ def is_git_repo(folder_path):
 
 # Pull Latest Changes with Fixes for "Cannot Lock Ref"
 def pull_latest_changes(repo_path, branch, _):
+    """Fetch and pull; returns (ok, message)."""
     try:
         log_to_file(_("Repository already cloned. Pulling latest changes..."), log_file)
-        subprocess.run(['git', '-C', repo_path, 'fetch', '--prune'], check=True)
-        result = subprocess.run(['git', '-C', repo_path, 'pull'], check=True, stderr=subprocess.PIPE)
+        tracing.run(['git', '-C', repo_path, 'fetch', '--prune'], check=True)
+        result = tracing.run(['git', '-C', repo_path, 'pull'], check=True, stderr=subprocess.PIPE)
         log_to_file(_("Latest changes pulled successfully."), log_file)
-        return _("Latest changes pulled successfully.")
+        return True, _("Latest changes pulled successfully.")
     except subprocess.CalledProcessError as e:
         error_message = _("Error pulling latest changes.")
         log_to_file(f"{error_message} - {e.stderr.decode().strip()}", log_file)
-        subprocess.run(['git', '-C', repo_path, 'reset', '--hard', f'origin/{branch}'], check=False)
-        return error_message
+        tracing.run(['git', '-C', repo_path, 'reset', '--hard', f'origin/{branch}'], check=False)
+        return False, error_message
 
 # Delete Folder
 def delete_folder(folder_path, _):
@@ -90,23 +91,32 @@ def delete_folder(folder_path, _):
 # Main Execution
 def main(repo_name, base_url, active_path, user_input, branch="Feature/Demo"):
     global log_file
-    selected_lang = detect_language(user_input)
-    _ = setup_translation(selected_lang)
+    metrics.install(active_path)
+    with tracing.span("detect_language"):
+        selected_lang = detect_language(user_input)
+    with tracing.span("load_catalog", lang=selected_lang):
+        _ = setup_translation(selected_lang)
 
     log_file = os.path.join(active_path, "internet_connection_log.txt")
     repo_url = f"{base_url}/{repo_name}.git"
     clone_path = os.path.join(active_path, repo_name)
 
     if not os.path.isdir(clone_path):
-        return clone_repo(repo_url, clone_path, _)
-
-    if is_git_repo(clone_path):
-        return pull_latest_changes(clone_path, branch, _)
+        fetched, result = clone_repo(repo_url, clone_path, _)
+    elif is_git_repo(clone_path):
+        fetched, result = pull_latest_changes(clone_path, branch, _)
+    elif delete_folder(clone_path, _):
+        workspace_state.forget(active_path, repo_name)
+        fetched, result = clone_repo(repo_url, clone_path, _)
     else:
-        if delete_folder(clone_path, _):
-            return clone_repo(repo_url, clone_path, _)
-        else:
-            return _("Operation canceled.")
+        return _("Operation canceled.")
+
+    # Keep the workspace snapshot current for status queries
+    workspace_state.record(active_path, repo_name, fetched=fetched)
+    if fetched and codepage.enabled():
+        with tracing.span("codepage_to_host"):
+            log_to_file(f"Host code page mirror: {codepage.describe(codepage.after_fetch(clone_path))}", log_file)
+    return result
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process repository cloning and updating.")
@@ -118,7 +128,8 @@ if __name__ == "__main__":
     parser.add_argument("--branch", type=str, default="Feature/Demo", help="Branch to clone")
 
     args = parser.parse_args()
-    result = main(args.repo_name, args.base_url, args.active_path, args.user_input, args.branch)
+    with tracing.span("clone_detect"):
+        result = main(args.repo_name, args.base_url, args.active_path, args.user_input, args.branch)
 
 
 
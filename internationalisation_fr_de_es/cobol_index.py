@@ -0,0 +1,358 @@
+"""
+COBOL INDEX FILE
+
+Indexes PROGRAM-ID, COPY, CALL and paragraph names of the COBOL/BMS sources
+so programs and copybooks can be opened without walking the whole tree.
+Lookups trust the stored index: it is refreshed from the files git reports
+changed since the commit it was built at, and only the file that matched a
+lookup is re-checked on disk.
+"""
+
+import os
+import re
+import json
+import argparse
+import subprocess
+import tracing
+
+# Source types picked up by the indexer
+SOURCE_EXTENSIONS = {
+    ".cbl": "program",
+    ".cob": "program",
+    ".cpy": "copybook",
+    ".bms": "bms",
+}
+
+INDEX_VERSION = 2
+
+PROGRAM_ID_RE = re.compile(r"\bPROGRAM-ID\s*\.?\s*['\"]?([A-Z0-9#@$-]+)", re.IGNORECASE)
+COPY_RE = re.compile(r"\bCOPY\s+['\"]?([A-Z0-9#@$-]+)", re.IGNORECASE)
+CALL_RE = re.compile(r"\bCALL\s+['\"]([A-Z0-9#@$-]+)['\"]", re.IGNORECASE)
+LINK_RE = re.compile(r"\b(?:LINK|XCTL)\s+PROGRAM\s*\(\s*['\"]([A-Z0-9#@$-]+)['\"]", re.IGNORECASE)
+PARAGRAPH_RE = re.compile(r"^([A-Z0-9][A-Z0-9-]*)(?:\s+SECTION)?\s*\.\s*$", re.IGNORECASE)
+PROCEDURE_RE = re.compile(r"\bPROCEDURE\s+DIVISION\b", re.IGNORECASE)
+BMS_MACRO_RE = re.compile(r"^([A-Z0-9#@$]+)\s+(DFHMSD|DFHMDI)\b", re.IGNORECASE)
+
+# Index Location
+def index_path_for(repo_path):
+    """Return the index file kept next to the repository (never inside it)."""
+    repo_path = os.path.abspath(repo_path)
+    return os.path.join(os.path.dirname(repo_path), f".{os.path.basename(repo_path)}.index.json")
+
+# Source Text
+def source_text(line):
+    """Return the code area of a COBOL line, or None for comment lines."""
+    line = line.rstrip("\r\n")
+    prefix = line[:6]
+    if len(line) > 6 and (not prefix.strip() or prefix.isdigit()):
+        indicator = line[6]
+        if indicator in "*/":
+            return None
+        return line[7:72]
+    # Free format line (e.g. 'IDENTIFICATION DIVISION.' starting in column 1)
+    if line.lstrip().startswith("*>"):
+        return None
+    return line
+
+# Scan COBOL Source
+def scan_cobol(file_path):
+    """Stream a COBOL program or copybook and collect its symbols."""
+    entry = {"program_ids": {}, "copies": [], "calls": [], "paragraphs": {}}
+    in_procedure = False
+    with open(file_path, "r", encoding="utf-8", errors="replace") as source:
+        for line_no, line in enumerate(source, start=1):
+            text = source_text(line)
+            if not text or not text.strip():
+                continue
+            match = PROGRAM_ID_RE.search(text)
+            if match:
+                entry["program_ids"].setdefault(match.group(1).upper(), line_no)
+                in_procedure = False  # Nested programs start a new procedure division
+                continue
+            if PROCEDURE_RE.search(text):
+                in_procedure = True
+                continue
+            for match in COPY_RE.finditer(text):
+                member = match.group(1).upper()
+                if member not in entry["copies"]:
+                    entry["copies"].append(member)
+            for regex in (CALL_RE, LINK_RE):
+                for match in regex.finditer(text):
+                    target = match.group(1).upper()
+                    if target not in entry["calls"]:
+                        entry["calls"].append(target)
+            if in_procedure and text[:4].strip():
+                match = PARAGRAPH_RE.match(text.strip())
+                if match and match.group(1).upper() not in ("EXIT", "GOBACK"):
+                    entry["paragraphs"].setdefault(match.group(1).upper(), line_no)
+    return entry
+
+# Scan BMS Source
+def scan_bms(file_path):
+    """Stream a BMS mapset and collect its mapset and map names."""
+    entry = {"mapsets": {}, "maps": {}}
+    with open(file_path, "r", encoding="utf-8", errors="replace") as source:
+        for line_no, line in enumerate(source, start=1):
+            if line.startswith("*"):
+                continue
+            match = BMS_MACRO_RE.match(line)
+            if not match:
+                continue
+            key = "mapsets" if match.group(2).upper() == "DFHMSD" else "maps"
+            entry[key].setdefault(match.group(1).upper(), line_no)
+    return entry
+
+# Scan Single File
+def scan_file(file_path, kind):
+    """Scan one source file according to its kind."""
+    if kind == "bms":
+        return scan_bms(file_path)
+    return scan_cobol(file_path)
+
+# Load Index
+def load_index(repo_path):
+    """Load the persisted index, or an empty one if missing or outdated."""
+    try:
+        with open(index_path_for(repo_path), "r", encoding="utf-8") as index_file:
+            index = json.load(index_file)
+        if index.get("version") == INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {"version": INDEX_VERSION, "files": {}, "reverse": {}}
+
+# Save Index
+def save_index(repo_path, index):
+    """Write the index atomically."""
+    index_path = index_path_for(repo_path)
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as index_file:
+        json.dump(index, index_file, separators=(",", ":"), sort_keys=True)  # Compact: loaded on every lookup
+    os.replace(tmp_path, index_path)
+
+# Walk Sources
+def iter_sources(repo_path):
+    """Yield (relative path, kind, stat) for every indexable file in the repo."""
+    stack = [repo_path]
+    while stack:
+        folder = stack.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for item in entries:
+            if item.is_dir(follow_symlinks=False):
+                if not item.name.startswith("."):
+                    stack.append(item.path)
+                continue
+            kind = SOURCE_EXTENSIONS.get(os.path.splitext(item.name)[1].lower())
+            if kind:
+                rel_path = os.path.relpath(item.path, repo_path).replace(os.sep, "/")
+                yield rel_path, kind, item.stat()
+
+# Reverse Dependency Graph
+def dependency_keys(entry):
+    """Return the member names a file depends on (COPY members)."""
+    return entry.get("copies", [])
+
+def unlink_reverse(index, rel_path, entry):
+    """Drop a file from the reverse graph (member -> files that use it)."""
+    reverse = index["reverse"]
+    for member in dependency_keys(entry):
+        users = reverse.get(member, [])
+        if rel_path in users:
+            users.remove(rel_path)
+        if not users:
+            reverse.pop(member, None)
+
+def link_reverse(index, rel_path, entry):
+    """Add a file to the reverse graph for every member it copies."""
+    reverse = index["reverse"]
+    for member in dependency_keys(entry):
+        users = reverse.setdefault(member, [])
+        if rel_path not in users:
+            users.append(rel_path)
+            users.sort()
+
+# Update Index
+def update_index(repo_path, changed_paths=None, index=None, head=None):
+    """Bring the index up to date, rescanning only files whose mtime or size changed.
+
+    When ``changed_paths`` (repo-relative) is given, only those files are checked;
+    otherwise the whole tree is walked and the index is marked as built at HEAD.
+    ``head`` records the commit the index now matches after a partial update.
+    Returns the index and the list of rescanned or removed relative paths.
+    """
+    index = index if index is not None else load_index(repo_path)
+    files = index["files"]
+    touched = []
+
+    if changed_paths is None:
+        candidates = iter_sources(repo_path)
+        seen = set()
+    else:
+        candidates = []
+        for rel_path in changed_paths:
+            kind = SOURCE_EXTENSIONS.get(os.path.splitext(rel_path)[1].lower())
+            if not kind:
+                continue
+            try:
+                candidates.append((rel_path, kind, os.stat(os.path.join(repo_path, rel_path))))
+            except OSError:
+                entry = files.pop(rel_path, None)
+                if entry is not None:
+                    unlink_reverse(index, rel_path, entry)
+                    touched.append(rel_path)
+        seen = None
+
+    for rel_path, kind, stat in candidates:
+        if seen is not None:
+            seen.add(rel_path)
+        entry = files.get(rel_path)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            continue
+        if entry:
+            unlink_reverse(index, rel_path, entry)
+        entry = scan_file(os.path.join(repo_path, rel_path), kind)
+        entry.update({"kind": kind, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size})
+        files[rel_path] = entry
+        link_reverse(index, rel_path, entry)
+        touched.append(rel_path)
+
+    if seen is not None:
+        for rel_path in [path for path in files if path not in seen]:
+            unlink_reverse(index, rel_path, files.pop(rel_path))
+            touched.append(rel_path)
+        head = git_head(repo_path)
+
+    if head and index.get("head") != head:
+        index["head"] = head
+        save_index(repo_path, index)
+    elif touched:
+        save_index(repo_path, index)
+    return index, touched
+
+# Git Head
+def git_head(repo_path):
+    """Return the commit checked out in the repo, or None outside git."""
+    result = tracing.run(['git', '-C', repo_path, 'rev-parse', '--verify', '--quiet', 'HEAD'],
+                         stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return result.stdout.strip() or None
+
+# Lookup Index
+def lookup_index(repo_path):
+    """Return the stored index for lookups without re-validating the tree.
+
+    Without an index (or outside git) it is built with one full walk. When
+    HEAD moved since it was built (pull, checkout, commit) only the files of
+    `git diff` between the two commits are rescanned. Uncommitted edits are
+    caught by resolve_checked(), which re-checks the file that matched.
+    """
+    index = load_index(repo_path)
+    head = git_head(repo_path)
+    if not index["files"] or not head or not index.get("head"):
+        return update_index(repo_path, index=index)[0]
+    if index["head"] != head:
+        result = tracing.run(['git', '-C', repo_path, 'diff', '--name-only', '--relative', '--no-renames', index["head"], head],
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        if result.returncode != 0:
+            return update_index(repo_path, index=index)[0]  # The old commit is gone (rebase, gc)
+        index, _touched = update_index(repo_path, result.stdout.splitlines(), index=index, head=head)
+    return index
+
+# Member Name
+def member_name(rel_path):
+    """Return the PDS-style member name of a source file (upper-case stem)."""
+    return os.path.splitext(os.path.basename(rel_path))[0].upper()
+
+# Find Program
+def find_program(index, program_id):
+    """Return (relative path, line) of the source defining PROGRAM-ID, or None."""
+    program_id = program_id.upper()
+    for rel_path, entry in sorted(index["files"].items()):
+        line_no = entry.get("program_ids", {}).get(program_id)
+        if line_no:
+            return rel_path, line_no
+    return None
+
+# Find Copybook
+def find_copybooks(index, member, program=None):
+    """Return copybook paths for a member, optionally only if the program copies it."""
+    member = member.upper()
+    if program:
+        found = find_program(index, program)
+        if not found or member not in index["files"][found[0]].get("copies", []):
+            return []
+    matches = [
+        rel_path for rel_path, entry in index["files"].items()
+        if entry["kind"] == "copybook" and member_name(rel_path) == member
+    ]
+    # Prefer the hand-written copybook folder over generated BMS copybooks
+    return sorted(matches, key=lambda path: ("bms_copybook/" in path, path))
+
+# Find Paragraph
+def find_paragraph(index, paragraph):
+    """Return (relative path, line) for the first paragraph or section with that name."""
+    paragraph = paragraph.upper()
+    for rel_path, entry in sorted(index["files"].items()):
+        line_no = entry.get("paragraphs", {}).get(paragraph)
+        if line_no:
+            return rel_path, line_no
+    return None
+
+# Resolve Name
+def resolve(index, name, program=None):
+    """Resolve a file name, PROGRAM-ID or copybook member to (relative path, line)."""
+    base_name = os.path.basename(name)
+    if os.path.splitext(base_name)[1]:
+        for rel_path in sorted(index["files"]):
+            if os.path.basename(rel_path) == base_name:
+                return rel_path, 1
+        return None
+    if not program:
+        found = find_program(index, base_name)
+        if found:
+            return found
+    copybooks = find_copybooks(index, base_name, program)
+    if copybooks:
+        return copybooks[0], 1
+    return None
+
+# Resolve Against a Trusted Index
+def resolve_checked(repo_path, index, name, program=None):
+    """resolve() on the stored index, re-checking only the file that matched.
+
+    A matched file that was edited or deleted since it was indexed is rescanned
+    and the name resolved again.
+    """
+    while True:
+        found = resolve(index, name, program)
+        if found is None:
+            return None
+        entry = index["files"][found[0]]
+        try:
+            stat = os.stat(os.path.join(repo_path, found[0]))
+        except OSError:
+            stat = None
+        if stat and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return found
+        index, _touched = update_index(repo_path, [found[0]], index=index)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index COBOL/BMS sources and resolve definitions.")
+    parser.add_argument("repo_path", type=str, help="Path of the local repository")
+    parser.add_argument("name", type=str, nargs="?", help="File name, PROGRAM-ID or copybook member to resolve")
+    parser.add_argument("--program", type=str, help="Only resolve copybooks used by this PROGRAM-ID")
+    parser.add_argument("--paragraph", action="store_true", help="Resolve the name as a paragraph or section")
+
+    args = parser.parse_args()
+    index, touched = update_index(args.repo_path)
+    print(f"Indexed {len(index['files'])} files ({len(touched)} updated)")
+    if args.name:
+        found = find_paragraph(index, args.name) if args.paragraph else resolve(index, args.name, args.program)
+        if found:
+            print(f"{os.path.join(args.repo_path, found[0])}:{found[1]}")
+        else:
+            print(f"'{args.name}' not found")
+
+#  python3 cobol_index.py MortgageApplication EPSMTCOM --program EPSCMORT
@@ -0,0 +1,333 @@
+"""
+CODEPAGE FILE
+
+Keeps a host-encoded (EBCDIC) mirror of a clone for transfer to z/OS. The
+code page of each file comes from DBB file properties in application-conf,
+e.g. 'zosEncoding = cp1140 :: **/*.cbl, **/*.cpy, **/*.bms'. Files are
+converted in streamed chunks with incremental codecs, in parallel across
+files, and only when their content hash changed since the last sync.
+After a clone or pull the work tree is converted to the mirror; before a
+commit, files changed in the mirror are converted back to UTF-8. A file
+edited on both sides is reported and never overwritten.
+Enable by pointing I18N_CODEPAGE_MIRROR at the folder that holds the mirrors.
+"""
+
+import os
+import re
+import json
+import codecs
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import impact_analysis
+
+ENCODING_PROPERTY = "zosEncoding"
+WORK_TREE_ENCODING = "utf-8"
+CHUNK_SIZE = 256 * 1024
+MIRROR_ROOT = os.environ.get("I18N_CODEPAGE_MIRROR")
+
+# Encoding Rules
+def glob_to_regex(pattern):
+    """DBB/ant style glob: '**/' matches any folders (or none), '*' and '?' stay inside one folder."""
+    regex = ""
+    index = 0
+    while index < len(pattern):
+        if pattern.startswith("**/", index):
+            regex += "(?:.*/)?"
+            index += 3
+        elif pattern.startswith("**", index):
+            regex += ".*"
+            index += 2
+        elif pattern[index] == "*":
+            regex += "[^/]*"
+            index += 1
+        elif pattern[index] == "?":
+            regex += "[^/]"
+            index += 1
+        else:
+            regex += re.escape(pattern[index])
+            index += 1
+    return re.compile(regex + r"\Z")
+
+def application_root(repo_path):
+    properties_file = impact_analysis.find_application_properties(repo_path)
+    if properties_file is None:
+        return None, None
+    return os.path.dirname(os.path.dirname(properties_file)), properties_file
+
+def load_rules(repo_path):
+    """Return [(regex, encoding)] from application.properties and its applicationPropFiles, in file order."""
+    app_root, properties_file = application_root(repo_path)
+    if app_root is None:
+        return []
+    conf_dir = os.path.dirname(properties_file)
+    extra = impact_analysis.read_properties(properties_file).get("applicationPropFiles", "")
+    files = [properties_file] + [os.path.join(conf_dir, name.strip()) for name in extra.split(",") if name.strip()]
+    rules = []
+    for file_path in files:
+        if not os.path.isfile(file_path):
+            continue
+        for key, value in impact_analysis.iter_properties(file_path):
+            if key != ENCODING_PROPERTY:
+                continue
+            encoding, _sep, patterns = value.partition("::")
+            encoding = codecs.lookup(encoding.strip()).name  # Fails early on an unknown code page
+            for pattern in (patterns or "**/*").split(","):
+                if pattern.strip():
+                    rules.append((glob_to_regex(pattern.strip()), encoding))
+    return rules
+
+def encoding_for(rules, app_rel_path):
+    """Host code page of a file (path relative to the application folder); the last matching rule wins."""
+    encoding = None
+    for regex, rule_encoding in rules:
+        if regex.match(app_rel_path):
+            encoding = rule_encoding
+    return encoding
+
+# Streamed Conversion
+def convert_file(source_path, target_path, source_encoding, target_encoding, chunk_size=CHUNK_SIZE):
+    """Re-encode one file chunk by chunk; returns (source sha1, target sha1).
+
+    The target is written to a temporary file and renamed, so a character the
+    target code page cannot hold (UnicodeError) leaves the old target intact.
+    """
+    decoder = codecs.getincrementaldecoder(source_encoding)()
+    encoder = codecs.getincrementalencoder(target_encoding)()
+    source_hash, target_hash = hashlib.sha1(), hashlib.sha1()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    tmp_path = f"{target_path}.{os.getpid()}.tmp"
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    try:
+        with open(source_path, "rb", buffering=0) as source, open(tmp_path, "wb") as target:
+            while True:
+                size = source.readinto(buffer)
+                if not size:
+                    break
+                chunk = view[:size]
+                source_hash.update(chunk)
+                encoded = encoder.encode(decoder.decode(chunk))
+                target_hash.update(encoded)
+                target.write(encoded)
+            encoded = encoder.encode(decoder.decode(b"", final=True), final=True)
+            target_hash.update(encoded)
+            target.write(encoded)
+        os.replace(tmp_path, target_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return source_hash.hexdigest(), target_hash.hexdigest()
+
+def file_hash(path, chunk_size=CHUNK_SIZE):
+    digest = hashlib.sha1()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as source:
+        while True:
+            size = source.readinto(buffer)
+            if not size:
+                return digest.hexdigest()
+            digest.update(view[:size])
+
+def convert_job(job):
+    """Pool worker: (rel_path, source, target, source encoding, target encoding) -> (rel_path, hashes or error)."""
+    rel_path, source_path, target_path, source_encoding, target_encoding = job
+    try:
+        return rel_path, convert_file(source_path, target_path, source_encoding, target_encoding)
+    except (OSError, UnicodeError) as error:
+        return rel_path, f"{type(error).__name__}: {error}"
+
+# Mirror And Manifest
+def mirror_path_for(repo_path, mirror_root=None):
+    repo_path = os.path.abspath(repo_path)
+    return os.path.join(mirror_root or MIRROR_ROOT, os.path.basename(repo_path))
+
+def manifest_path_for(repo_path):
+    repo_path = os.path.abspath(repo_path)
+    return os.path.join(os.path.dirname(repo_path), f".{os.path.basename(repo_path)}.codepage.json")
+
+def load_manifest(repo_path):
+    try:
+        with open(manifest_path_for(repo_path), "r", encoding="utf-8") as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return {"files": {}}
+
+def save_manifest(repo_path, manifest):
+    manifest_path = manifest_path_for(repo_path)
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, sort_keys=True)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+def stat_key(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+def iter_rule_files(root, app_root, rules):
+    """Yield (rel_path, encoding) for the files under root that an encoding rule matches."""
+    app_prefix = os.path.relpath(app_root, root).replace(os.sep, "/")
+    app_prefix = "" if app_prefix == "." else app_prefix + "/"
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = [name for name in dirs if name != ".git"]
+        for file_name in files:
+            rel_path = os.path.relpath(os.path.join(folder, file_name), root).replace(os.sep, "/")
+            if not rel_path.startswith(app_prefix):
+                continue
+            encoding = encoding_for(rules, rel_path[len(app_prefix):])
+            if encoding:
+                yield rel_path, encoding
+
+def unchanged(path, record):
+    """True when a file still has the recorded content: same stat, or same hash after a touch."""
+    key = stat_key(path)
+    if key is None or record is None:
+        return False
+    if key == record[:2]:
+        return True
+    if file_hash(path) == record[2]:
+        record[:2] = key  # Touched but not changed: remember the new stat
+        return True
+    return False
+
+# Sync
+def sync(repo_path, to_host=True, mirror_root=None, workers=None):
+    """Convert the changed files in one direction; returns {converted, skipped, removed, conflicts, failed}.
+
+    to_host: work tree (UTF-8) -> mirror (host code page); otherwise mirror -> work tree.
+    Only files whose source side changed are converted. A file changed on both
+    sides is reported as a conflict and left alone on both sides; deleting
+    the unwanted copy (or making both sides equal again) resolves it.
+    """
+    repo_path = os.path.abspath(repo_path)
+    mirror_path = mirror_path_for(repo_path, mirror_root)
+    rules = load_rules(repo_path)
+    stats = {"converted": [], "skipped": 0, "removed": [], "conflicts": [], "failed": {}}
+    app_root, _properties_file = application_root(repo_path)
+    if not rules:
+        return stats
+    source_root, target_root = (repo_path, mirror_path) if to_host else (mirror_path, repo_path)
+    source_side, target_side = ("utf8", "host") if to_host else ("host", "utf8")
+    manifest = load_manifest(repo_path)
+    files = manifest["files"]
+
+    jobs = []
+    seen = set()
+    source_app_root = os.path.join(source_root, os.path.relpath(app_root, repo_path))
+    for rel_path, encoding in iter_rule_files(source_root, source_app_root, rules):
+        seen.add(rel_path)
+        entry = files.get(rel_path)
+        source_path = os.path.join(source_root, rel_path)
+        target_path = os.path.join(target_root, rel_path)
+        if entry and entry["encoding"] == encoding and unchanged(source_path, entry[source_side]):
+            stats["skipped"] += 1  # An edit on the target side is synced by the other direction
+            continue
+        # The first to-host sync may overwrite a stale mirror; anything else edited on the target side is kept
+        if os.path.exists(target_path) and (entry or not to_host) and not (entry and unchanged(target_path, entry[target_side])):
+            stats["conflicts"].append(rel_path)
+            continue
+        source_encoding, target_encoding = (WORK_TREE_ENCODING, encoding) if to_host else (encoding, WORK_TREE_ENCODING)
+        jobs.append((rel_path, source_path, target_path, source_encoding, target_encoding))
+
+    if to_host:
+        # Files deleted from the work tree leave the mirror too; the mirror never deletes work tree files
+        for rel_path in sorted(set(files) - seen):
+            mirror_file = os.path.join(mirror_path, rel_path)
+            if os.path.exists(mirror_file) and not unchanged(mirror_file, files[rel_path]["host"]):
+                stats["conflicts"].append(rel_path)  # Edited in the mirror: keep it
+                continue
+            try:
+                os.remove(mirror_file)
+            except OSError:
+                pass
+            del files[rel_path]
+            stats["removed"].append(rel_path)
+
+    encodings = {job[0]: job[4] if to_host else job[3] for job in jobs}
+    for rel_path, result in run_jobs(jobs, workers):
+        if isinstance(result, str):
+            stats["failed"][rel_path] = result
+            continue
+        source_hash, target_hash = result
+        source_key = stat_key(os.path.join(source_root, rel_path))
+        target_key = stat_key(os.path.join(target_root, rel_path))
+        files[rel_path] = {
+            "encoding": encodings[rel_path],
+            source_side: source_key + [source_hash],
+            target_side: target_key + [target_hash],
+        }
+        stats["converted"].append(rel_path)
+    save_manifest(repo_path, manifest)
+    return stats
+
+def run_jobs(jobs, workers=None):
+    """Convert inline when there is little to do; otherwise fan out across processes."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        return map(convert_job, jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(convert_job, jobs, chunksize=8))
+
+# Clone / Commit Hooks
+def enabled():
+    return bool(MIRROR_ROOT)
+
+def after_fetch(repo_path):
+    """After a clone or pull: refresh the host mirror from the work tree."""
+    return sync(repo_path, to_host=True) if enabled() else None
+
+def before_commit(repo_path):
+    """Before a commit: bring files edited in the host mirror back into the work tree."""
+    return sync(repo_path, to_host=False) if enabled() else None
+
+def describe(stats):
+    text = f"{len(stats['converted'])} converted, {stats['skipped']} unchanged"
+    if stats["removed"]:
+        text += f", {len(stats['removed'])} removed"
+    if stats["conflicts"]:
+        text += f", {len(stats['conflicts'])} changed on both sides ({', '.join(sorted(stats['conflicts']))})"
+    if stats["failed"]:
+        text += f", {len(stats['failed'])} failed ({', '.join(sorted(stats['failed']))})"
+    return text
+
+# Round Trip Check
+def check(repo_path):
+    """Return {rel_path: problem} for work tree files that do not round-trip through their host code page."""
+    app_root, _properties_file = application_root(repo_path)
+    rules = load_rules(repo_path)
+    problems = {}
+    if not rules:
+        return problems
+    for rel_path, encoding in iter_rule_files(repo_path, app_root, rules):
+        with open(os.path.join(repo_path, rel_path), "rb") as source:
+            data = source.read()
+        try:
+            text = data.decode(WORK_TREE_ENCODING)
+            if text.encode(encoding).decode(encoding) != text:
+                problems[rel_path] = f"does not round-trip through {encoding}"
+        except UnicodeError as error:
+            problems[rel_path] = f"{type(error).__name__}: {error}"
+    return problems
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert COBOL sources between UTF-8 and their z/OS code page.")
+    parser.add_argument("command", choices=["to-host", "from-host", "check"], help="Sync direction, or a round-trip check")
+    parser.add_argument("repo_path", type=str, help="Path of the local repository")
+    parser.add_argument("--mirror", type=str, default=MIRROR_ROOT, help="Folder holding the host-encoded mirrors")
+    parser.add_argument("--workers", type=int, default=None, help="Number of conversion processes")
+
+    args = parser.parse_args()
+    if args.command == "check":
+        problems = check(args.repo_path)
+        for rel_path, problem in sorted(problems.items()):
+            print(f"{rel_path}: {problem}")
+        print(f"{len(problems)} files with problems")
+    elif not args.mirror:
+        parser.error("--mirror or I18N_CODEPAGE_MIRROR is required")
+    else:
+        print(describe(sync(args.repo_path, args.command == "to-host", args.mirror, args.workers)))
+
+#  I18N_CODEPAGE_MIRROR=/Users/thrisham/Desktop/cobol_code/zos python3 codepage.py to-host MortgageApplication
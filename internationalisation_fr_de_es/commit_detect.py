@@ -5,6 +5,19 @@ from datetime import datetime
 from deep_translator import GoogleTranslator
 import langdetect
 from langdetect import detect, DetectorFactory
+import impact_analysis
+import translator_breaker
+import push_queue
+import workspace_state
+import change_tracker
+import tracing
+import metrics
+import codepage
+
+# Remote translator, replaceable with a local fake in tests
+TRANSLATOR_FACTORY = GoogleTranslator
+translation_breaker = translator_breaker.CircuitBreaker()
+translation_cache = translator_breaker.TranslationCache()
 
 def log_to_file(message, LOG_FILE):
     """Logs a message to the log file with a timestamp."""
@@ -13,14 +26,21 @@ def log_to_file(message, LOG_FILE):
         log_file.write(f"{timestamp} - {message}\n")
         log_file.write("-" * 40 + "\n")  # Separator for readability
 
-def translate(message, target_lang):
-    """Translate a message to the target language."""
-    if target_lang == "en":
-        return message  # No translation needed
+def translate(message, target_lang, **kwargs):
+    """Translate a message to the target language and fill in its {placeholders}."""
+    translated = message
+    if target_lang != "en":
+        # Cached text first; after a failure or once the budget is spent, English
+        with tracing.span("translate", lang=target_lang):
+            translated = translator_breaker.guarded_translate(
+                message, target_lang, TRANSLATOR_FACTORY, translation_breaker, translation_cache
+            )
+    if not kwargs:
+        return translated
     try:
-        return GoogleTranslator(source="en", target=target_lang).translate(message)
-    except Exception:
-        return message  # Fallback to English if translation fails
+        return translated.format(**kwargs)
+    except (KeyError, IndexError, ValueError):
+        return message.format(**kwargs)  # A mangled translation: show the English text
 
 def detect_language(user_input):
     try:
@@ -34,19 +54,19 @@ def detect_language(user_input):
 
 def find_file_in_repo(repo_path, file_name, LOG_FILE, detected_lang):
     """Search for the file in the repository folder and subfolders."""
-    log_to_file(translate(f"Searching for file '{file_name}' in repository '{repo_path}'", detected_lang), LOG_FILE)
+    log_to_file(translate("Searching for file '{file_name}' in repository '{repo_path}'", detected_lang, file_name=file_name, repo_path=repo_path), LOG_FILE)
     for root, _, files in os.walk(repo_path):
         if file_name in files:
             file_path = os.path.join(root, file_name)
-            log_to_file(translate(f"File found: {file_path}", detected_lang), LOG_FILE)
+            log_to_file(translate("File found: {file_path}", detected_lang, file_path=file_path), LOG_FILE)
             return file_path
-    log_to_file(translate(f"File '{file_name}' not found in repository '{repo_path}'", detected_lang), LOG_FILE)
+    log_to_file(translate("File '{file_name}' not found in repository '{repo_path}'", detected_lang, file_name=file_name, repo_path=repo_path), LOG_FILE)
     return None
 
 def ensure_on_branch(clone_path, LOG_FILE, detected_lang):
     """Ensure the repository is on a valid branch."""
     try:
-        result = subprocess.run(
+        result = tracing.run(
             ['git', '-C', clone_path, 'symbolic-ref', '--short', 'HEAD'],
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
@@ -54,73 +74,113 @@ def ensure_on_branch(clone_path, LOG_FILE, detected_lang):
             check=True
         )
         current_branch = result.stdout.strip()
-        log_to_file(translate(f"Currently on branch: {current_branch}", detected_lang), LOG_FILE)
+        log_to_file(translate("Currently on branch: {current_branch}", detected_lang, current_branch=current_branch), LOG_FILE)
         return current_branch
     except subprocess.CalledProcessError:
         log_to_file(translate("Repository is in a detached HEAD state.", detected_lang), LOG_FILE)
         new_branch = "fix-detached-head"
-        subprocess.run(['git', '-C', clone_path, 'checkout', '-b', new_branch], check=True)
-        log_to_file(translate(f"Switched to a new branch: {new_branch}", detected_lang), LOG_FILE)
+        tracing.run(['git', '-C', clone_path, 'checkout', '-b', new_branch], check=True)
+        log_to_file(translate("Switched to a new branch: {new_branch}", detected_lang, new_branch=new_branch), LOG_FILE)
         return new_branch
 
+def report_impact(clone_path, LOG_FILE, detected_lang):
+    """Print the build list impacted by the changes against the main build branch."""
+    main_branch, found, changed, builds = impact_analysis.build_list(clone_path)
+    if found:
+        log_to_file(f"Impact analysis against {main_branch}: {len(changed)} changed files, {len(builds)} to build", LOG_FILE)
+        print(translate("Impacted build list against branch {main_branch}:", detected_lang, main_branch=main_branch))
+    else:
+        log_to_file(f"Main build branch {main_branch} not found; impact analysis of the last commit: {len(changed)} changed files, {len(builds)} to build", LOG_FILE)
+        print(translate("Main build branch {main_branch} not found. Impacted build list for the last commit:", detected_lang, main_branch=main_branch))
+    for path in builds:
+        print(f"  {path}")
+    if not builds:
+        print(translate("No programs impacted.", detected_lang))
+    return builds
+
 def main(repo_name, base_url, file_name, commit_message, active_folder_path, user_input):
     """Main function to clone the repo, find or create the file, and commit changes."""
     LOG_FILE = os.path.join(active_folder_path, "internet_connection_log.txt")
+    metrics.install(active_folder_path)
 
     # Detect user language
-    detected_lang = detect_language(user_input)
+    with tracing.span("detect_language"):
+        detected_lang = detect_language(user_input)
     log_to_file(f"Detected language: {detected_lang}, Using translation: en-{detected_lang}", LOG_FILE)
-    print(translate(f"Detected language: {detected_lang}, Using translation: en-{detected_lang}", detected_lang))
+    print(translate("Detected language: {detected_lang}, Using translation: en-{detected_lang}", detected_lang, detected_lang=detected_lang))
 
     repo_url = f"{base_url}/{repo_name}.git"
     clone_path = os.path.join(active_folder_path, repo_name)
 
     log_to_file((f"Starting process for repository: {repo_name}", detected_lang), LOG_FILE)
-    print(translate(f"Starting process for repository: {repo_name}", detected_lang))
+    print(translate("Starting process for repository: {repo_name}", detected_lang, repo_name=repo_name))
 
     if not os.path.exists(clone_path):
         log_to_file((f"Cloning repository from {repo_url} to {clone_path}", detected_lang), LOG_FILE)
-        subprocess.run(["git", "clone", repo_url, clone_path], check=True)
+        tracing.run(["git", "clone", repo_url, clone_path], check=True)
         log_to_file(("Repository cloned successfully", detected_lang), LOG_FILE)
     else:
         log_to_file((f"Repository {repo_name} already exists at {clone_path}", detected_lang), LOG_FILE)
 
-    file_path = find_file_in_repo(clone_path, file_name, LOG_FILE, detected_lang)
+    with tracing.span("find_file", file=file_name):
+        file_path = find_file_in_repo(clone_path, file_name, LOG_FILE, detected_lang)
 
     if file_path:
         log_to_file((f"File {file_name} found in repository", detected_lang), LOG_FILE)
-        print(translate(f"File {file_name} found in repository", detected_lang))
+        print(translate("File {file_name} found in repository", detected_lang, file_name=file_name))
     else:
         file_path = os.path.join(clone_path, file_name)
         open(file_path, 'w').close()
         log_to_file((f"File {file_name} not found. Created new file at {file_path}", detected_lang), LOG_FILE)
-        print(translate(f"File {file_name} not found. Created new file at {file_path}", detected_lang))
+        print(translate("File {file_name} not found. Created new file at {file_path}", detected_lang, file_name=file_name, file_path=file_path))
 
     # Ensure we are on a valid branch
     current_branch = ensure_on_branch(clone_path, LOG_FILE, detected_lang)
 
+    if codepage.enabled():
+        # Files edited in the host-encoded mirror come back as UTF-8 before git looks
+        with tracing.span("codepage_from_host"):
+            log_to_file(f"Host code page mirror: {codepage.describe(codepage.before_commit(clone_path))}", LOG_FILE)
+
     try:
         log_to_file(("Checking for untracked files", detected_lang), LOG_FILE)
-        result = subprocess.run(['git', '-C', clone_path, 'status', '--porcelain'], stdout=subprocess.PIPE, text=True)
-        if result.stdout.strip():
+        # The manifest answers "nothing changed" without scanning; otherwise ask git
+        changed = change_tracker.has_changes(clone_path) is not False
+        if changed:
+            result = tracing.run(['git', '-C', clone_path, 'status', '--porcelain'], stdout=subprocess.PIPE, text=True)
+            changed = bool(result.stdout.strip())
+            if not changed:
+                change_tracker.record(clone_path)
+        if changed:
             log_to_file(("Staging all changes", detected_lang), LOG_FILE)
-            subprocess.run(['git', '-C', clone_path, 'add', '.'], check=True)
+            tracing.run(['git', '-C', clone_path, 'add', '.'], check=True)
         else:
             log_to_file(("No changes to stage", detected_lang), LOG_FILE)
             print(translate("No changes detected. Please make changes before committing.", detected_lang))
             return
 
         log_to_file(("Staging and committing changes", detected_lang), LOG_FILE)
-        subprocess.run(['git', '-C', clone_path, 'commit', '-m', commit_message], check=True)
+        tracing.run(['git', '-C', clone_path, 'commit', '-m', commit_message], check=True)
         log_to_file((f"Committing changes with message: {commit_message}", detected_lang), LOG_FILE)
-
-        log_to_file(translate("Pushing changes to the remote repository", detected_lang), LOG_FILE)
-        subprocess.run(['git', '-C', clone_path, 'push', 'origin', current_branch], check=True)
-        log_to_file("Changes pushed to the remote repository successfully", detected_lang), LOG_FILE
-        print(translate("Changes pushed to the remote repository successfully.", detected_lang))
+        # The fresh manifest lets the snapshot mark the tree clean without git status
+        change_tracker.record(clone_path)
+        workspace_state.record(active_folder_path, repo_name)
+
+        try:
+            with tracing.span("impact_analysis"):
+                report_impact(clone_path, LOG_FILE, detected_lang)
+        except Exception as e:
+            # The commit is done: a broken index or unreadable file must not keep it from being pushed
+            log_to_file(f"Impact analysis failed: {e}", LOG_FILE)
+            print(translate("Impact analysis failed: {e}", detected_lang, e=e))
+
+        # The push runs in the background worker so the commit returns immediately
+        pending = push_queue.enqueue(clone_path, current_branch)
+        log_to_file(f"Queued push of branch {current_branch} ({pending} pending)", LOG_FILE)
+        print(translate("Changes queued for push to the remote repository.", detected_lang))
     except subprocess.CalledProcessError as e:
         log_to_file((f"Error during Git operations: {e}", detected_lang), LOG_FILE)
-        print(translate(f"Error processing Git operations: {e}", detected_lang))
+        print(translate("Error processing Git operations: {e}", detected_lang, e=e))
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process repository name, base URL, file name, commit message, and user input.")
@@ -132,6 +192,7 @@ if __name__ == "__main__":
     parser.add_argument("user_input", type=str, help="User input to detect language")
     
     args = parser.parse_args()
-    main(args.repo_name, args.base_url, args.file_name, args.commit_message, args.active_folder_path, args.user_input)
+    with tracing.span("commit_detect"):
+        main(args.repo_name, args.base_url, args.file_name, args.commit_message, args.active_folder_path, args.user_input)
 
 #  python3 commit_detect.py MortgageApplication https://github.com hello.cbl changedd /Users/thrisham/Desktop/cobol_code/Internationalization "Guten Morgen"
\ No newline at end of file
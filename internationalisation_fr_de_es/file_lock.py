@@ -0,0 +1,34 @@
+"""
+FILE LOCK FILE
+
+Exclusive lock on a small lock file, shared by the push queue and the
+metrics store so several processes can update the same JSON files. On
+platforms without fcntl (Windows) the lock is a no-op.
+"""
+
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked access
+    fcntl = None
+
+# Exclusive Lock
+@contextmanager
+def locked(folder, name, blocking=True):
+    """Hold an exclusive lock on folder/name; yields False if non-blocking and already held."""
+    with open(os.path.join(folder, name), "a") as lock_file:
+        if fcntl is None:
+            yield True
+            return
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(lock_file, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
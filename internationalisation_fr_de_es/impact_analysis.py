@@ -0,0 +1,159 @@
+"""
+IMPACT ANALYSIS FILE
+
+Lists the programs a change affects, zAppBuild style: the changed files are
+taken from the diff against ``mainBuildBranch`` and expanded through the
+reverse dependency graph kept in the COBOL index (copybook -> programs,
+BMS mapset -> generated copybook -> programs).
+"""
+
+import os
+import subprocess
+import argparse
+import cobol_index
+import tracing
+
+DEFAULT_MAIN_BRANCH = "main"
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"  # Diff base of a repository's first commit
+
+# Build Kinds that end up in the build list
+BUILDABLE_KINDS = ("program", "bms")
+
+# Read Properties File
+def iter_properties(file_path):
+    """Yield (key, value) pairs of a Java-style .properties file in order (supports '\\' line continuations).
+
+    Keys may repeat, e.g. DBB file properties 'name = value :: pattern, pattern'.
+    """
+    pending = ""
+    with open(file_path, "r", encoding="utf-8", errors="replace") as props:
+        for line in props:
+            line = line.strip()
+            if not pending and (not line or line.startswith(("#", "!"))):
+                continue
+            if line.endswith("\\"):
+                pending += line[:-1]
+                continue
+            line, pending = pending + line, ""
+            key, sep, value = line.partition("=")
+            if sep:
+                yield key.strip(), value.strip()
+
+def read_properties(file_path):
+    """Parse a .properties file into a dict; the last value of a repeated key wins."""
+    return dict(iter_properties(file_path))
+
+# Find application.properties
+def find_application_properties(repo_path):
+    """Locate application-conf/application.properties in the repo or one level below it."""
+    candidates = [os.path.join(repo_path, "application-conf", "application.properties")]
+    try:
+        for item in sorted(os.listdir(repo_path)):
+            candidates.append(os.path.join(repo_path, item, "application-conf", "application.properties"))
+    except OSError:
+        pass
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+# Main Build Branch
+def main_build_branch(repo_path):
+    """Return mainBuildBranch from application.properties, defaulting to 'main'."""
+    properties_file = find_application_properties(repo_path)
+    if properties_file:
+        return read_properties(properties_file).get("mainBuildBranch", DEFAULT_MAIN_BRANCH)
+    return DEFAULT_MAIN_BRANCH
+
+# Run Git
+def run_git(repo_path, *args):
+    """Run a git command in the repo and return its stdout, or None on failure."""
+    result = tracing.run(['git', '-C', repo_path, *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+# Diff Base
+def diff_base(repo_path, main_branch):
+    """Return (commit to diff against, True if it is the merge base with the main build branch).
+
+    When the main build branch cannot be found (not fetched, or named
+    differently) the last commit is compared with its parent instead.
+    """
+    for ref in (f"origin/{main_branch}", main_branch):
+        output = run_git(repo_path, 'merge-base', 'HEAD', ref)
+        if output:
+            return output.strip(), True
+    parent = run_git(repo_path, 'rev-parse', '--verify', '--quiet', 'HEAD~1')
+    return (parent.strip() if parent else EMPTY_TREE), False
+
+# Changed Files
+def changed_files(repo_path, base):
+    """Return repo-relative files changed since base.
+
+    Committed, staged, unstaged and untracked changes are all included.
+    """
+    changed = set()
+    diff = run_git(repo_path, 'diff', '--name-only', '--relative', base)
+    if diff:
+        changed.update(diff.splitlines())
+    untracked = run_git(repo_path, 'ls-files', '--others', '--exclude-standard')
+    if untracked:
+        changed.update(untracked.splitlines())
+    return sorted(path for path in changed if path)
+
+# Impacted Files
+def impacted_files(index, changed):
+    """Walk the reverse graph from the changed files and return every impacted file."""
+    files = index["files"]
+    reverse = index["reverse"]
+    impacted = set()
+    pending = [path for path in changed if path in files]
+    while pending:
+        rel_path = pending.pop()
+        if rel_path in impacted:
+            continue
+        impacted.add(rel_path)
+        entry = files.get(rel_path, {})
+        if entry.get("kind") == "bms":
+            # A mapset is assembled into a copybook of the same name
+            members = list(entry.get("mapsets", {})) or [cobol_index.member_name(rel_path)]
+            pending.extend(path for member in members for path in cobol_index.find_copybooks(index, member))
+        else:
+            members = [cobol_index.member_name(rel_path)]
+        for member in members:
+            pending.extend(reverse.get(member, []))
+    return impacted
+
+# Build List
+def build_list(repo_path, main_branch=None):
+    """Return (main branch, found, changed files, sorted build list) for the repository.
+
+    found is False when the main build branch is missing and only the last commit was analysed.
+    """
+    main_branch = main_branch or main_build_branch(repo_path)
+    base, found = diff_base(repo_path, main_branch)
+    changed = changed_files(repo_path, base)
+    if cobol_index.load_index(repo_path)["files"]:
+        index, _touched = cobol_index.update_index(repo_path, changed)
+    else:
+        index, _touched = cobol_index.update_index(repo_path)
+    impacted = impacted_files(index, changed)
+    builds = sorted(path for path in impacted if index["files"][path]["kind"] in BUILDABLE_KINDS)
+    return main_branch, found, changed, builds
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="List the programs impacted by changes against the main build branch.")
+    parser.add_argument("repo_path", type=str, help="Path of the local repository")
+    parser.add_argument("--main-branch", type=str, default=None, help="Override mainBuildBranch from application.properties")
+
+    args = parser.parse_args()
+    branch, found, changed, builds = build_list(args.repo_path, args.main_branch)
+    if found:
+        print(f"Changed files against {branch}: {len(changed)}")
+    else:
+        print(f"Main build branch {branch} not found; changed files in the last commit: {len(changed)}")
+    for path in builds:
+        print(path)
+
+#  python3 impact_analysis.py MortgageApplication
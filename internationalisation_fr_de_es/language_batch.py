@@ -0,0 +1,170 @@
+"""
+LANGUAGE BATCH FILE
+
+Batch language detection for historical inputs and log lines. Strings that
+are plainly English are answered inline; the rest are classified in chunks by
+a process pool whose workers load the langdetect profiles once.
+"""
+
+import os
+import re
+import time
+import random
+import argparse
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+SUPPORTED = ("fr", "de", "es")
+CHUNK_SIZE = 256
+
+# Common function words: English ones allow the cheap path, the others veto it
+ENGLISH_WORDS = {
+    "the", "a", "an", "and", "or", "to", "of", "in", "on", "for", "with", "is", "are",
+    "was", "be", "not", "no", "please", "file", "files", "repository", "branch", "changes",
+    "error", "successfully", "found", "open", "commit", "pull", "push", "clone", "hello",
+    "hi", "thanks", "thank", "you", "my", "i", "it", "this", "that", "from", "at", "by",
+}
+FOREIGN_WORDS = {
+    "le", "la", "les", "des", "du", "un", "une", "et", "est", "pour", "avec", "bonjour", "merci",
+    "der", "die", "das", "und", "ist", "nicht", "mit", "ein", "eine", "guten", "danke", "morgen",
+    "el", "los", "las", "y", "es", "para", "con", "por", "una", "hola", "gracias", "buenos", "buena",
+}
+WORD_RE = re.compile(r"[a-z]+")
+
+# Cheap English Path
+def cheap_detect(text):
+    """Return (lang, confidence) for strings that need no detector, else None."""
+    if not text.isascii():
+        return None
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return "en", 0.0  # Nothing to detect: the scripts fall back to English too
+    if any(word in FOREIGN_WORDS for word in words):
+        return None
+    english = sum(1 for word in words if word in ENGLISH_WORDS)
+    if english and english * 2 >= len(words):
+        return "en", english / len(words)
+    return None
+
+# Worker Setup
+def warm_detector():
+    """Load the language profiles once per worker process."""
+    from langdetect import DetectorFactory, detect
+    DetectorFactory.seed = 0  # Same answers as the scripts
+    try:
+        detect("warm up")
+    except Exception:
+        pass
+
+def detect_chunk(texts):
+    """Classify a chunk of strings in a worker: [(lang, confidence)]."""
+    from langdetect import detect_langs
+    results = []
+    for text in texts:
+        try:
+            best = detect_langs(text)[0]
+        except Exception:
+            results.append(("en", 0.0))
+            continue
+        lang = best.lang if best.lang in SUPPORTED else "en"
+        results.append((lang, round(best.prob, 4)))
+    return results
+
+# Batch Detection
+def detect_batch(texts, workers=None, chunk_size=CHUNK_SIZE):
+    """Stream (text, lang, confidence) for an iterable of strings, in input order.
+
+    Memory stays bounded: at most a few chunks per worker are in flight.
+    """
+    workers = workers or os.cpu_count() or 1
+    window = deque()  # (chunk texts, cheap results or None, future or None)
+    max_in_flight = workers * 2
+
+    def drain(pending):
+        texts_chunk, cheap_results, future = pending
+        detected = iter(future.result()) if future is not None else iter(())
+        for text, cheap in zip(texts_chunk, cheap_results):
+            lang, confidence = cheap if cheap is not None else next(detected)
+            yield text, lang, confidence
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=warm_detector) as pool:
+        chunk = []
+        for text in texts:
+            chunk.append(text)
+            if len(chunk) < chunk_size:
+                continue
+            window.append(submit(pool, chunk))
+            chunk = []
+            while len(window) > max_in_flight:
+                yield from drain(window.popleft())
+        if chunk:
+            window.append(submit(pool, chunk))
+        while window:
+            yield from drain(window.popleft())
+
+def submit(pool, chunk):
+    """Answer the cheap strings of a chunk inline and send the rest to the pool."""
+    cheap_results = [cheap_detect(text) for text in chunk]
+    remaining = [text for text, cheap in zip(chunk, cheap_results) if cheap is None]
+    future = pool.submit(detect_chunk, remaining) if remaining else None
+    return chunk, cheap_results, future
+
+# Log Lines
+def iter_log_messages(log_path):
+    """Yield the message part of 'timestamp - message' log lines, skipping separators."""
+    with open(log_path, "r", encoding="utf-8", errors="replace") as log_file:
+        for line in log_file:
+            line = line.rstrip("\n")
+            if not line or set(line) == {"-"}:
+                continue
+            _timestamp, sep, message = line.partition(" - ")
+            yield message if sep else line
+
+# Benchmark
+BENCH_SAMPLES = [
+    "Repository already cloned. Pulling latest changes...",
+    "Latest changes pulled successfully.",
+    "Dernières modifications récupérées avec succès.",
+    "Repository erfolgreich geklont.",
+    "Últimos cambios obtenidos con éxito.",
+    "Bonjour, ouvre le fichier hello.cbl",
+    "Guten Morgen, bitte den Branch wechseln",
+    "Hola, quiero abrir el archivo",
+    "Please open the file epsmlist.cbl",
+]
+
+def benchmark(size, workers=None):
+    """Classify `size` synthetic strings; returns (seconds, strings per second, language counts)."""
+    rng = random.Random(0)
+    texts = (rng.choice(BENCH_SAMPLES) + f" #{index}" for index in range(size))
+    counts = Counter()
+    started = time.perf_counter()
+    for _text, lang, _confidence in detect_batch(texts, workers):
+        counts[lang] += 1
+    elapsed = time.perf_counter() - started
+    return elapsed, size / elapsed, counts
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch language detection for inputs and log lines.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    classify = subparsers.add_parser("classify", help="Classify the messages of a log file")
+    classify.add_argument("log_file", type=str, help="Log file such as internet_connection_log.txt")
+    classify.add_argument("--workers", type=int, default=None, help="Number of detector processes")
+    bench = subparsers.add_parser("bench", help="Measure throughput on synthetic strings")
+    bench.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000], help="Batch sizes to measure")
+    bench.add_argument("--workers", type=int, default=None, help="Number of detector processes")
+
+    args = parser.parse_args()
+    if args.command == "classify":
+        counts = Counter()
+        for text, lang, confidence in detect_batch(iter_log_messages(args.log_file), args.workers):
+            counts[lang] += 1
+            print(f"{lang}\t{confidence:.2f}\t{text}")
+        print(dict(counts))
+    else:
+        for size in args.sizes:
+            elapsed, rate, counts = benchmark(size, args.workers)
+            print(f"{size} strings: {elapsed:.2f}s, {rate:,.0f} strings/s, {dict(counts)}")
+
+#  python3 language_batch.py classify internet_connection_log.txt
+#  python3 language_batch.py bench --sizes 10000 1000000
@@ -0,0 +1,246 @@
+"""
+LITERAL EXTRACTOR FILE
+
+Extracts the user-facing text of the CICS screens (BMS INITIAL= operands) and
+of COBOL DISPLAY/VALUE literals into a .pot template and merges it into the
+locale catalogs. Sources are read line by line and spread over a process pool.
+"""
+
+import os
+import re
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import po_catalog
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+POT_FILE = os.path.join(po_catalog.LOCALE_PATH, "screens.pot")
+
+COBOL_EXTENSIONS = (".cbl", ".cob", ".cpy")
+BMS_EXTENSIONS = (".bms",)
+
+# Keywords whose literals are shown to the user
+LITERAL_KEYWORDS = {"DISPLAY", "VALUE", "VALUES"}
+TRANSPARENT_WORDS = {"IS", "ARE", "UPON"}
+
+WORD_RE = re.compile(r"[A-Z0-9][A-Z0-9-]*", re.IGNORECASE)
+TEXT_RE = re.compile(r"[^\W\d_]{2,}")
+IDENTIFIER_RE = re.compile(r"^[A-Z0-9#@$]+$|^\S*[-_/]\S*$")
+INITIAL_RE = re.compile(r"\bINITIAL='((?:[^']|'')*)'", re.IGNORECASE)
+
+# Is Translatable
+def is_translatable(literal):
+    """Keep literals that contain words; skip codes, masks, identifiers and markup."""
+    text = literal.strip()
+    if not TEXT_RE.search(text) or text.startswith("<") or IDENTIFIER_RE.match(text):
+        return False
+    return True
+
+# COBOL Literals
+def iter_cobol_literals(file_path):
+    """Yield (line number, literal) for DISPLAY/VALUE literals of a fixed-format COBOL file.
+
+    Literals continued on a '-' indicator line are joined as the compiler does.
+    """
+    last_word = None
+    pending = None  # (start line, quote, text so far) of a literal running past column 72
+    with open(file_path, "r", encoding="utf-8", errors="replace") as source:
+        for line_no, line in enumerate(source, start=1):
+            line = line.rstrip("\r\n")
+            indicator = line[6:7]
+            if indicator in ("*", "/"):
+                continue
+            code = line[7:72]
+            pos = 0
+            if pending:
+                if indicator != "-":
+                    pending = None
+                else:
+                    start = min((code.find(q) for q in "'\"" if q in code), default=-1)
+                    if start < 0:
+                        pending = None
+                    else:
+                        pos = start + 1
+            while pos < len(code):
+                if pending:
+                    start_line, quote, text = pending
+                else:
+                    char = code[pos]
+                    if char in "'\"":
+                        start_line, quote, text = line_no, char, ""
+                        pos += 1
+                    else:
+                        match = WORD_RE.match(code, pos)
+                        if match:
+                            word = match.group(0).upper()
+                            if word not in TRANSPARENT_WORDS:
+                                last_word = word
+                            pos = match.end()
+                        else:
+                            pos += 1
+                        continue
+                end = code.find(quote, pos)
+                while end >= 0 and code[end + 1:end + 2] == quote:
+                    end = code.find(quote, end + 2)
+                if end < 0:
+                    # Literal continues on the next line: keep the padding up to column 72
+                    pending = (start_line, quote, text + code[pos:].ljust(65 - pos))
+                    break
+                literal = (text + code[pos:end]).replace(quote * 2, quote)
+                pending = None
+                pos = end + 1
+                if last_word in LITERAL_KEYWORDS and is_translatable(literal):
+                    yield start_line, literal
+
+# BMS Statements
+def iter_bms_statements(file_path):
+    """Yield (first line number, statement) for BMS macros, joining column-72 continuations."""
+    statement, start_line, in_quote = None, None, False
+    with open(file_path, "r", encoding="utf-8", errors="replace") as source:
+        for line_no, line in enumerate(source, start=1):
+            line = line.rstrip("\r\n")
+            if statement is None:
+                if not line.strip() or line.startswith("*"):
+                    continue
+                part, start_line = line[:71], line_no
+            else:
+                part = line[15:71]
+            continued = len(line) > 71 and line[71] != " "
+            in_quote ^= part.count("'") % 2 == 1
+            # Outside a quoted operand the rest of the line is padding or remarks
+            if not in_quote:
+                part = part.rstrip()
+            statement = part if statement is None else statement + part
+            if not continued:
+                yield start_line, statement
+                statement, in_quote = None, False
+    if statement is not None:
+        yield start_line, statement
+
+# BMS Literals
+def iter_bms_literals(file_path):
+    """Yield (line number, literal) for every INITIAL= text of a BMS mapset."""
+    for line_no, statement in iter_bms_statements(file_path):
+        for match in INITIAL_RE.finditer(statement):
+            literal = match.group(1).replace("''", "'").replace("&&", "&")
+            if is_translatable(literal):
+                yield line_no, literal
+
+# Extract Single File
+def extract_file(file_path):
+    """Return [(literal, reference)] for one source file."""
+    reference_path = os.path.relpath(file_path, BASE_PATH).replace(os.sep, "/")
+    if file_path.lower().endswith(BMS_EXTENSIONS):
+        literals = iter_bms_literals(file_path)
+    else:
+        literals = iter_cobol_literals(file_path)
+    return [(literal, f"{reference_path}:{line_no}") for line_no, literal in literals]
+
+# Find Sources
+def find_sources(source_path):
+    """Return every COBOL/BMS file below source_path, sorted."""
+    sources = []
+    for root, dirs, files in os.walk(source_path):
+        dirs[:] = [name for name in dirs if not name.startswith(".")]
+        for name in files:
+            if name.lower().endswith(COBOL_EXTENSIONS + BMS_EXTENSIONS):
+                sources.append(os.path.join(root, name))
+    return sorted(sources)
+
+# Extract All Files
+def extract(source_paths, workers=None):
+    """Extract literals from all files over a process pool.
+
+    Returns an ordered {literal: [references]} mapping.
+    """
+    if workers == 1 or len(source_paths) < 2:
+        results = map(extract_file, source_paths)
+        return collect(results)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return collect(pool.map(extract_file, source_paths, chunksize=4))
+
+def collect(results):
+    """Merge per-file results into {literal: [references]}, first occurrence first."""
+    messages = {}
+    for file_results in results:
+        for literal, reference in file_results:
+            messages.setdefault(literal, []).append(reference)
+    return messages
+
+# Write Template
+def write_pot(messages, pot_path=POT_FILE):
+    """Write the .pot template; returns False if the content did not change."""
+    header = po_catalog.new_entry("", "Content-Type: text/plain; charset=UTF-8\n")
+    entries = [header] + [po_catalog.new_entry(msgid, references=refs) for msgid, refs in messages.items()]
+    lines = []
+    for entry in entries:
+        if lines:
+            lines.append("\n")
+        lines.extend(po_catalog.format_entry(entry))
+    content = "".join(lines)
+    try:
+        with open(pot_path, "r", encoding="utf-8") as pot_file:
+            if pot_file.read() == content:
+                return False
+    except OSError:
+        pass
+    with open(pot_path, "w", encoding="utf-8") as pot_file:
+        pot_file.write(content)
+    return True
+
+# Merge Into Catalog
+def merge_catalog(po_path, messages, reference_prefix):
+    """Merge extracted messages into a .po file, rewriting only changed entries.
+
+    References under ``reference_prefix`` are owned by the extractor and are
+    replaced; any other reference of an entry is kept. Returns the number of
+    added or updated entries.
+    """
+    entries = po_catalog.parse_po(po_path)
+    by_msgid = {entry["msgid"]: entry for entry in entries if entry["msgid"]}
+    changed = 0
+
+    for entry in entries:
+        if entry["msgid"] and entry["msgid"] not in messages:
+            kept = [ref for ref in entry["references"] if not ref.startswith(reference_prefix)]
+            if kept != entry["references"]:
+                entry["references"], entry["raw"] = kept, None
+                changed += 1
+
+    for msgid, references in messages.items():
+        entry = by_msgid.get(msgid)
+        if entry is None:
+            entries.append(po_catalog.new_entry(msgid, references=references))
+            changed += 1
+            continue
+        kept = [ref for ref in entry["references"] if not ref.startswith(reference_prefix)]
+        if kept + references != entry["references"]:
+            entry["references"], entry["raw"] = kept + references, None
+            changed += 1
+
+    if changed:
+        po_catalog.write_po(po_path, entries)
+    return changed
+
+# Main Execution
+def main(source_path, workers=None):
+    """Extract literals below source_path, write the template and merge every catalog."""
+    source_path = os.path.abspath(source_path)
+    messages = extract(find_sources(source_path), workers)
+    print(f"Extracted {len(messages)} messages from {source_path}")
+    if write_pot(messages):
+        print(f"Template updated: {POT_FILE}")
+
+    reference_prefix = os.path.relpath(source_path, BASE_PATH).replace(os.sep, "/") + "/"
+    for name, po_path in po_catalog.catalog_paths().items():
+        changed = merge_catalog(po_path, messages, reference_prefix)
+        print(f"{name}: {changed} entries added or updated")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract COBOL/BMS screen text into the translation catalogs.")
+    parser.add_argument("source_path", type=str, help="Folder holding the COBOL/BMS sources")
+    parser.add_argument("--workers", type=int, default=None, help="Number of extractor processes")
+
+    args = parser.parse_args()
+    main(args.source_path, args.workers)
+
+#  python3 literal_extractor.py MortgageApplication
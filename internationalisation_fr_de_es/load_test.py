@@ -0,0 +1,348 @@
+"""
+LOAD TEST FILE
+
+End-to-end benchmark of the workspace scripts. Synthetic repositories (a
+small one, one built from the MortgageApplication template and a large
+monorepo with deep history) are written with git fast-import into bare
+repositories and served as file:// remotes. 1..N simulated users then run
+clone/pull, checkout, open and commit against them concurrently. The results
+are saved as JSON so runs of different versions can be compared.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import metrics
+import push_queue
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(SCRIPT_DIR, "MortgageApplication")
+DEFAULT_WORK_DIR = os.path.join(tempfile.gettempdir(), "i18n_load_test")
+RESULTS_VERSION = 1
+BASE_TIMESTAMP = 1700000000  # Fixed commit dates keep the generated SHAs reproducible
+SCRIPT_TIMEOUT_SECONDS = 600
+USER_INPUT = "Please open the file"  # English: no remote translation during the run
+
+COBOL_PROGRAM = """       IDENTIFICATION DIVISION.
+       PROGRAM-ID. {name}.
+       DATA DIVISION.
+       WORKING-STORAGE SECTION.
+       01 WS-COUNT PIC 9(4) VALUE {value}.
+       PROCEDURE DIVISION.
+           DISPLAY 'PROGRAM {name} RUN {value}'.
+           GOBACK.
+"""
+
+# Fast Import
+def fast_import(bare_path, commits, branches=()):
+    """Write commits [(message, {path: bytes, or None to delete})] onto main of a new bare repository."""
+    if os.path.exists(bare_path):
+        shutil.rmtree(bare_path)
+    subprocess.run(['git', 'init', '-q', '--bare', '-b', 'main', bare_path], check=True)
+    importer = subprocess.Popen(['git', '-C', bare_path, 'fast-import', '--quiet'], stdin=subprocess.PIPE)
+    write = importer.stdin.write
+    number = 0
+    for number, (message, changes) in enumerate(commits, 1):
+        message = message.encode("utf-8")
+        write(b"commit refs/heads/main\nmark :%d\n" % number)
+        write(b"committer Load Test <load-test@example.com> %d +0000\n" % (BASE_TIMESTAMP + number))
+        write(b"data %d\n%s\n" % (len(message), message))
+        for path, content in changes.items():
+            if content is None:
+                write(b"D %s\n" % path.encode("utf-8"))
+            else:
+                write(b"M 100644 inline %s\ndata %d\n%s\n" % (path.encode("utf-8"), len(content), content))
+        write(b"\n")
+    for branch in branches:
+        write(b"reset refs/heads/%s\nfrom :%d\n\n" % (branch.encode("utf-8"), number))
+    importer.stdin.close()
+    if importer.wait() != 0:
+        raise RuntimeError(f"git fast-import failed for {bare_path}")
+
+# Synthetic Repositories
+def small_commits(files=20, depth=10, seed=0):
+    rng = random.Random(seed)
+    tree = {f"src/file{index:03}.txt": f"line {index}\n".encode() for index in range(files)}
+    tree["README.md"] = b"# Small repository\n"
+    yield "Initial commit", tree
+    for number in range(1, depth):
+        path = f"src/file{rng.randrange(files):03}.txt"
+        tree[path] += f"change {number}\n".encode()
+        yield f"Change {number}", {path: tree[path]}
+
+def cobol_commits(depth=50, seed=0):
+    """The MortgageApplication template, then small edits to its COBOL sources."""
+    rng = random.Random(seed)
+    tree = {}
+    for root, _dirs, files in os.walk(TEMPLATE_PATH):
+        for file_name in files:
+            if file_name == "internet_connection_log.txt":
+                continue
+            full_path = os.path.join(root, file_name)
+            with open(full_path, "rb") as source:
+                tree[os.path.relpath(full_path, TEMPLATE_PATH).replace(os.sep, "/")] = source.read()
+    tree.setdefault("README.md", b"# MortgageApplication\n")
+    yield "Import MortgageApplication", dict(tree)
+    programs = sorted(path for path in tree if path.endswith(".cbl"))
+    for number in range(1, depth):
+        path = rng.choice(programs)
+        tree[path] += f"      * Change {number}\n".encode()
+        yield f"Change {number} to {path}", {path: tree[path]}
+
+def monorepo_commits(files=100_000, depth=1_000, files_per_folder=100, changes_per_commit=10, seed=0):
+    """A wide tree of generated COBOL programs with a long history of small changes."""
+    rng = random.Random(seed)
+    paths = [f"src/d{index // files_per_folder:04}/P{index:06}.cbl" for index in range(files)]
+    tree = {path: COBOL_PROGRAM.format(name=f"P{index:06}", value=0).encode() for index, path in enumerate(paths)}
+    tree["README.md"] = b"# Monorepo\n"
+    yield "Initial commit", tree
+    for number in range(1, depth):
+        changes = {}
+        for index in rng.sample(range(files), min(changes_per_commit, files)):
+            changes[paths[index]] = COBOL_PROGRAM.format(name=f"P{index:06}", value=number % 10000).encode()
+        yield f"Change {number}", changes
+
+# Scenario: repo name, generator, file opened by the simulated users
+SCENARIOS = {
+    "small": ("SmallRepo", small_commits, "README.md"),
+    "cobol": ("MortgageApplication", cobol_commits, "EPSCMORT"),
+    "monorepo": ("Monorepo", monorepo_commits, "P000042.cbl"),
+}
+
+def user_branch(user):
+    return f"bench/user-{user}"
+
+def prepare_remote(scenario, remotes_dir, users, **params):
+    """Generate the bare repository of a scenario unless one with the same parameters exists."""
+    repo_name, generator, _target = SCENARIOS[scenario]
+    bare_path = os.path.join(remotes_dir, f"{repo_name}.git")
+    marker_path = os.path.join(bare_path, "load_test.json")
+    wanted = {"scenario": scenario, "users": users, "params": params}
+    try:
+        with open(marker_path, "r", encoding="utf-8") as marker:
+            if json.load(marker) == wanted:
+                return bare_path
+    except (OSError, ValueError):
+        pass
+    os.makedirs(remotes_dir, exist_ok=True)
+    started = time.perf_counter()
+    fast_import(bare_path, generator(**params), [user_branch(user) for user in range(users)])
+    with open(marker_path, "w", encoding="utf-8") as marker:
+        json.dump(wanted, marker)
+    print(f"Generated {bare_path} in {time.perf_counter() - started:.1f}s")
+    return bare_path
+
+def reset_user_branches(bare_path, users):
+    """Point every user branch back at main, dropping the commits pushed by earlier levels."""
+    for user in range(users):
+        subprocess.run(['git', '-C', bare_path, 'update-ref', f'refs/heads/{user_branch(user)}', 'refs/heads/main'], check=True)
+
+# Run One Script
+def run_script(script, args, env):
+    """Run a workspace script; returns (seconds, exit code ok)."""
+    command = [sys.executable, os.path.join(SCRIPT_DIR, script)] + args
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, env=env, timeout=SCRIPT_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        return time.perf_counter() - started, False
+    return time.perf_counter() - started, result.returncode == 0
+
+def git_output(repo_path, *args):
+    result = subprocess.run(['git', '-C', repo_path] + list(args), stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+# Simulated User
+def user_session(scenario, base_url, workspace, user, iteration, env, record):
+    """clone (or pull), checkout, open and commit once; the scripts report errors in text, so each step is checked."""
+    repo_name, _generator, target = SCENARIOS[scenario]
+    clone_path = os.path.join(workspace, repo_name)
+    branch = user_branch(user)
+
+    operation = "pull" if os.path.isdir(clone_path) else "clone"
+    seconds, ok = run_script("clone_detect.py", [repo_name, base_url, workspace, USER_INPUT, "--branch", branch], env)
+    record(operation, seconds, ok and git_output(clone_path, "rev-parse", "HEAD") is not None)
+
+    seconds, ok = run_script("checkout_branch_detect.py", [repo_name, base_url, branch, workspace, USER_INPUT], env)
+    record("checkout", seconds, ok and git_output(clone_path, "symbolic-ref", "--short", "HEAD") == branch)
+
+    seconds, ok = run_script("open_file_detect.py", [repo_name, base_url, target, workspace, USER_INPUT], env)
+    record("open", seconds, ok)
+
+    with open(os.path.join(clone_path, "README.md"), "a", encoding="utf-8") as readme:
+        readme.write(f"user {user} iteration {iteration}\n")
+    head = git_output(clone_path, "rev-parse", "HEAD")
+    seconds, ok = run_script("commit_detect.py", [repo_name, base_url, "README.md", f"Load test {user}/{iteration}", workspace, USER_INPUT], env)
+    record("commit", seconds, ok and git_output(clone_path, "rev-parse", "HEAD") != head)
+
+def wait_for_pushes(workspace, timeout=120):
+    """Let the background push worker drain before the workspace metrics are read."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if not push_queue.load_queue(workspace)["jobs"]:
+            return True
+        time.sleep(0.2)
+    return False
+
+# Load Level
+def run_level(scenario, base_url, work_dir, users, iterations):
+    """Run `users` concurrent sessions `iterations` times each; returns the level result."""
+    level_dir = os.path.join(work_dir, f"users-{users}")
+    if os.path.exists(level_dir):
+        shutil.rmtree(level_dir)
+    workspaces = [os.path.join(level_dir, f"user-{user}") for user in range(users)]
+    for workspace in workspaces:
+        os.makedirs(workspace)
+    env = dict(os.environ, OPEN_FILE_EDITOR="true", GIT_TERMINAL_PROMPT="0", I18N_METRICS="1")
+    # Fresh clones have no identity unless the machine has a global one
+    for role in ("AUTHOR", "COMMITTER"):
+        env.setdefault(f"GIT_{role}_NAME", "Load Test")
+        env.setdefault(f"GIT_{role}_EMAIL", "load-test@example.com")
+    env.pop("I18N_TRACE", None)
+
+    operations = {}
+    lock = threading.Lock()
+
+    def record(operation, seconds, ok):
+        with lock:
+            metrics.observe(operations.setdefault(operation, metrics.new_stats()), seconds * 1e6, ok)
+
+    def session(user):
+        for iteration in range(iterations):
+            user_session(scenario, base_url, workspaces[user], user, iteration, env, record)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(session, range(users)))
+    wall_seconds = time.perf_counter() - started
+
+    drained = all(wait_for_pushes(workspace) for workspace in workspaces)
+    # The git-level histograms every script recorded into its workspace
+    git_level = metrics.merge(metrics.load_metrics(metrics.metrics_path_for(workspace)) for workspace in workspaces)
+    summary = metrics.summarize({"sources": [], "operations": operations})["operations"]
+    for stats in summary.values():
+        stats["ops_per_second"] = round(stats["count"] / wall_seconds, 3)
+    return {
+        "users": users,
+        "iterations": iterations,
+        "wall_seconds": round(wall_seconds, 3),
+        "pushes_drained": drained,
+        "operations": summary,
+        "git_operations": git_level["operations"],
+    }
+
+# Environment
+def environment():
+    return {
+        "revision": git_output(SCRIPT_DIR, "rev-parse", "--short", "HEAD"),
+        "python": platform.python_version(),
+        "git": subprocess.run(['git', '--version'], stdout=subprocess.PIPE, text=True).stdout.strip(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+def run_suite(scenario, user_counts, iterations, work_dir, results_dir=None, **params):
+    """Generate the remote, run every load level and save the results file (under work_dir/results by default)."""
+    remotes_dir = os.path.join(work_dir, "remotes")
+    bare_path = prepare_remote(scenario, remotes_dir, max(user_counts), **params)
+    base_url = f"file://{os.path.abspath(remotes_dir)}"
+    levels = []
+    for users in user_counts:
+        reset_user_branches(bare_path, users)
+        level = run_level(scenario, base_url, os.path.join(work_dir, scenario), users, iterations)
+        levels.append(level)
+        timings = ", ".join(f"{operation} p50 {stats['p50_ms']}ms p95 {stats['p95_ms']}ms"
+                            for operation, stats in level["operations"].items())
+        print(f"{scenario} users={users}: {level['wall_seconds']}s - {timings}")
+    results = {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scenario": scenario,
+        "params": params,
+        "environment": environment(),
+        "levels": levels,
+    }
+    results_dir = results_dir or os.path.join(work_dir, "results")
+    os.makedirs(results_dir, exist_ok=True)
+    results_path = os.path.join(results_dir, f"{scenario}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(results_path, "w", encoding="utf-8") as results_file:
+        json.dump(results, results_file, indent=1, sort_keys=True)
+    return results_path
+
+# Compare Results
+def compare(baseline, current, threshold=0.2):
+    """Lines comparing p50/p95 per load level and operation, and the regressions beyond threshold."""
+    lines, regressions = [], []
+    baseline_levels = {level["users"]: level for level in baseline["levels"]}
+    for level in current["levels"]:
+        old_level = baseline_levels.get(level["users"])
+        if old_level is None:
+            continue
+        for operation, stats in sorted(level["operations"].items()):
+            old = old_level["operations"].get(operation)
+            if old is None:
+                continue
+            for field in ("p50_ms", "p95_ms"):
+                if not old[field] or stats[field] is None:
+                    continue
+                change = stats[field] / old[field] - 1
+                line = f"users={level['users']} {operation} {field}: {old[field]} -> {stats[field]} ({change:+.0%})"
+                lines.append(line)
+                if change > threshold:
+                    regressions.append(line)
+            if stats["failure_rate"] > old["failure_rate"]:
+                line = f"users={level['users']} {operation} failure rate: {old['failure_rate']} -> {stats['failure_rate']}"
+                lines.append(line)
+                regressions.append(line)
+    return lines, regressions
+
+def scenario_params(args):
+    """Generator parameters given on the command line (None means the generator default)."""
+    params = {"files": args.files, "depth": args.depth}
+    if args.scenario == "cobol":
+        params.pop("files")
+    return {key: value for key, value in params.items() if value is not None}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the workspace scripts against generated local remotes.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("generate", "Only generate the bare repository"), ("run", "Generate if needed and run the load levels")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("scenario", choices=sorted(SCENARIOS), help="Synthetic repository to use")
+        sub.add_argument("--files", type=int, default=None, help="Number of files (small and monorepo)")
+        sub.add_argument("--depth", type=int, default=None, help="Number of commits in the history")
+        sub.add_argument("--users", type=int, nargs="+", default=[1, 2, 4], help="Concurrent simulated users per level")
+        sub.add_argument("--work-dir", type=str, default=DEFAULT_WORK_DIR, help="Folder for remotes and workspaces")
+    subparsers.choices["run"].add_argument("--iterations", type=int, default=3, help="Sessions per simulated user")
+    subparsers.choices["run"].add_argument("--results-dir", type=str, default=None, help="Where the JSON results go (default: <work-dir>/results)")
+    compare_parser = subparsers.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("baseline", type=str, help="Results of the reference version")
+    compare_parser.add_argument("current", type=str, help="Results of the version under test")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before failing (0.2 = 20%%)")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file, open(args.current, "r", encoding="utf-8") as current_file:
+            lines, regressions = compare(json.load(baseline_file), json.load(current_file), args.threshold)
+        print("\n".join(lines) or "No common load levels")
+        if regressions:
+            sys.exit(f"{len(regressions)} regressions beyond {args.threshold:.0%}")
+    elif args.command == "generate":
+        prepare_remote(args.scenario, os.path.join(args.work_dir, "remotes"), max(args.users), **scenario_params(args))
+    else:
+        print(f"Results saved to {run_suite(args.scenario, args.users, args.iterations, args.work_dir, args.results_dir, **scenario_params(args))}")
+
+#  python3 load_test.py run cobol --users 1 2 4 8
+#  python3 load_test.py run monorepo --files 100000 --depth 1000 --users 1 4
+#  python3 load_test.py compare /tmp/i18n_load_test/results/cobol-20250101-120000.json /tmp/i18n_load_test/results/cobol-20250201-120000.json
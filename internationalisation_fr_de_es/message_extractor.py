@@ -0,0 +1,252 @@
+"""
+MESSAGE EXTRACTOR FILE
+
+Walks the AST of the scripts, collects every translatable message passed to
+_() or translate(), turns f-strings into keyed templates and generates
+message_ids.py: every message gets an M_* id, and each locale's templates
+are a tuple indexed by that id, read from the compiled .mo catalogs.
+message_format serves lookups from the table while the sha1 of each .mo
+still matches the one recorded here, and falls back to gettext otherwise.
+It also reports untranslated and unused catalog entries per locale.
+"""
+
+import io
+import os
+import re
+import ast
+import sys
+import json
+import gettext
+import hashlib
+import argparse
+import po_catalog
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = ["clone_detect.py", "checkout_branch_detect.py", "open_file_detect.py", "commit_detect.py"]
+TABLE_FILE = os.path.join(BASE_PATH, "message_ids.py")
+
+# Functions whose first argument is a translatable message
+TRANSLATE_FUNCTIONS = {"_", "translate"}
+
+# Placeholder Name
+def placeholder_name(node, position):
+    """Name a template placeholder after the expression it replaces."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return f"arg{position}"
+
+# Template From Node
+def template_from_node(node, source=None):
+    """Return (template, [(name, expression source)]) for a str constant or f-string, else None."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value, []
+    if not isinstance(node, ast.JoinedStr):
+        return None
+    parts, fields = [], []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(value.value.replace("{", "{{").replace("}", "}}"))
+            continue
+        name = placeholder_name(value.value, len(fields))
+        expression = ast.get_source_segment(source, value.value) if source else name
+        if (name, expression) not in fields:
+            if any(existing == name for existing, _expr in fields):
+                name = f"{name}{len(fields)}"
+            fields.append((name, expression))
+        spec = ""
+        if value.format_spec is not None:
+            spec_template = template_from_node(value.format_spec)
+            spec = f":{spec_template[0]}" if spec_template else ""
+        conversion = f"!{chr(value.conversion)}" if value.conversion != -1 else ""
+        parts.append(f"{{{name}{conversion}{spec}}}")
+    return "".join(parts), fields
+
+# Translatable Calls
+def iter_translatable_calls(tree):
+    """Yield every _()/translate() call node with at least one argument."""
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in TRANSLATE_FUNCTIONS and node.args):
+            yield node
+
+# Extract Messages
+def extract_messages(script_paths):
+    """Return an ordered {template: [references]} mapping for the scripts."""
+    messages = {}
+    for script_path in script_paths:
+        with open(script_path, "r", encoding="utf-8") as script:
+            source = script.read()
+        reference_path = os.path.relpath(script_path, BASE_PATH).replace(os.sep, "/")
+        calls = sorted(iter_translatable_calls(ast.parse(source)), key=lambda call: (call.lineno, call.col_offset))
+        for call in calls:
+            found = template_from_node(call.args[0], source)
+            if found and found[0]:
+                messages.setdefault(found[0], []).append(f"{reference_path}:{call.lineno}")
+    return messages
+
+# Rewrite f-strings
+def rewrite_fstrings(script_path):
+    """Rewrite translate(f"...", lang) calls into translate("...", lang, name=value, ...).
+
+    Returns the number of rewritten calls.
+    """
+    with open(script_path, "r", encoding="utf-8") as script:
+        source = script.read()
+    data = source.encode("utf-8")
+    line_starts = [0]
+    for line in data.splitlines(keepends=True):
+        line_starts.append(line_starts[-1] + len(line))
+
+    replacements = []
+    for call in iter_translatable_calls(ast.parse(source)):
+        if call.func.id != "translate" or not isinstance(call.args[0], ast.JoinedStr):
+            continue
+        template, fields = template_from_node(call.args[0], source)
+        other_args = [ast.get_source_segment(source, arg) for arg in call.args[1:] + call.keywords]
+        keywords = [f"{name}={expression}" for name, expression in fields]
+        arguments = ", ".join([json.dumps(template, ensure_ascii=False)] + other_args + keywords)
+        start = line_starts[call.lineno - 1] + call.col_offset
+        end = line_starts[call.end_lineno - 1] + call.end_col_offset
+        replacements.append((start, end, f"translate({arguments})".encode("utf-8")))
+
+    for start, end, replacement in sorted(replacements, reverse=True):
+        data = data[:start] + replacement + data[end:]
+    if replacements:
+        with open(script_path, "w", encoding="utf-8") as script:
+            script.write(data.decode("utf-8"))
+    return len(replacements)
+
+# Load Catalogs
+def load_catalogs():
+    """Return {locale name: {msgid: msgstr}} for every .po catalog."""
+    catalogs = {}
+    for name, po_path in po_catalog.catalog_paths().items():
+        catalogs[name] = {
+            entry["msgid"]: entry["msgstr"]
+            for entry in po_catalog.parse_po(po_path)
+            if entry["msgid"] and isinstance(entry["msgstr"], str)
+        }
+    return catalogs
+
+# Constant Name
+def constant_name(msgid, used):
+    """Build a unique M_* constant name from the first words of a message."""
+    words = re.findall(r"[A-Za-z0-9]+", msgid)[:6] or ["MESSAGE"]
+    name = "M_" + "_".join(words).upper()
+    candidate, suffix = name, 2
+    while candidate in used:
+        candidate, suffix = f"{name}_{suffix}", suffix + 1
+    used.add(candidate)
+    return candidate
+
+# Compiled Catalogs
+def load_compiled_catalogs():
+    """Return {lang: (GNUTranslations, sha1 of the .mo)} for every compiled catalog."""
+    compiled = {}
+    for name, po_path in po_catalog.catalog_paths().items():
+        mo_path = po_path[:-3] + ".mo"
+        try:
+            with open(mo_path, "rb") as mo_file:
+                data = mo_file.read()
+        except OSError:
+            continue
+        compiled[name.split("-")[-1]] = (gettext.GNUTranslations(io.BytesIO(data)), hashlib.sha1(data).hexdigest())
+    return compiled
+
+# Generate Table Module
+def table_source(messages):
+    """Source of the message_ids module; a message missing from a catalog stays English."""
+    msgids = list(messages)
+    compiled = load_compiled_catalogs()
+    used = set()
+    lines = [
+        '"""',
+        "MESSAGE IDS FILE",
+        "",
+        "Generated by message_extractor.py - do not edit by hand.",
+        '"""',
+        "",
+    ]
+    for msg_id, msgid in enumerate(msgids):
+        lines.append(f"{constant_name(msgid, used)} = {msg_id}")
+    lines += ["", "MESSAGES = ("]
+    lines += [f"    {msgid!r}," for msgid in msgids]
+    lines += [")", "", "IDS = {message: msg_id for msg_id, message in enumerate(MESSAGES)}", "", "# sha1 of the .mo each table was read from", "CATALOG_SHA1 = {"]
+    lines += [f'    "{lang}": "{sha1}",' for lang, (_translation, sha1) in sorted(compiled.items())]
+    lines += ["}", "", "CATALOGS = {", '    "en": MESSAGES,']
+    for lang, (translation, _sha1) in sorted(compiled.items()):
+        lines.append(f'    "{lang}": (')
+        lines += [f"        {translation.gettext(msgid)!r}," for msgid in msgids]
+        lines.append("    ),")
+    lines += [
+        "}",
+        "",
+        "# Lookup Message",
+        "def lookup(lang, msg_id):",
+        '    """Return the template of msg_id for a language (fr, de, es or en)."""',
+        "    return CATALOGS.get(lang, MESSAGES)[msg_id]",
+        "",
+    ]
+    return "\n".join(lines)
+
+def generate_table(messages, table_path=TABLE_FILE):
+    """Write the message_ids module; returns False when it was already current."""
+    source = table_source(messages)
+    try:
+        with open(table_path, "r", encoding="utf-8") as table:
+            if table.read() == source:
+                return False
+    except OSError:
+        pass
+    with open(table_path, "w", encoding="utf-8") as table:
+        table.write(source)
+    return True
+
+# Catalog Report
+def report(messages, catalogs):
+    """Return {locale: (untranslated, unused)} lists for the Python messages."""
+    results = {}
+    for name, catalog in sorted(catalogs.items()):
+        untranslated = [msgid for msgid in messages if not catalog.get(msgid)]
+        unused = []
+        for entry in po_catalog.parse_po(po_catalog.catalog_paths()[name]):
+            # Entries referenced from COBOL/BMS sources belong to literal_extractor
+            if entry["msgid"] and entry["msgid"] not in messages and not entry["references"]:
+                unused.append(entry["msgid"])
+        results[name] = (untranslated, unused)
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract translatable messages from the scripts and build message_ids.py.")
+    parser.add_argument("--rewrite", action="store_true", help="Rewrite translate(f'...') calls into keyed templates first")
+    parser.add_argument("--verbose", action="store_true", help="List the untranslated and unused messages")
+    parser.add_argument("--check", action="store_true", help="Only check that message_ids.py is current (exit 1 if not)")
+
+    args = parser.parse_args()
+    script_paths = [os.path.join(BASE_PATH, name) for name in SCRIPTS]
+    if args.rewrite:
+        for script_path in script_paths:
+            count = rewrite_fstrings(script_path)
+            if count:
+                print(f"{os.path.basename(script_path)}: rewrote {count} f-string messages")
+
+    messages = extract_messages(script_paths)
+    if args.check:
+        with open(TABLE_FILE, "r", encoding="utf-8") as table:
+            current = table.read() == table_source(messages)
+        print(f"{os.path.basename(TABLE_FILE)} is {'current' if current else 'stale: run message_extractor.py'}")
+        sys.exit(0 if current else 1)
+    catalogs = load_catalogs()
+    changed = generate_table(messages)
+    print(f"{'Generated' if changed else 'Unchanged'} {os.path.basename(TABLE_FILE)} with {len(messages)} messages")
+    for name, (untranslated, unused) in report(messages, catalogs).items():
+        print(f"{name}: {len(untranslated)} untranslated, {len(unused)} unused")
+        if args.verbose:
+            for msgid in untranslated:
+                print(f"  untranslated: {msgid}")
+            for msgid in unused:
+                print(f"  unused: {msgid}")
+
+#  python3 message_extractor.py --rewrite --verbose
@@ -0,0 +1,200 @@
+"""
+MESSAGE FORMAT FILE
+
+Plural-aware message formatting on top of the gettext catalogs. Each
+locale's Plural-Forms expression is compiled once into a function of n, and
+each translated template into a function of its named arguments, so a call
+is a dict lookup plus the formatting itself instead of a catalog lookup and
+a fresh str.format parse. Singular messages come from the precompiled
+message_ids table (an M_* id is a tuple index) while it matches the .mo
+catalogs; a stale table or an unknown message falls back to gettext.
+"""
+
+import os
+import timeit
+import gettext
+import hashlib
+import argparse
+import functools
+from string import Formatter
+import message_ids
+
+LOCALE_PATH = os.path.join(os.path.dirname(__file__), "locale")
+DOMAIN = "messages"
+DEFAULT_PLURAL_FORMS = "nplurals=2; plural=(n != 1);"  # English and the catalogs without a header
+
+# Plural Forms
+def parse_plural_forms(header):
+    """Split 'nplurals=2; plural=(n > 1);' into (2, '(n > 1)')."""
+    fields = {}
+    for part in (header or DEFAULT_PLURAL_FORMS).split(";"):
+        key, sep, value = part.partition("=")
+        if sep:
+            fields[key.strip()] = value.strip()
+    return int(fields.get("nplurals", 2)), fields.get("plural", "(n != 1)")
+
+@functools.lru_cache(maxsize=None)
+def compile_plural(expression):
+    """Compile a C plural expression into a function n -> form index (validated by gettext.c2py).
+
+    Counts repeat a lot (0, 1, a few files), so the answers are memoized too.
+    """
+    return functools.lru_cache(maxsize=1024)(gettext.c2py(expression))
+
+# Message Table
+def table_for(lang, locale_path=LOCALE_PATH):
+    """message_ids' templates for a language, or None when the .mo changed since they were generated."""
+    if lang == "en":
+        return message_ids.MESSAGES
+    expected = message_ids.CATALOG_SHA1.get(lang)
+    if expected is None:
+        return None
+    try:
+        with open(os.path.join(locale_path, f"en-{lang}", "LC_MESSAGES", f"{DOMAIN}.mo"), "rb") as mo_file:
+            current = hashlib.sha1(mo_file.read()).hexdigest()
+    except OSError:
+        return None
+    return message_ids.CATALOGS[lang] if current == expected else None
+
+# Compiled Templates
+@functools.lru_cache(maxsize=4096)
+def compile_template(template):
+    """Compile a str.format template with named fields into a function of a kwargs dict.
+
+    Simple fields ({name}, {name!r}, {name:>8}) become an f-string built once;
+    anything else (positional, attribute or nested fields) keeps str.format_map.
+    """
+    pieces, literals, fields = [], {}, set()
+    try:
+        parsed = list(Formatter().parse(template))
+    except ValueError:
+        return lambda kwargs: template  # Not a valid template: show it as is
+    for index, (literal, field, spec, conversion) in enumerate(parsed):
+        if literal:
+            literals[f"_l{index}"] = literal
+            pieces.append(f"{{_l{index}}}")
+        if field is None:
+            continue
+        if not field.isidentifier() or "{" in (spec or ""):
+            return template.format_map
+        fields.add(field)
+        conversion = f"!{conversion}" if conversion else ""
+        if spec:
+            literals[f"_s{index}"] = spec
+            pieces.append(f"{{_a[{field!r}]{conversion}:{{_s{index}}}}}")
+        else:
+            pieces.append(f"{{_a[{field!r}]{conversion}}}")
+    if not fields:
+        text = "".join(literal for literal, _field, _spec, _conversion in parsed)
+        return lambda kwargs: text
+    defaults = ", ".join(f"{name}={name}" for name in literals)
+    source = f"lambda _a, {defaults}: f\"{''.join(pieces)}\"" if defaults else f"lambda _a: f\"{''.join(pieces)}\""
+    try:
+        return eval(source, {}, dict(literals))
+    except SyntaxError:
+        return lambda kwargs: template  # e.g. "{a!x}", which str.format rejects too
+
+# Message Formatter
+class MessageFormatter:
+    """gettext/ngettext plus named-argument formatting for one language, with per-message caches.
+
+    msgid may be a message or its M_* id from message_ids.
+    """
+
+    def __init__(self, lang, locale_path=LOCALE_PATH):
+        self.lang = lang
+        self.locale_path = locale_path
+        self.table = table_for(lang, locale_path)
+        self._translation = None
+        self._plural = None
+        self.singular_cache = {}
+        self.plural_cache = {}
+
+    @property
+    def translation(self):
+        """The gettext catalog, only parsed when the table cannot answer."""
+        if self._translation is None:
+            self._translation = gettext.translation(DOMAIN, localedir=self.locale_path, languages=[f"en-{self.lang}"], fallback=True)
+        return self._translation
+
+    @property
+    def plural(self):
+        if self._plural is None:
+            _nplurals, expression = parse_plural_forms(self.translation.info().get("plural-forms"))
+            self._plural = compile_plural(expression)
+        return self._plural
+
+    def gettext(self, msgid):
+        if isinstance(msgid, int):
+            return self.table[msgid] if self.table is not None else self.translation.gettext(message_ids.MESSAGES[msgid])
+        msg_id = message_ids.IDS.get(msgid) if self.table is not None else None
+        return self.table[msg_id] if msg_id is not None else self.translation.gettext(msgid)
+
+    def ngettext(self, singular, plural, n):
+        return self.translation.ngettext(singular, plural, n)
+
+    def format(self, msgid, **kwargs):
+        """_("...").format(**kwargs), with the lookup and the template parse done once per message."""
+        compiled = self.singular_cache.get(msgid)
+        if compiled is None:
+            compiled = self.singular_cache[msgid] = compile_template(self.gettext(msgid))
+        return compiled(kwargs)
+
+    def nformat(self, singular, plural, n, **kwargs):
+        """Pick the plural form for n and format it; the template may use {n}."""
+        index = self.plural(n)
+        key = (singular, plural, index)
+        compiled = self.plural_cache.get(key)
+        if compiled is None:
+            compiled = self.plural_cache[key] = compile_template(self.translation.ngettext(singular, plural, n))
+        kwargs.setdefault("n", n)
+        return compiled(kwargs)
+
+@functools.lru_cache(maxsize=None)
+def formatter(lang):
+    """Shared MessageFormatter for a language ('en' when the catalog is missing)."""
+    return MessageFormatter(lang)
+
+# Microbenchmark
+def benchmark(lang="fr", number=200_000):
+    """Per-call cost in nanoseconds of the current _().format() path and of the compiled formatter."""
+    translation = gettext.translation(DOMAIN, localedir=LOCALE_PATH, languages=[f"en-{lang}"], fallback=True)
+    _ = translation.gettext
+    fmt = formatter(lang)
+    msgid = "Checked out branch '{branch_name}'."
+    singular, plural = "Listed {n} branch in repository {repo_path}.", "Listed {n} branches in repository {repo_path}."
+    cases = {
+        "_().format()": lambda: _(msgid).format(branch_name="feature/demo"),
+        "formatter.format()": lambda: fmt.format(msgid, branch_name="feature/demo"),
+        "formatter.format(id)": lambda: fmt.format(message_ids.M_CHECKED_OUT_BRANCH_BRANCH_NAME, branch_name="feature/demo"),
+        "ngettext().format()": lambda: translation.ngettext(singular, plural, 3).format(n=3, repo_path="/repo"),
+        "formatter.nformat()": lambda: fmt.nformat(singular, plural, 3, repo_path="/repo"),
+    }
+    results = {}
+    for name, case in cases.items():
+        case()  # Warm the caches
+        results[name] = min(timeit.repeat(case, number=number, repeat=5)) / number * 1e9
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plural-aware message formatting and its microbenchmark.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    show = subparsers.add_parser("show", help="Format a plural message for a few counts")
+    show.add_argument("lang", choices=["en", "fr", "de", "es"], help="Output language")
+    show.add_argument("counts", type=int, nargs="*", default=[0, 1, 2, 5], help="Counts to format")
+    bench = subparsers.add_parser("bench", help="Compare per-call cost with _().format()")
+    bench.add_argument("--lang", choices=["en", "fr", "de", "es"], default="fr", help="Catalog to use")
+    bench.add_argument("--number", type=int, default=200_000, help="Calls per measurement")
+
+    args = parser.parse_args()
+    if args.command == "show":
+        fmt = formatter(args.lang)
+        for count in args.counts:
+            print(fmt.nformat("Listed {n} branch in repository {repo_path}.", "Listed {n} branches in repository {repo_path}.",
+                              count, repo_path="MortgageApplication"))
+    else:
+        for name, nanoseconds in benchmark(args.lang, args.number).items():
+            print(f"{name:22} {nanoseconds:8.0f} ns/call")
+
+#  python3 message_format.py show fr 0 1 2
+#  python3 message_format.py bench --lang de
@@ -0,0 +1,238 @@
+"""
+MESSAGE IDS FILE
+
+Generated by message_extractor.py - do not edit by hand.
+"""
+
+M_CLONING_REPOSITORY = 0
+M_REPOSITORY_CLONED_SUCCESSFULLY = 1
+M_ERROR_CLONING_REPOSITORY = 2
+M_REPOSITORY_ALREADY_CLONED_PULLING_LATEST_CHANGES = 3
+M_LATEST_CHANGES_PULLED_SUCCESSFULLY = 4
+M_ERROR_PULLING_LATEST_CHANGES = 5
+M_THE_FOLDER_FOLDER_PATH_IS_NOT = 6
+M_FOLDER_DELETED = 7
+M_OPERATION_CANCELED = 8
+M_CHECKED_IF_FOLDER_PATH_IS_A = 9
+M_ERROR_LISTING_BRANCHES_IN_REPO_PATH = 10
+M_CHECKED_OUT_BRANCH_BRANCH_NAME = 11
+M_ERROR_CHECKING_OUT_BRANCH_BRANCH_NAME = 12
+M_CHECKED_OUT_FALLBACK_BRANCH_FALLBACK_BRANCH = 13
+M_FAILED_TO_CHECKOUT_BOTH_BRANCH_NAME = 14
+M_BRANCH_BRANCH_NAME_QUEUED_FOR_PUSH = 15
+M_ERROR_CLONE_PATH_IS_NOT_A = 16
+M_SEARCHING_FOR_FILE_FILE_NAME_IN = 17
+M_FILE_FOUND_FILE_PATH = 18
+M_FILE_FILE_NAME_NOT_FOUND_IN = 19
+M_ATTEMPTING_TO_OPEN_FILE_IN_VSCODE = 20
+M_FILE_OPENED_SUCCESSFULLY_IN_VSCODE_FILE = 21
+M_VSCODE_NOT_INSTALLED = 22
+M_ERROR_OPENING_FILE_IN_VSCODE_ERROR = 23
+M_STARTING_PROCESS_FOR_REPOSITORY_REPO_NAME = 24
+M_LOCAL_REPOSITORY_PATH_CLONE_PATH = 25
+M_FILE_FILE_NAME_NOT_FOUND_IN_2 = 26
+M_CURRENTLY_ON_BRANCH_CURRENT_BRANCH = 27
+M_REPOSITORY_IS_IN_A_DETACHED_HEAD = 28
+M_SWITCHED_TO_A_NEW_BRANCH_NEW = 29
+M_IMPACTED_BUILD_LIST_AGAINST_BRANCH_MAIN = 30
+M_MAIN_BUILD_BRANCH_MAIN_BRANCH_NOT = 31
+M_NO_PROGRAMS_IMPACTED = 32
+M_DETECTED_LANGUAGE_DETECTED_LANG_USING_TRANSLATION = 33
+M_STARTING_PROCESS_FOR_REPOSITORY_REPO_NAME_2 = 34
+M_FILE_FILE_NAME_FOUND_IN_REPOSITORY = 35
+M_FILE_FILE_NAME_NOT_FOUND_CREATED = 36
+M_NO_CHANGES_DETECTED_PLEASE_MAKE_CHANGES = 37
+M_IMPACT_ANALYSIS_FAILED_E = 38
+M_CHANGES_QUEUED_FOR_PUSH_TO_THE = 39
+M_ERROR_PROCESSING_GIT_OPERATIONS_E = 40
+
+MESSAGES = (
+    'Cloning repository...',
+    'Repository cloned successfully.',
+    'Error cloning repository.',
+    'Repository already cloned. Pulling latest changes...',
+    'Latest changes pulled successfully.',
+    'Error pulling latest changes.',
+    "The folder '{folder_path}' is not a git repository. Do you want to delete it? (yes/no): ",
+    'Folder deleted.',
+    'Operation canceled.',
+    'Checked if {folder_path} is a Git repository: {is_repo}',
+    'Error listing branches in {repo_path}: {error}',
+    "Checked out branch '{branch_name}'.",
+    "Error checking out branch '{branch_name}': {error}",
+    "Checked out fallback branch '{fallback_branch}' successfully.",
+    "Failed to checkout both '{branch_name}' and fallback branch '{fallback_branch}'.",
+    "Branch '{branch_name}' queued for push to remote repository ({pending} pending).",
+    'Error: {clone_path} is not a valid Git repository.',
+    "Searching for file '{file_name}' in repository '{repo_path}'",
+    'File found: {file_path}',
+    "File '{file_name}' not found in repository '{repo_path}'",
+    'Attempting to open file in VSCode: {file_path}',
+    'File opened successfully in VSCode: {file_path}',
+    'VSCode not installed',
+    'Error opening file in VSCode: {error}',
+    'Starting process for repository: {repo_name} at {base_url}',
+    'Local repository path: {clone_path}',
+    "File '{file_name}' not found in repository '{repo_name}'.",
+    'Currently on branch: {current_branch}',
+    'Repository is in a detached HEAD state.',
+    'Switched to a new branch: {new_branch}',
+    'Impacted build list against branch {main_branch}:',
+    'Main build branch {main_branch} not found. Impacted build list for the last commit:',
+    'No programs impacted.',
+    'Detected language: {detected_lang}, Using translation: en-{detected_lang}',
+    'Starting process for repository: {repo_name}',
+    'File {file_name} found in repository',
+    'File {file_name} not found. Created new file at {file_path}',
+    'No changes detected. Please make changes before committing.',
+    'Impact analysis failed: {e}',
+    'Changes queued for push to the remote repository.',
+    'Error processing Git operations: {e}',
+)
+
+IDS = {message: msg_id for msg_id, message in enumerate(MESSAGES)}
+
+# sha1 of the .mo each table was read from
+CATALOG_SHA1 = {
+    "de": "b75ba89fc426a1b881c31022aa279038c83a88e1",
+    "es": "66ea6ca5bd030bb160501133dfc8e79b62494e21",
+    "fr": "03e11debdb95eddacaa73673b6f1cbf7c7c45052",
+}
+
+CATALOGS = {
+    "en": MESSAGES,
+    "de": (
+        'Cloning repository...',
+        'Repository erfolgreich geklont.',
+        'Fehler beim Klonen des Repositorys.',
+        'Repository already cloned. Pulling latest changes...',
+        'Neueste Änderungen erfolgreich übernommen.',
+        'Error pulling latest changes.',
+        "The folder '{folder_path}' is not a git repository. Do you want to delete it? (yes/no): ",
+        'Ordner gelöscht.',
+        'Vorgang abgebrochen.',
+        'Überprüfung, ob {folder_path} ein Git-Repository ist: {is_repo}',
+        'Fehler beim Auflisten der Branches in {repo_path}: {error}',
+        "Branch '{branch_name}' erfolgreich ausgecheckt.",
+        "Fehler beim Auschecken von Branch '{branch_name}': {error}",
+        "Branch '{fallback_branch}' erfolgreich als Fallback ausgecheckt.",
+        "Fehler beim Auschecken von '{branch_name}' und Fallback-Branch '{fallback_branch}'.",
+        "Branch '{branch_name}' zum Pushen in das Remote-Repository eingereiht ({pending} ausstehend).",
+        'Fehler: {clone_path} ist kein gültiges Git-Repository.',
+        "Suche nach Datei '{file_name}' im Repository '{repo_path}'",
+        'Datei gefunden: {file_path}',
+        "Datei '{file_name}' nicht im Repository '{repo_path}' gefunden",
+        'Versuche, Datei in VSCode zu öffnen: {file_path}',
+        'Datei erfolgreich in VSCode geöffnet: {file_path}',
+        'VSCode nicht installiert',
+        'Fehler beim Öffnen der Datei in VSCode: {error}',
+        'Starting process for repository: {repo_name} at {base_url}',
+        'Local repository path: {clone_path}',
+        "File '{file_name}' not found in repository '{repo_name}'.",
+        'Currently on branch: {current_branch}',
+        'Repository is in a detached HEAD state.',
+        'Switched to a new branch: {new_branch}',
+        'Impacted build list against branch {main_branch}:',
+        'Main build branch {main_branch} not found. Impacted build list for the last commit:',
+        'No programs impacted.',
+        'Detected language: {detected_lang}, Using translation: en-{detected_lang}',
+        'Starting process for repository: {repo_name}',
+        'File {file_name} found in repository',
+        'File {file_name} not found. Created new file at {file_path}',
+        'Keine Änderungen erkannt. Bitte Änderungen vor dem Commit vornehmen.',
+        'Impact analysis failed: {e}',
+        'Changes queued for push to the remote repository.',
+        'Error processing Git operations: {e}',
+    ),
+    "es": (
+        'Cloning repository...',
+        'Repositorio clonado con éxito.',
+        'Error al clonar el repositorio.',
+        'Repository already cloned. Pulling latest changes...',
+        'Últimos cambios obtenidos con éxito.',
+        'Error pulling latest changes.',
+        "The folder '{folder_path}' is not a git repository. Do you want to delete it? (yes/no): ",
+        'Carpeta eliminada.',
+        'Operación cancelada.',
+        'Se comprobó si {folder_path} es un repositorio Git: {is_repo}',
+        'Error al listar las ramas en {repo_path}: {error}',
+        "Rama '{branch_name}' cambiada con éxito.",
+        "Error al cambiar a la rama '{branch_name}': {error}",
+        "Rama de respaldo '{fallback_branch}' cambiada con éxito.",
+        "Error al cambiar a '{branch_name}' y a la rama de respaldo '{fallback_branch}'.",
+        "Rama '{branch_name}' en cola para subir al repositorio remoto ({pending} pendientes).",
+        'Error: {clone_path} no es un repositorio Git válido.',
+        "Buscando el archivo '{file_name}' en el repositorio '{repo_path}'",
+        'Archivo encontrado: {file_path}',
+        "Archivo '{file_name}' no encontrado en el repositorio '{repo_path}'",
+        'Intentando abrir el archivo en VSCode: {file_path}',
+        'Archivo abierto con éxito en VSCode: {file_path}',
+        'VSCode no está instalado',
+        'Error al abrir el archivo en VSCode: {error}',
+        'Starting process for repository: {repo_name} at {base_url}',
+        'Local repository path: {clone_path}',
+        "File '{file_name}' not found in repository '{repo_name}'.",
+        'Currently on branch: {current_branch}',
+        'Repository is in a detached HEAD state.',
+        'Switched to a new branch: {new_branch}',
+        'Impacted build list against branch {main_branch}:',
+        'Main build branch {main_branch} not found. Impacted build list for the last commit:',
+        'No programs impacted.',
+        'Detected language: {detected_lang}, Using translation: en-{detected_lang}',
+        'Starting process for repository: {repo_name}',
+        'File {file_name} found in repository',
+        'File {file_name} not found. Created new file at {file_path}',
+        'No se detectaron cambios. Por favor, realiza cambios antes de hacer commit.',
+        'Impact analysis failed: {e}',
+        'Changes queued for push to the remote repository.',
+        'Error processing Git operations: {e}',
+    ),
+    "fr": (
+        'Cloning repository...',
+        'Dépôt cloné avec succès.',
+        'Erreur de clonage du dépôt.',
+        'Repository already cloned. Pulling latest changes...',
+        'Dernières modifications récupérées avec succès.',
+        'Error pulling latest changes.',
+        "The folder '{folder_path}' is not a git repository. Do you want to delete it? (yes/no): ",
+        'Dossier supprimé.',
+        'Opération annulée.',
+        'Vérification si {folder_path} est un référentiel Git: {is_repo}',
+        'Erreur lors de la liste des branches dans {repo_path}: {error}',
+        "Branche '{branch_name}' vérifiée avec succès.",
+        "Erreur lors de la vérification de la branche '{branch_name}': {error}",
+        "Branche de secours '{fallback_branch}' vérifiée avec succès.",
+        "Échec de la vérification de la branche '{branch_name}' et de la branche de secours '{fallback_branch}'.",
+        "Branche '{branch_name}' mise en file d'attente pour être poussée vers le référentiel distant ({pending} en attente).",
+        "Erreur: {clone_path} n'est pas un référentiel Git valide.",
+        "Recherche du fichier '{file_name}' dans le référentiel '{repo_path}'",
+        'Fichier trouvé: {file_path}',
+        "Fichier '{file_name}' introuvable dans le référentiel '{repo_path}'",
+        "Tentative d'ouverture du fichier dans VSCode: {file_path}",
+        'Fichier ouvert avec succès dans VSCode: {file_path}',
+        "VSCode n'est pas installé",
+        "Erreur lors de l'ouverture du fichier dans VSCode: {error}",
+        'Starting process for repository: {repo_name} at {base_url}',
+        'Local repository path: {clone_path}',
+        "File '{file_name}' not found in repository '{repo_name}'.",
+        'Currently on branch: {current_branch}',
+        'Repository is in a detached HEAD state.',
+        'Switched to a new branch: {new_branch}',
+        'Impacted build list against branch {main_branch}:',
+        'Main build branch {main_branch} not found. Impacted build list for the last commit:',
+        'No programs impacted.',
+        'Detected language: {detected_lang}, Using translation: en-{detected_lang}',
+        'Starting process for repository: {repo_name}',
+        'File {file_name} found in repository',
+        'File {file_name} not found. Created new file at {file_path}',
+        'Aucune modification détectée. Veuillez effectuer des modifications avant de valider.',
+        'Impact analysis failed: {e}',
+        'Changes queued for push to the remote repository.',
+        'Error processing Git operations: {e}',
+    ),
+}
+
+# Lookup Message
+def lookup(lang, msg_id):
+    """Return the template of msg_id for a language (fr, de, es or en)."""
+    return CATALOGS.get(lang, MESSAGES)[msg_id]
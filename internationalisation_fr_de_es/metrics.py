@@ -0,0 +1,275 @@
+"""
+METRICS FILE
+
+Latency and failure counts per operation (clone, pull, checkout, commit, push,
+open) kept in <active_path>/.metrics.json. Every git command run through
+tracing.run() is recorded; durations go into log-linear (HDR-style)
+histograms of at most a few hundred buckets, so the file stays small however
+many commands run. Summaries keep their buckets and can be merged across
+workspaces; the exporter writes a node-exporter textfile.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import atexit
+import argparse
+from contextlib import contextmanager
+import tracing
+import file_lock
+
+METRICS_FILE_NAME = ".metrics.json"
+LOCK_FILE_NAME = ".metrics.lock"
+METRICS_VERSION = 1
+OPERATIONS = ("clone", "pull", "checkout", "commit", "push", "open")
+QUANTILES = (0.5, 0.95, 0.99)
+
+# 2**SUB_BUCKET_BITS buckets per power of two: about 3% relative error
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+MAX_MICROSECONDS = 24 * 3600 * 10**6  # Longer durations are clamped to a day
+
+ENABLED = os.environ.get("I18N_METRICS", "1") != "0"
+TEXTFILE_PATH = os.environ.get("I18N_METRICS_TEXTFILE")
+
+_pending = []
+_installed = set()
+_flush_registered = False
+
+# Histogram Buckets
+def bucket_index(value):
+    """Bucket of a duration in microseconds: exact below 64, then 32 buckets per power of two."""
+    value = min(max(int(value), 0), MAX_MICROSECONDS)
+    if value < 2 * SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - (SUB_BUCKET_BITS + 1)
+    return shift * SUB_BUCKETS + (value >> shift)
+
+def bucket_bounds(index):
+    """Lowest and highest microsecond value falling into a bucket."""
+    if index < 2 * SUB_BUCKETS:
+        return index, index
+    shift = index // SUB_BUCKETS - 1
+    lowest = (index - shift * SUB_BUCKETS) << shift
+    return lowest, lowest + (1 << shift) - 1
+
+# Operation Stats
+def new_stats():
+    return {"count": 0, "failures": 0, "sum_us": 0, "min_us": None, "max_us": None, "buckets": {}}
+
+def observe(stats, microseconds, ok):
+    microseconds = int(microseconds)
+    stats["count"] += 1
+    stats["failures"] += 0 if ok else 1
+    stats["sum_us"] += microseconds
+    stats["min_us"] = microseconds if stats["min_us"] is None else min(stats["min_us"], microseconds)
+    stats["max_us"] = microseconds if stats["max_us"] is None else max(stats["max_us"], microseconds)
+    key = str(bucket_index(microseconds))  # JSON object keys are strings
+    stats["buckets"][key] = stats["buckets"].get(key, 0) + 1
+
+def merge_stats(into, other):
+    into["count"] += other["count"]
+    into["failures"] += other["failures"]
+    into["sum_us"] += other["sum_us"]
+    for field, pick in (("min_us", min), ("max_us", max)):
+        values = [value for value in (into[field], other[field]) if value is not None]
+        into[field] = pick(values) if values else None
+    for key, count in other["buckets"].items():
+        into["buckets"][key] = into["buckets"].get(key, 0) + count
+    return into
+
+def quantile(stats, q):
+    """Approximate quantile in microseconds (None when nothing was recorded)."""
+    if not stats["count"]:
+        return None
+    rank = q * stats["count"]
+    seen = 0
+    for index in sorted(int(key) for key in stats["buckets"]):
+        seen += stats["buckets"][str(index)]
+        if seen >= rank:
+            lowest, highest = bucket_bounds(index)
+            middle = (lowest + highest) / 2
+            return min(max(middle, stats["min_us"]), stats["max_us"])
+    return stats["max_us"]
+
+# Metrics File
+def metrics_path_for(active_path):
+    return os.path.join(active_path, METRICS_FILE_NAME)
+
+def empty_metrics(source):
+    return {"version": METRICS_VERSION, "sources": [source] if source else [], "operations": {}}
+
+def load_metrics(path, source=None):
+    try:
+        with open(path, "r", encoding="utf-8") as metrics_file:
+            metrics = json.load(metrics_file)
+    except (OSError, ValueError):
+        return empty_metrics(source)
+    if metrics.get("version") != METRICS_VERSION:
+        return empty_metrics(source)
+    return metrics
+
+def save_metrics(path, metrics):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as metrics_file:
+        json.dump(metrics, metrics_file, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def workspace_source(active_path):
+    return f"{socket.gethostname()}:{os.path.abspath(active_path)}"
+
+# Record Operations
+def operation_for(command):
+    """'clone', 'push', ... for a git command worth measuring, else None."""
+    name = tracing.command_name(command)
+    operation = name[4:] if name.startswith("git ") else None
+    return operation if operation in OPERATIONS else None
+
+def install(active_path):
+    """Record the git commands of this process into the workspace metrics at exit."""
+    if not ENABLED or not os.path.isdir(active_path):
+        return
+    active_path = os.path.abspath(active_path)
+    if active_path in _installed:
+        return
+    register_flush()
+
+    def listener(command, seconds, exit_code):
+        operation = operation_for(command)
+        if operation is not None:
+            _pending.append((active_path, operation, seconds, exit_code == 0))
+
+    tracing.listeners.append(listener)
+    _installed.add(active_path)
+
+@contextmanager
+def measure(active_path, operation):
+    """Time a block that is not a git command (e.g. launching the editor); an exception counts as a failure."""
+    started = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        if ENABLED and os.path.isdir(active_path):
+            _pending.append((os.path.abspath(active_path), operation, time.perf_counter() - started, ok))
+            register_flush()
+
+def register_flush():
+    global _flush_registered
+    if not _flush_registered:
+        atexit.register(flush)
+        _flush_registered = True
+
+def flush():
+    """Merge the observations of this process into each workspace's metrics file."""
+    pending, _pending[:] = list(_pending), []
+    by_workspace = {}
+    for active_path, operation, seconds, ok in pending:
+        by_workspace.setdefault(active_path, []).append((operation, seconds, ok))
+    for active_path, observations in by_workspace.items():
+        path = metrics_path_for(active_path)
+        try:
+            with file_lock.locked(active_path, LOCK_FILE_NAME):
+                metrics = load_metrics(path, workspace_source(active_path))
+                for operation, seconds, ok in observations:
+                    observe(metrics["operations"].setdefault(operation, new_stats()), seconds * 1e6, ok)
+                save_metrics(path, metrics)
+            if TEXTFILE_PATH:
+                write_textfile(metrics, TEXTFILE_PATH)
+        except OSError:
+            pass  # Metrics must never break a command
+
+# Summary
+def summarize(metrics):
+    """Rolled-up view: per operation count, failure rate and p50/p95/p99 in milliseconds.
+
+    The buckets stay in the summary so summaries from several workspaces can be merged.
+    """
+    operations = {}
+    for operation, stats in sorted(metrics["operations"].items()):
+        operations[operation] = dict(stats)
+        operations[operation]["failure_rate"] = round(stats["failures"] / stats["count"], 4) if stats["count"] else 0.0
+        operations[operation]["mean_ms"] = round(stats["sum_us"] / stats["count"] / 1000, 3) if stats["count"] else None
+        for q in QUANTILES:
+            value = quantile(stats, q)
+            operations[operation][f"p{int(q * 100)}_ms"] = round(value / 1000, 3) if value is not None else None
+    return {"version": METRICS_VERSION, "sources": metrics["sources"], "generated": time.time(), "operations": operations}
+
+def merge(summaries):
+    """Combine metrics or summaries from many workspaces into one summary."""
+    merged = empty_metrics(None)
+    for summary in summaries:
+        merged["sources"] += summary.get("sources", [])
+        for operation, stats in summary["operations"].items():
+            merge_stats(merged["operations"].setdefault(operation, new_stats()), stats)
+    return summarize(merged)
+
+# Prometheus Textfile
+def to_textfile(metrics):
+    """node-exporter textfile collector format."""
+    lines = [
+        "# HELP i18n_git_operation_duration_seconds Duration of workspace operations.",
+        "# TYPE i18n_git_operation_duration_seconds summary",
+    ]
+    for operation, stats in sorted(metrics["operations"].items()):
+        for q in QUANTILES:
+            value = quantile(stats, q)
+            if value is not None:
+                lines.append(f'i18n_git_operation_duration_seconds{{operation="{operation}",quantile="{q}"}} {value / 1e6:.6f}')
+        lines.append(f'i18n_git_operation_duration_seconds_sum{{operation="{operation}"}} {stats["sum_us"] / 1e6:.6f}')
+        lines.append(f'i18n_git_operation_duration_seconds_count{{operation="{operation}"}} {stats["count"]}')
+    lines += [
+        "# HELP i18n_git_operation_failures_total Failed workspace operations.",
+        "# TYPE i18n_git_operation_failures_total counter",
+    ]
+    for operation, stats in sorted(metrics["operations"].items()):
+        lines.append(f'i18n_git_operation_failures_total{{operation="{operation}"}} {stats["failures"]}')
+    return "\n".join(lines) + "\n"
+
+def write_textfile(metrics, textfile_path):
+    # node-exporter may read at any time: write a temporary file and rename it
+    tmp_path = f"{textfile_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as textfile:
+        textfile.write(to_textfile(metrics))
+    os.replace(tmp_path, textfile_path)
+
+def write_json(data, output):
+    if output == "-":
+        print(json.dumps(data, indent=1, sort_keys=True))
+    else:
+        save_metrics(output, data)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report, export and merge workspace operation metrics.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summary = subparsers.add_parser("summary", help="Write the rolled-up JSON summary of a workspace")
+    summary.add_argument("active_path", type=str, help="Workspace folder holding the clones")
+    summary.add_argument("--output", type=str, default="-", help="Summary file ('-' prints it)")
+    textfile = subparsers.add_parser("textfile", help="Write the node-exporter textfile of a workspace")
+    textfile.add_argument("active_path", type=str, help="Workspace folder holding the clones")
+    textfile.add_argument("output", type=str, help="Textfile, e.g. /var/lib/node_exporter/i18n.prom")
+    merge_parser = subparsers.add_parser("merge", help="Merge summaries from many workspaces")
+    merge_parser.add_argument("summaries", type=str, nargs="+", help="Summary or .metrics.json files")
+    merge_parser.add_argument("--output", type=str, default="-", help="Merged summary file ('-' prints it)")
+    merge_parser.add_argument("--textfile", type=str, default=None, help="Also write a node-exporter textfile")
+
+    args = parser.parse_args()
+    if args.command == "merge":
+        merged = merge(load_metrics(path) for path in args.summaries)
+        if not merged["sources"]:
+            sys.exit("No metrics found in the given files")
+        write_json(merged, args.output)
+        if args.textfile:
+            write_textfile(merged, args.textfile)
+    else:
+        metrics = load_metrics(metrics_path_for(args.active_path), workspace_source(args.active_path))
+        if args.command == "summary":
+            write_json(summarize(metrics), args.output)
+        else:
+            write_textfile(metrics, args.output)
+
+#  python3 metrics.py summary /Users/thrisham/Desktop/cobol_code/Internationalization
+#  python3 metrics.py merge ws1/.metrics.json ws2/.metrics.json --textfile /var/lib/node_exporter/i18n.prom
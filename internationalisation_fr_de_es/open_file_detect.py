@@ -1,9 +1,16 @@
 import os
+import glob
+import shlex
+import fnmatch
 import subprocess
 import argparse
-import gettext
 from datetime import datetime
 from langdetect import detect, DetectorFactory
+import cobol_index
+import change_tracker
+import tracing
+import metrics
+import message_format
 
 DetectorFactory.seed = 0  # Ensures consistent language detection
 
@@ -23,12 +30,7 @@ def detect_language(user_input):
 
 # Setup Translation
 def setup_translation(selected_lang):
-    output_lang = f"en-{selected_lang}"
-    translation = gettext.translation(
-        "messages", localedir=LOCALE_PATH, languages=[output_lang], fallback=True
-    )
-    translation.install()
-    return translation.gettext
+    return message_format.formatter(selected_lang).gettext
 
 # Log Messages
 def log_to_file(message, LOG_FILE):
@@ -39,39 +41,129 @@ def log_to_file(message, LOG_FILE):
         log_file.write("-" * 40 + "\n")
     print(message)  # Ensure messages are printed
 
-# Find File in Repo
-def find_file_in_repo(repo_path, file_name, LOG_FILE):
-    """Search for the file in the repo and return its path if found."""
-    log_to_file(_("Searching for file '{file_name}' in repository '{repo_path}'").format(file_name=file_name, repo_path=repo_path), LOG_FILE)
-    for root, dirs, files in os.walk(repo_path):
-        if file_name in files:
-            file_path = os.path.join(root, file_name)
+# Split Line Target
+def split_target(name):
+    """Split 'name:line' into (name, line); line is None when not given."""
+    base, sep, line = name.rpartition(":")
+    if sep and base and line.isdigit():
+        return base, int(line)
+    return name, None
+
+# Find Files in Repo
+def find_files_in_repo(repo_path, patterns, LOG_FILE):
+    """Resolve many file names or glob patterns with a single walk of the repo.
+
+    Returns {pattern: [paths]}. Exact names keep their first match, and the walk
+    stops once every exact name has one unless a glob pattern is still matching;
+    repo-relative paths are checked directly.
+    """
+    found = {pattern: [] for pattern in patterns}
+    exact = {pattern for pattern in patterns if not glob.has_magic(pattern) and "/" not in pattern}
+    globs = [pattern for pattern in patterns if glob.has_magic(pattern)]
+    log_to_file(_("Searching for file '{file_name}' in repository '{repo_path}'").format(file_name=", ".join(patterns), repo_path=repo_path), LOG_FILE)
+    for pattern in patterns:
+        if pattern not in exact and pattern not in globs and os.path.isfile(os.path.join(repo_path, pattern)):
+            found[pattern].append(os.path.join(repo_path, pattern))
+    remaining = set(exact)
+    if remaining or globs:
+        for root, dirs, files in os.walk(repo_path):
+            dirs[:] = sorted(name for name in dirs if name != ".git")
+            for name in sorted(files):
+                if name in remaining:
+                    found[name].append(os.path.join(root, name))
+                    remaining.discard(name)
+                for pattern in globs:
+                    rel_path = os.path.relpath(os.path.join(root, name), repo_path).replace(os.sep, "/")
+                    if fnmatch.fnmatch(rel_path if "/" in pattern else name, pattern):
+                        found[pattern].append(os.path.join(root, name))
+            if not remaining and not globs:
+                break
+    for pattern, paths in found.items():
+        for file_path in paths:
             log_to_file(_("File found: {file_path}").format(file_path=file_path), LOG_FILE)
-            return file_path
-    log_to_file(_("File '{file_name}' not found in repository '{repo_path}'").format(file_name=file_name, repo_path=repo_path), LOG_FILE)
-    return None
+        if not paths:
+            log_to_file(_("File '{file_name}' not found in repository '{repo_path}'").format(file_name=pattern, repo_path=repo_path), LOG_FILE)
+    return found
+
+# Resolve Targets
+def resolve_targets(repo_path, names, LOG_FILE, program=None):
+    """Resolve file names, globs, PROGRAM-IDs and copybook members to [(path, line)].
+
+    PROGRAM-IDs and copybook members (names without an extension) go through the
+    stored index; file names and globs are matched in one tree walk.
+    Returns the targets and the names that could not be resolved.
+    """
+    targets, walk_names, missing = [], [], []
+    index = None
+    refreshed = False
+    for name in names:
+        name, line = split_target(name)
+        found = None
+        member = not glob.has_magic(name) and not os.path.splitext(name)[1]
+        if member and os.path.isdir(repo_path):
+            if index is None:
+                index = cobol_index.lookup_index(repo_path)  # Loaded once, and only when a name needs it
+            found = cobol_index.resolve_checked(repo_path, index, name, program)
+            # A PROGRAM-ID or member only in uncommitted files: re-validate the tree once
+            if found is None and not refreshed and change_tracker.has_changes(repo_path) is not False:
+                index, _touched = cobol_index.update_index(repo_path, index=index)
+                refreshed = True
+                found = cobol_index.resolve_checked(repo_path, index, name, program)
+        if found:
+            file_path = os.path.join(repo_path, found[0])
+            log_to_file(_("File found: {file_path}").format(file_path=file_path), LOG_FILE)
+            targets.append((file_path, line or found[1]))
+        elif member and program:
+            missing.append(name)  # Copybook not used by that program
+        else:
+            walk_names.append((name, line))
+
+    if walk_names and os.path.isdir(repo_path):
+        found = find_files_in_repo(repo_path, [name for name, _line in walk_names], LOG_FILE)
+        for name, line in walk_names:
+            targets.extend((file_path, line or 1) for file_path in found[name])
+            if not found[name]:
+                missing.append(name)
+    else:
+        missing.extend(name for name, _line in walk_names)
+    return targets, missing
+
+# Editor Command
+def editor_command(editor=None):
+    """Return the editor launcher as an argument list (--editor, $OPEN_FILE_EDITOR or 'code')."""
+    return shlex.split(editor or os.environ.get("OPEN_FILE_EDITOR") or "code")
 
 # Open in VSCode
-def open_in_vscode(file_path, LOG_FILE):
-    """Open the file in VSCode."""
+def open_in_vscode(targets, LOG_FILE, editor=None):
+    """Open all files in one non-blocking editor invocation, each at its line."""
+    file_list = ", ".join(file_path for file_path, _line in targets)
+    command = editor_command(editor) + ["--reuse-window", "--goto"] + [f"{file_path}:{line}" for file_path, line in targets]
     try:
-        log_to_file(_("Attempting to open file in VSCode: {file_path}").format(file_path=file_path), LOG_FILE)
-        subprocess.run(["code", file_path], check=True)
-        log_to_file(_("File opened successfully in VSCode: {file_path}").format(file_path=file_path), LOG_FILE)
-        return _( "Successfully opened: {file_path}").format(file_path=file_path)
+        log_to_file(_("Attempting to open file in VSCode: {file_path}").format(file_path=file_list), LOG_FILE)
+        # Do not wait for the launcher: the editor keeps running after we return
+        with tracing.span("open_editor", files=len(targets)), metrics.measure(os.path.dirname(LOG_FILE), "open"):
+            subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        log_to_file(_("File opened successfully in VSCode: {file_path}").format(file_path=file_list), LOG_FILE)
+        return fmt.nformat("Successfully opened {n} file: {file_path}", "Successfully opened {n} files: {file_path}", len(targets), file_path=file_list)
     except FileNotFoundError:
         log_to_file(_("VSCode not installed"), LOG_FILE)
         return _("VSCode not installed")
-    except subprocess.CalledProcessError as e:
+    except OSError as e:
         log_to_file(_("Error opening file in VSCode: {error}").format(error=e), LOG_FILE)
         return _("Error opening file in VSCode: {error}").format(error=e)
 
 # Main Execution
-def main(repo_name, base_url, file_name, active_folder_path, user_input):
-    """Main function to process the repository."""
-    selected_lang = detect_language(user_input)
-    global _  # Set the global translation function
-    _ = setup_translation(selected_lang)
+def main(repo_name, base_url, file_name, active_folder_path, user_input, program=None, editor=None):
+    """Main function to process the repository.
+
+    file_name may hold several comma-separated names, glob patterns or name:line targets.
+    """
+    with tracing.span("detect_language"):
+        selected_lang = detect_language(user_input)
+    global _, fmt  # Set the global translation function and plural-aware formatter
+    with tracing.span("load_catalog", lang=selected_lang):
+        _ = setup_translation(selected_lang)
+        fmt = message_format.formatter(selected_lang)
 
     LOG_FILE = os.path.join(active_folder_path, "internet_connection_log.txt")
     repo_url = f"{base_url}/{repo_name}.git"
@@ -80,26 +172,35 @@ def main(repo_name, base_url, file_name, active_folder_path, user_input):
     log_to_file(_("Starting process for repository: {repo_name} at {base_url}").format(repo_name=repo_name, base_url=base_url), LOG_FILE)
     log_to_file(_("Local repository path: {clone_path}").format(clone_path=clone_path), LOG_FILE)
 
-    file_path = find_file_in_repo(clone_path, file_name, LOG_FILE)
-    if file_path:
-        result = open_in_vscode(file_path, LOG_FILE)
-        log_to_file(result, LOG_FILE)
-        return result
-    else:
-        message = _("File '{file_name}' not found in repository '{repo_name}'.").format(file_name=file_name, repo_name=repo_name)
+    names = file_name if isinstance(file_name, (list, tuple)) else [name.strip() for name in file_name.split(",") if name.strip()]
+    with tracing.span("find_file", names=len(names)) as current:
+        targets, missing = resolve_targets(clone_path, names, LOG_FILE, program)
+        current.set(found=len(targets), missing=len(missing))
+    messages = [
+        _("File '{file_name}' not found in repository '{repo_name}'.").format(file_name=name, repo_name=repo_name)
+        for name in missing
+    ]
+    for message in messages:
         log_to_file(message, LOG_FILE)
-        return message
+    if targets:
+        result = open_in_vscode(targets, LOG_FILE, editor)
+        log_to_file(result, LOG_FILE)
+        messages.append(result)
+    return "\n".join(messages)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Process repository name, base URL, file name, and active folder path.")
     parser.add_argument("repo_name", type=str, help="The name of the repository to process")
     parser.add_argument("base_url", type=str, help="The base URL of the repository")
-    parser.add_argument("file_name", type=str, help="The name of the file which is to open")
+    parser.add_argument("file_name", type=str, help="The file(s) to open: comma-separated names, glob patterns, PROGRAM-IDs or name:line")
     parser.add_argument("active_folder_path", type=str, help="The path of the active workspace folder")
     parser.add_argument("user_input", type=str, help="User input to detect language")
+    parser.add_argument("--program", type=str, default=None, help="Only open the copybook if it is used by this PROGRAM-ID")
+    parser.add_argument("--editor", type=str, default=None, help="Editor launcher (default: $OPEN_FILE_EDITOR or 'code')")
     
     args = parser.parse_args()
-    print(main(args.repo_name, args.base_url, args.file_name, args.active_folder_path, args.user_input))
+    with tracing.span("open_file_detect"):
+        print(main(args.repo_name, args.base_url, args.file_name, args.active_folder_path, args.user_input, args.program, args.editor))
 
 
 #  python3 open_file_detect.py MortgageApplication https://github.com/gmsadmin-git hello.cbl /Users/thrisham/Desktop/cobol_code/Internationalization "Bonjour"
@@ -0,0 +1,189 @@
+"""
+PO CATALOG FILE
+
+Minimal reader/writer for the gettext catalogs under locale/. Entries keep
+their original lines so that a merge only rewrites the entries it changed.
+write_mo() compiles a catalog to the .mo file gettext loads.
+"""
+
+import os
+import struct
+import argparse
+
+LOCALE_PATH = os.path.join(os.path.dirname(__file__), "locale")
+DOMAIN = "messages"
+
+# Catalog Paths
+def catalog_paths(locale_path=LOCALE_PATH, domain=DOMAIN):
+    """Return {locale folder name: .po path} for every catalog, e.g. {'en-fr': ...}."""
+    catalogs = {}
+    for name in sorted(os.listdir(locale_path)):
+        po_path = os.path.join(locale_path, name, "LC_MESSAGES", f"{domain}.po")
+        if os.path.isfile(po_path):
+            catalogs[name] = po_path
+    return catalogs
+
+# Escape / Unescape
+def escape(text):
+    """Escape a string for a PO file."""
+    return (text.replace("\\", "\\\\").replace("\"", "\\\"")
+            .replace("\n", "\\n").replace("\t", "\\t"))
+
+def unescape(text):
+    """Undo PO string escaping."""
+    result = []
+    chars = iter(text)
+    for char in chars:
+        if char == "\\":
+            char = next(chars, "")
+            result.append({"n": "\n", "t": "\t", "r": "\r"}.get(char, char))
+        else:
+            result.append(char)
+    return "".join(result)
+
+# New Entry
+def new_entry(msgid, msgstr="", references=(), msgid_plural=None):
+    """Create an entry that has not been written yet (no raw lines)."""
+    return {
+        "comments": [],
+        "references": list(references),
+        "msgid": msgid,
+        "msgid_plural": msgid_plural,
+        "msgstr": msgstr if msgid_plural is None else {0: msgstr},
+        "raw": None,
+    }
+
+# Parse Catalog
+def parse_po(po_path):
+    """Parse a .po file into a list of entries (the header is the entry with msgid '')."""
+    entries = []
+    entry = None
+    field = None
+
+    def start():
+        entry = new_entry("")
+        entry["raw"] = []
+        entries.append(entry)
+        return entry
+
+    with open(po_path, "r", encoding="utf-8") as po_file:
+        for line in po_file:
+            stripped = line.strip()
+            # A comment or msgid after a msgstr opens the next entry
+            if entry is None or (field and field.startswith("msgstr") and stripped.startswith(("#", "msgid", "msgctxt"))):
+                if stripped or entry is None:
+                    entry = start()
+                    field = None
+            entry["raw"].append(line)
+            if not stripped:
+                continue
+            if stripped.startswith("#:"):
+                entry["references"].extend(stripped[2:].split())
+            elif stripped.startswith("#"):
+                entry["comments"].append(stripped)
+            elif stripped.startswith("\""):
+                value = unescape(stripped[1:-1])
+                if field == "msgstr":
+                    entry["msgstr"] += value
+                elif field and field.startswith("msgstr["):
+                    entry["msgstr"][int(field[7:-1])] += value
+                elif field:
+                    entry[field] += value
+            else:
+                keyword, _sep, value = stripped.partition(" ")
+                value = unescape(value.strip()[1:-1])
+                field = keyword
+                if keyword.startswith("msgstr["):
+                    if not isinstance(entry["msgstr"], dict):
+                        entry["msgstr"] = {}
+                    entry["msgstr"][int(keyword[7:-1])] = value
+                elif keyword in ("msgid", "msgid_plural", "msgstr", "msgctxt"):
+                    entry[keyword] = value
+    return entries
+
+# Format Entry
+def format_entry(entry):
+    """Serialize an entry to PO lines."""
+    lines = [f"{comment}\n" for comment in entry["comments"]]
+    if entry["references"]:
+        lines.append(f"#: {' '.join(entry['references'])}\n")
+    if entry.get("msgctxt") is not None:
+        lines.append(f"msgctxt \"{escape(entry['msgctxt'])}\"\n")
+    lines.append(f"msgid \"{escape(entry['msgid'])}\"\n")
+    if entry.get("msgid_plural") is not None:
+        lines.append(f"msgid_plural \"{escape(entry['msgid_plural'])}\"\n")
+        for index, value in sorted(entry["msgstr"].items()):
+            lines.append(f"msgstr[{index}] \"{escape(value)}\"\n")
+    else:
+        lines.append(f"msgstr \"{escape(entry['msgstr'])}\"\n")
+    return lines
+
+# Write Catalog
+def write_po(po_path, entries):
+    """Write entries back, reusing the original lines of every untouched entry."""
+    lines = []
+    for entry in entries:
+        if entry["raw"] is not None:
+            lines.extend(entry["raw"])
+            continue
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += "\n"
+        if lines and lines[-1].strip():
+            lines.append("\n")
+        lines.extend(format_entry(entry))
+    tmp_path = f"{po_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as po_file:
+        po_file.writelines(lines)
+    os.replace(tmp_path, po_path)
+
+# Compile Catalog
+def write_mo(mo_path, entries):
+    """Write the translated entries as a GNU .mo file (untranslated and fuzzy entries are left out)."""
+    messages = {}
+    for entry in entries:
+        if any("fuzzy" in comment for comment in entry["comments"] if comment.startswith("#,")):
+            continue
+        key = entry["msgid"]
+        if entry.get("msgid_plural") is not None:
+            key += "\0" + entry["msgid_plural"]
+            forms = [entry["msgstr"][index] for index in sorted(entry["msgstr"])]
+            if not all(forms):
+                continue
+            value = "\0".join(forms)
+        else:
+            value = entry["msgstr"]
+            if not value:
+                continue
+        if entry.get("msgctxt") is not None:
+            key = entry["msgctxt"] + "\x04" + key
+        messages[key.encode("utf-8")] = value.encode("utf-8")
+
+    keys = sorted(messages)
+    header_size = 7 * 4
+    table_size = len(keys) * 8
+    offset = header_size + 2 * table_size
+    originals, translations, data = [], [], b""
+    for key in keys:
+        originals.append((len(key), offset + len(data)))
+        data += key + b"\0"
+    for key in keys:
+        translations.append((len(messages[key]), offset + len(data)))
+        data += messages[key] + b"\0"
+    output = struct.pack("<7I", 0x950412de, 0, len(keys), header_size, header_size + table_size, 0, 0)
+    output += b"".join(struct.pack("<2I", *item) for item in originals + translations)
+    tmp_path = f"{mo_path}.tmp"
+    with open(tmp_path, "wb") as mo_file:
+        mo_file.write(output + data)
+    os.replace(tmp_path, mo_path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the .po catalogs under locale/ to .mo files.")
+    parser.add_argument("--locale-path", type=str, default=LOCALE_PATH, help="Folder holding the catalogs")
+
+    args = parser.parse_args()
+    for name, po_path in catalog_paths(args.locale_path).items():
+        write_mo(po_path[:-3] + ".mo", parse_po(po_path))
+        print(f"Compiled {name}")
+    print("Run message_extractor.py to regenerate message_ids.py from the new catalogs")
+
+#  python3 po_catalog.py
@@ -0,0 +1,221 @@
+"""
+PUSH QUEUE FILE
+
+Durable local queue for git pushes. Commands enqueue (repo, branch) and return
+immediately; a background worker pushes each branch once, coalescing the
+commits queued meanwhile, and retries with backoff while the remote is down.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from datetime import datetime
+import tracing
+import metrics
+import file_lock
+
+QUEUE_FILE_NAME = ".push_queue.json"
+LOCK_FILE_NAME = ".push_queue.lock"
+WORKER_LOCK_FILE_NAME = ".push_queue.worker.lock"
+LOG_FILE_NAME = "internet_connection_log.txt"
+
+BASE_BACKOFF_SECONDS = 5
+MAX_BACKOFF_SECONDS = 10 * 60
+MAX_ATTEMPTS = 20
+PUSH_TIMEOUT_SECONDS = 120
+
+# Log Messages
+def log_to_file(message, LOG_FILE):
+    """Logs a message to the log file with a timestamp."""
+    with open(LOG_FILE, "a") as log_file:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        log_file.write(f"{timestamp} - {message}\n")
+        log_file.write("-" * 40 + "\n")
+
+# Queue Location
+def queue_dir_for(repo_path):
+    """The queue lives in the workspace folder that holds the clone."""
+    return os.path.dirname(os.path.abspath(repo_path))
+
+# Queue Lock
+def locked(queue_dir, name=LOCK_FILE_NAME, blocking=True):
+    """Hold the queue lock (or another lock file in the queue folder); see file_lock.locked."""
+    return file_lock.locked(queue_dir, name, blocking)
+
+# Load / Save Queue
+def load_queue(queue_dir):
+    try:
+        with open(os.path.join(queue_dir, QUEUE_FILE_NAME), "r", encoding="utf-8") as queue_file:
+            return json.load(queue_file)
+    except (OSError, ValueError):
+        return {"jobs": {}}
+
+def save_queue(queue_dir, queue):
+    queue_path = os.path.join(queue_dir, QUEUE_FILE_NAME)
+    with open(f"{queue_path}.tmp", "w", encoding="utf-8") as queue_file:
+        json.dump(queue, queue_file, indent=1, sort_keys=True)
+    os.replace(f"{queue_path}.tmp", queue_path)
+
+# Enqueue Push
+def enqueue(repo_path, branch_name, set_upstream=False, start=True):
+    """Queue a push of branch_name; consecutive requests for the same branch coalesce.
+
+    Returns the number of commits now waiting for that branch.
+    """
+    repo_path = os.path.abspath(repo_path)
+    queue_dir = queue_dir_for(repo_path)
+    key = f"{repo_path}::{branch_name}"
+    with locked(queue_dir):
+        queue = load_queue(queue_dir)
+        job = queue["jobs"].setdefault(key, {
+            "repo_path": repo_path,
+            "branch": branch_name,
+            "set_upstream": False,
+            "pending": 0,
+            "attempts": 0,
+            "next_attempt": 0,
+            "last_error": None,
+            "enqueued": time.time(),
+        })
+        job["pending"] += 1
+        job["set_upstream"] = job["set_upstream"] or set_upstream
+        job.pop("failed", None)
+        save_queue(queue_dir, queue)
+        pending = job["pending"]
+    if start:
+        start_worker(queue_dir)
+    return pending
+
+# Start Worker
+def start_worker(queue_dir):
+    """Launch a detached worker; it exits at once if another worker is running."""
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "worker", queue_dir],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        close_fds=True,
+    )
+
+# Push One Job
+def push(job):
+    """Run git push for a job; returns (ok, error text)."""
+    command = ['git', '-C', job["repo_path"], 'push']
+    if job["set_upstream"]:
+        command.append('-u')
+    command += ['origin', job["branch"]]
+    env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+    try:
+        result = tracing.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                env=env, timeout=PUSH_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        return False, "push timed out"
+    return result.returncode == 0, result.stderr.strip()
+
+# Process Due Jobs
+def run_once(queue_dir):
+    """Push every due job once. Returns seconds until the next due job, or None if the queue is empty."""
+    LOG_FILE = os.path.join(queue_dir, LOG_FILE_NAME)
+    with locked(queue_dir):
+        jobs = load_queue(queue_dir)["jobs"]
+    now = time.time()
+    for key, job in sorted(jobs.items()):
+        if job.get("failed") or job["next_attempt"] > now:
+            continue
+        ok, error = push(job)
+        with locked(queue_dir):
+            queue = load_queue(queue_dir)
+            current = queue["jobs"].get(key)
+            if current is None:
+                continue
+            if ok:
+                current["pending"] -= job["pending"]
+                if current["pending"] <= 0:
+                    del queue["jobs"][key]
+                else:
+                    current.update({"attempts": 0, "next_attempt": 0, "last_error": None})
+                log_to_file(f"Pushed branch '{job['branch']}' ({job['pending']} queued commits) from {job['repo_path']}", LOG_FILE)
+            else:
+                current["attempts"] += 1
+                current["last_error"] = error
+                backoff = min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * 2 ** (current["attempts"] - 1))
+                current["next_attempt"] = time.time() + backoff
+                if current["attempts"] >= MAX_ATTEMPTS:
+                    current["failed"] = True
+                log_to_file(f"Error pushing branch '{job['branch']}' (attempt {current['attempts']}): {error}", LOG_FILE)
+            save_queue(queue_dir, queue)
+    metrics.flush()  # The worker can live for hours while a remote is down
+
+    with locked(queue_dir):
+        waiting = [job["next_attempt"] for job in load_queue(queue_dir)["jobs"].values() if not job.get("failed")]
+    if not waiting:
+        return None
+    return max(0.0, min(waiting) - time.time())
+
+# Worker Loop
+def worker(queue_dir):
+    """Drain the queue, sleeping between retries; only one worker runs per queue."""
+    metrics.install(queue_dir)
+    while True:
+        with locked(queue_dir, WORKER_LOCK_FILE_NAME, blocking=False) as acquired:
+            if not acquired:
+                return
+            delay = run_once(queue_dir)
+            while delay is not None:
+                time.sleep(min(delay, MAX_BACKOFF_SECONDS))
+                delay = run_once(queue_dir)
+        # A push queued while this worker was exiting saw the worker lock held
+        with locked(queue_dir):
+            jobs = load_queue(queue_dir)["jobs"].values()
+            if not any(not job.get("failed") for job in jobs):
+                return
+
+# Replay Failed Jobs
+def replay(queue_dir):
+    """Reset failed and backed-off jobs so they are pushed right away."""
+    with locked(queue_dir):
+        queue = load_queue(queue_dir)
+        for job in queue["jobs"].values():
+            job.pop("failed", None)
+            job.update({"attempts": 0, "next_attempt": 0})
+        save_queue(queue_dir, queue)
+    return len(queue["jobs"])
+
+# Queue Status
+def status(queue_dir):
+    """Return one human-readable line per queued branch."""
+    with locked(queue_dir):
+        jobs = load_queue(queue_dir)["jobs"]
+    lines = []
+    for job in sorted(jobs.values(), key=lambda job: job["enqueued"]):
+        if job.get("failed"):
+            state = "failed"
+        elif job["next_attempt"] > time.time():
+            state = f"retry in {int(job['next_attempt'] - time.time())}s"
+        else:
+            state = "pending"
+        line = f"{job['repo_path']} {job['branch']}: {job['pending']} commits, {state}, {job['attempts']} attempts"
+        if job["last_error"]:
+            line += f" - {job['last_error'].splitlines()[0]}"
+        lines.append(line)
+    return lines
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect and drive the background push queue.")
+    parser.add_argument("command", choices=["status", "worker", "replay"], help="Queue command to run")
+    parser.add_argument("queue_dir", type=str, help="Workspace folder holding the clones and the queue")
+
+    args = parser.parse_args()
+    if args.command == "worker":
+        worker(args.queue_dir)
+    elif args.command == "replay":
+        print(f"{replay(args.queue_dir)} queued branches will be retried")
+        start_worker(args.queue_dir)
+    else:
+        print("\n".join(status(args.queue_dir)) or "Push queue is empty")
+
+#  python3 push_queue.py status /Users/thrisham/Desktop/cobol_code/Internationalization
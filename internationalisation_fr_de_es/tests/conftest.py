@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+import subprocess
+import pytest
+
+# The scripts import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def git(repo, *args):
+    """Run git in repo (None: no -C) and return its stdout."""
+    command = ["git"] + (["-C", str(repo)] if repo else []) + list(args)
+    return subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True).stdout
+
+def write(repo, rel_path, text):
+    """Write a UTF-8 file below repo, creating its folders."""
+    path = os.path.join(repo, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as source:
+        source.write(text)
+
+def backdate(repo):
+    """Move every mtime out of the racy window, as for files edited a while before the commit."""
+    past = time.time() - 60
+    for root, dirs, files in os.walk(repo):
+        dirs[:] = [name for name in dirs if name != ".git"]
+        for name in files + dirs:
+            os.utime(os.path.join(root, name), (past, past))
+    os.utime(repo, (past, past))
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch):
+    """Commits need an author; test machines may have no global git identity."""
+    for name in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{name}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{name}_EMAIL", "test@example.com")
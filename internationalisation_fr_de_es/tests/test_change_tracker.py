@@ -0,0 +1,112 @@
+import os
+import time
+import shutil
+import subprocess
+import sys
+import pytest
+import change_tracker
+from conftest import backdate, git, write
+
+def git_changed(repo):
+    return bool(git(repo, "--no-optional-locks", "status", "--porcelain").strip())
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.delenv("I18N_CHANGE_WATCH", raising=False)
+    repo = str(tmp_path / "App")
+    os.makedirs(repo)
+    git(repo, "init", "-q")
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO.\n")
+    write(repo, "copybook/greet.cpy", "       01 GREETING PIC X(10).\n")
+    backdate(repo)
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "first")
+    change_tracker.record(repo)
+    return repo
+
+def assert_matches_git(repo, expected):
+    tracked = change_tracker.has_changes(repo)
+    assert git_changed(repo) == expected
+    assert tracked is expected or (tracked is True and not expected)  # Over-reporting is allowed, missing is not
+    assert change_tracker.verify(repo)[2]
+    return tracked
+
+def test_clean_tree(repo):
+    assert assert_matches_git(repo, False) is False
+
+def test_edit(repo):
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO2.\n")
+    assert assert_matches_git(repo, True) is True
+
+def test_new_file(repo):
+    write(repo, "cobol/new.cbl", "       PROGRAM-ID. NEW.\n")
+    assert assert_matches_git(repo, True) is True
+
+def test_new_nested_folder(repo):
+    write(repo, "cobol/batch/nightly/run.cbl", "       PROGRAM-ID. RUN.\n")
+    assert assert_matches_git(repo, True) is True
+
+def test_delete(repo):
+    os.remove(os.path.join(repo, "copybook", "greet.cpy"))
+    assert assert_matches_git(repo, True) is True
+
+def test_delete_folder(repo):
+    shutil.rmtree(os.path.join(repo, "copybook"))
+    assert assert_matches_git(repo, True) is True
+
+def test_revert(repo):
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO2.\n")
+    git(repo, "checkout", "--", "cobol/hello.cbl")
+    assert_matches_git(repo, False)  # Touched, so "maybe changed" until git confirms
+    assert change_tracker.record(repo)["files"]["cobol/hello.cbl"] is None  # Still racily clean
+    backdate(repo)
+    change_tracker.record(repo)
+    assert assert_matches_git(repo, False) is False
+
+def test_staging(repo):
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO2.\n")
+    backdate(repo)
+    git(repo, "add", "cobol/hello.cbl")
+    assert assert_matches_git(repo, True) is True
+
+def test_no_manifest(tmp_path):
+    assert change_tracker.has_changes(str(tmp_path)) is None
+
+def test_racy_file_is_rechecked(repo):
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO2.\n")
+    git(repo, "commit", "-q", "-am", "second")
+    manifest = change_tracker.record(repo)
+    assert manifest["files"]["cobol/hello.cbl"] is None
+    assert change_tracker.has_changes(repo) is True
+    # The watcher only counts a racy file once it is modified after the recording
+    assert change_tracker.tree_differs(repo, manifest, racy_after_record=True) is False
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO3.\n")
+    assert change_tracker.tree_differs(repo, manifest, racy_after_record=True) is True
+
+def test_edit_before_the_watcher_arms_is_seen(repo):
+    manifest = change_tracker.load_manifest(repo)
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO2.\n")
+    assert change_tracker.tree_differs(repo, manifest, racy_after_record=True) is True
+
+def test_reused_watcher_pid_falls_back_to_the_tree(repo):
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO2.\n")
+    # A live process that is not the watcher, e.g. one that took over a dead watcher's pid
+    with open(change_tracker.marker_path_for(repo), "w", encoding="utf-8") as marker:
+        marker.write(str(os.getpid()))
+    assert change_tracker.watcher_answer(repo) is None
+    assert change_tracker.has_changes(repo) is True
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="needs /proc")
+def test_live_watcher_is_recognised(repo):
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)",
+                                "change_tracker.py", "watch", repo])
+    try:
+        # The real watcher writes its pid long after exec; wait for the command line to show
+        while b"watch" not in open(f"/proc/{process.pid}/cmdline", "rb").read():
+            time.sleep(0.01)
+        with open(change_tracker.marker_path_for(repo), "w", encoding="utf-8") as marker:
+            marker.write(str(process.pid))
+        assert change_tracker.watcher_answer(repo) is False
+    finally:
+        process.kill()
+        process.wait()
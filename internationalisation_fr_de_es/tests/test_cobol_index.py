@@ -0,0 +1,64 @@
+import os
+import pytest
+import cobol_index
+from conftest import git, write
+
+def program(program_id, copies=()):
+    lines = ["       IDENTIFICATION DIVISION.", f"       PROGRAM-ID. {program_id}.", "       DATA DIVISION.",
+             "       WORKING-STORAGE SECTION."]
+    lines += [f"       COPY {member}." for member in copies]
+    lines += ["       PROCEDURE DIVISION.", "       MAIN-PARA.", "           GOBACK."]
+    return "\n".join(lines) + "\n"
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = str(tmp_path / "App")
+    os.makedirs(repo)
+    git(repo, "init", "-q")
+    write(repo, "cobol/hello.cbl", program("HELLO", ["GREET"]))
+    write(repo, "cobol/bye.cbl", program("BYE"))
+    write(repo, "copybook/greet.cpy", "       01 GREETING PIC X(10).\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "first")
+    cobol_index.lookup_index(repo)  # First use builds the index
+    return repo
+
+@pytest.fixture
+def no_walk(monkeypatch):
+    def walk(repo_path):
+        raise AssertionError("the tree was walked")
+    monkeypatch.setattr(cobol_index, "iter_sources", walk)
+
+def test_first_lookup_builds_the_index_at_head(repo):
+    index = cobol_index.load_index(repo)
+    assert set(index["files"]) == {"cobol/hello.cbl", "cobol/bye.cbl", "copybook/greet.cpy"}
+    assert index["head"] == git(repo, "rev-parse", "HEAD").strip()
+
+def test_warm_lookup_trusts_the_index(repo, no_walk):
+    index = cobol_index.lookup_index(repo)
+    assert cobol_index.resolve_checked(repo, index, "HELLO") == ("cobol/hello.cbl", 2)
+    assert cobol_index.resolve_checked(repo, index, "GREET") == ("copybook/greet.cpy", 1)
+    assert cobol_index.resolve_checked(repo, index, "GREET", program="BYE") is None
+
+def test_edited_match_is_rescanned(repo, no_walk):
+    index = cobol_index.lookup_index(repo)
+    write(repo, "cobol/hello.cbl", "      * Renamed\n" + program("HOLA"))
+    assert cobol_index.resolve_checked(repo, index, "HELLO") is None
+    assert cobol_index.resolve_checked(repo, index, "HOLA") == ("cobol/hello.cbl", 3)
+
+def test_deleted_match_is_dropped(repo, no_walk):
+    index = cobol_index.lookup_index(repo)
+    os.remove(os.path.join(repo, "cobol", "bye.cbl"))
+    assert cobol_index.resolve_checked(repo, index, "BYE") is None
+    assert "cobol/bye.cbl" not in cobol_index.load_index(repo)["files"]
+
+def test_new_commit_refreshes_from_the_diff(repo, no_walk):
+    write(repo, "cobol/new.cbl", program("NEWPGM", ["GREET"]))
+    git(repo, "rm", "-q", "cobol/bye.cbl")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "second")
+    index = cobol_index.lookup_index(repo)
+    assert cobol_index.resolve_checked(repo, index, "NEWPGM") == ("cobol/new.cbl", 2)
+    assert cobol_index.resolve_checked(repo, index, "BYE") is None
+    assert index["reverse"]["GREET"] == ["cobol/hello.cbl", "cobol/new.cbl"]
+    assert index["head"] == git(repo, "rev-parse", "HEAD").strip()
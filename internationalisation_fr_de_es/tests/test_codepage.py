@@ -0,0 +1,73 @@
+import os
+import codepage
+
+SOURCE = "       IDENTIFICATION DIVISION.\n       PROGRAM-ID. HELLO.\n"
+
+def make_repo(tmp_path):
+    repo = tmp_path / "work" / "App"
+    conf = repo / "application-conf"
+    conf.mkdir(parents=True)
+    (conf / "application.properties").write_text("zosEncoding = cp1140 :: **/*.cbl\n", encoding="utf-8")
+    (repo / "cobol").mkdir()
+    (repo / "cobol" / "hello.cbl").write_text(SOURCE, encoding="utf-8")
+    return str(repo), str(tmp_path / "mirror")
+
+def mirror_file(mirror, repo):
+    return os.path.join(mirror, os.path.basename(repo), "cobol", "hello.cbl")
+
+def test_to_host_writes_the_host_code_page(tmp_path):
+    repo, mirror = make_repo(tmp_path)
+    stats = codepage.sync(repo, to_host=True, mirror_root=mirror, workers=1)
+    assert stats["converted"] == ["cobol/hello.cbl"]
+    with open(mirror_file(mirror, repo), "rb") as host_file:
+        assert host_file.read().decode("cp1140") == SOURCE
+
+def test_from_host_keeps_work_tree_edits(tmp_path):
+    repo, mirror = make_repo(tmp_path)
+    codepage.sync(repo, to_host=True, mirror_root=mirror, workers=1)
+    work_file = os.path.join(repo, "cobol", "hello.cbl")
+    with open(work_file, "a", encoding="utf-8") as source:
+        source.write("      * Déjà modifié\n")
+
+    stats = codepage.sync(repo, to_host=False, mirror_root=mirror, workers=1)
+    assert stats["converted"] == [] and stats["conflicts"] == []
+    with open(work_file, encoding="utf-8") as source:
+        assert source.read().endswith("Déjà modifié\n")
+
+def test_mirror_edit_comes_back(tmp_path):
+    repo, mirror = make_repo(tmp_path)
+    codepage.sync(repo, to_host=True, mirror_root=mirror, workers=1)
+    with open(mirror_file(mirror, repo), "ab") as host_file:
+        host_file.write("      * é\n".encode("cp1140"))
+
+    stats = codepage.sync(repo, to_host=False, mirror_root=mirror, workers=1)
+    assert stats["converted"] == ["cobol/hello.cbl"]
+    with open(os.path.join(repo, "cobol", "hello.cbl"), encoding="utf-8") as source:
+        assert source.read() == SOURCE + "      * é\n"
+    assert codepage.sync(repo, to_host=True, mirror_root=mirror, workers=1)["converted"] == []
+
+def test_both_sides_changed_is_a_conflict(tmp_path):
+    repo, mirror = make_repo(tmp_path)
+    codepage.sync(repo, to_host=True, mirror_root=mirror, workers=1)
+    work_file = os.path.join(repo, "cobol", "hello.cbl")
+    with open(work_file, "a", encoding="utf-8") as source:
+        source.write("      * work tree\n")
+    with open(mirror_file(mirror, repo), "ab") as host_file:
+        host_file.write("      * mirror\n".encode("cp1140"))
+
+    for to_host in (False, True):
+        stats = codepage.sync(repo, to_host=to_host, mirror_root=mirror, workers=1)
+        assert stats["converted"] == [] and stats["conflicts"] == ["cobol/hello.cbl"]
+        assert "changed on both sides" in codepage.describe(stats)
+    with open(work_file, encoding="utf-8") as source:
+        assert source.read().endswith("work tree\n")
+    with open(mirror_file(mirror, repo), "rb") as host_file:
+        assert host_file.read().decode("cp1140").endswith("mirror\n")
+
+def test_deleted_file_leaves_the_mirror_unless_edited_there(tmp_path):
+    repo, mirror = make_repo(tmp_path)
+    codepage.sync(repo, to_host=True, mirror_root=mirror, workers=1)
+    os.remove(os.path.join(repo, "cobol", "hello.cbl"))
+    stats = codepage.sync(repo, to_host=True, mirror_root=mirror, workers=1)
+    assert stats["removed"] == ["cobol/hello.cbl"]
+    assert not os.path.exists(mirror_file(mirror, repo))
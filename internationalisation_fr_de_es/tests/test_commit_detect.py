@@ -0,0 +1,44 @@
+import pytest
+import commit_detect
+import translator_breaker
+
+class RenamingTranslator:
+    """Fake remote translator that also translates the placeholder names."""
+
+    def __init__(self, source, target):
+        self.target = target
+
+    def translate(self, message):
+        return message.replace("Currently on branch", "Actuellement sur la branche").replace("{current_branch}", "{branche_actuelle}")
+
+class GoodTranslator(RenamingTranslator):
+    def translate(self, message):
+        return message.replace("Currently on branch", "Actuellement sur la branche")
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch):
+    monkeypatch.setattr(commit_detect, "translation_breaker", translator_breaker.CircuitBreaker(str(tmp_path / "state.json")))
+    monkeypatch.setattr(commit_detect, "translation_cache", translator_breaker.TranslationCache(str(tmp_path / "cache.json")))
+    return monkeypatch
+
+def test_renamed_placeholder_falls_back_to_english(remote):
+    remote.setattr(commit_detect, "TRANSLATOR_FACTORY", RenamingTranslator)
+    text = commit_detect.translate("Currently on branch: {current_branch}", "fr", current_branch="main")
+    assert text == "Currently on branch: main"
+    assert commit_detect.translation_cache.get("Currently on branch: {current_branch}", "fr") is None
+
+def test_translation_is_formatted_and_cached(remote):
+    remote.setattr(commit_detect, "TRANSLATOR_FACTORY", GoodTranslator)
+    text = commit_detect.translate("Currently on branch: {current_branch}", "fr", current_branch="main")
+    assert text == "Actuellement sur la branche: main"
+    assert commit_detect.translation_cache.get("Currently on branch: {current_branch}", "fr") == "Actuellement sur la branche: {current_branch}"
+
+def test_stale_cache_entry_with_other_placeholders_is_ignored(remote):
+    remote.setattr(commit_detect, "TRANSLATOR_FACTORY", GoodTranslator)
+    commit_detect.translation_cache.put("Currently on branch: {current_branch}", "fr", "Branche : {branche}")
+    text = commit_detect.translate("Currently on branch: {current_branch}", "fr", current_branch="main")
+    assert text == "Actuellement sur la branche: main"
+
+def test_english_needs_no_translator(remote):
+    remote.setattr(commit_detect, "TRANSLATOR_FACTORY", None)
+    assert commit_detect.translate("File found: {file_path}", "en", file_path="a.cbl") == "File found: a.cbl"
@@ -0,0 +1,46 @@
+import os
+import pytest
+import impact_analysis
+from conftest import git, write
+
+PROGRAM = "       IDENTIFICATION DIVISION.\n       PROGRAM-ID. HELLO.\n       DATA DIVISION.\n       WORKING-STORAGE SECTION.\n       COPY GREET.\n"
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = str(tmp_path / "App")
+    os.makedirs(repo)
+    git(repo, "init", "-q")
+    git(repo, "checkout", "-q", "-b", "develop")
+    write(repo, "application-conf/application.properties", "mainBuildBranch = develop\n")
+    write(repo, "cobol/hello.cbl", PROGRAM)
+    write(repo, "copybook/greet.cpy", "       01 GREETING PIC X(10).\n")
+    write(repo, "copybook/unused.cpy", "       01 UNUSED PIC X.\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "first")
+    git(repo, "checkout", "-q", "-b", "feature")
+    return repo
+
+def commit_copybook_change(repo):
+    write(repo, "copybook/greet.cpy", "       01 GREETING PIC X(20).\n")
+    git(repo, "commit", "-q", "-am", "wider greeting")
+
+def test_against_the_main_build_branch(repo):
+    commit_copybook_change(repo)
+    branch, found, changed, builds = impact_analysis.build_list(repo)
+    assert (branch, found) == ("develop", True)
+    assert changed == ["copybook/greet.cpy"]
+    assert builds == ["cobol/hello.cbl"]
+
+def test_missing_main_build_branch_analyses_the_last_commit(repo):
+    git(repo, "branch", "-q", "-D", "develop")
+    commit_copybook_change(repo)
+    branch, found, changed, builds = impact_analysis.build_list(repo)
+    assert (branch, found) == ("develop", False)
+    assert changed == ["copybook/greet.cpy"]
+    assert builds == ["cobol/hello.cbl"]
+
+def test_first_commit_without_main_build_branch(repo):
+    git(repo, "branch", "-q", "-D", "develop")
+    base, found = impact_analysis.diff_base(repo, "develop")
+    assert (base, found) == (impact_analysis.EMPTY_TREE, False)
+    assert "cobol/hello.cbl" in impact_analysis.changed_files(repo, base)
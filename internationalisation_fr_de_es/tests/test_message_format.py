@@ -0,0 +1,41 @@
+import pytest
+import message_format
+
+SINGULAR = "Listed {n} branch in repository {repo_path}."
+PLURAL = "Listed {n} branches in repository {repo_path}."
+
+@pytest.mark.parametrize("lang, n, expected", [
+    ("fr", 0, "0 branche listée dans le dépôt /repo."),
+    ("fr", 1, "1 branche listée dans le dépôt /repo."),
+    ("fr", 2, "2 branches listées dans le dépôt /repo."),
+    ("de", 0, "0 Branches im Repository /repo aufgelistet."),
+    ("de", 1, "1 Branch im Repository /repo aufgelistet."),
+    ("es", 0, "0 ramas listadas en el repositorio /repo."),
+    ("es", 2, "2 ramas listadas en el repositorio /repo."),
+])
+def test_plural_form_follows_the_catalog_header(lang, n, expected):
+    assert message_format.MessageFormatter(lang).nformat(SINGULAR, PLURAL, n, repo_path="/repo") == expected
+
+def test_plural_forms_header_parsing():
+    assert message_format.parse_plural_forms("nplurals=2; plural=(n > 1);") == (2, "(n > 1)")
+    assert message_format.parse_plural_forms(None) == (2, "(n != 1)")
+    french = message_format.compile_plural("(n > 1)")
+    assert [french(n) for n in (0, 1, 2)] == [0, 0, 1]
+
+@pytest.mark.parametrize("template, kwargs", [
+    ("Checked out '{branch}'.", {"branch": "main"}),
+    ("{name!r} has {count:>4} files", {"name": "App", "count": 7}),
+    ("{rate:.{digits}f}", {"rate": 1.23456, "digits": 2}),
+    ("{value.real} attribute", {"value": 3}),
+    ("{{braces}} and {name}", {"name": "x"}),
+    ("no fields at all", {}),
+    ('quotes " and \\ backslash {name}', {"name": "x"}),
+])
+def test_compiled_template_matches_str_format(template, kwargs):
+    assert message_format.compile_template(template)(kwargs) == template.format(**kwargs)
+
+@pytest.mark.parametrize("template", ["{a!x}", "unbalanced {", "{a!}"])
+def test_invalid_template_is_shown_as_is(template):
+    with pytest.raises(ValueError):
+        template.format(a=1)
+    assert message_format.compile_template(template)({"a": 1}) == template
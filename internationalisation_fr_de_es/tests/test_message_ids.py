@@ -0,0 +1,41 @@
+import os
+import shutil
+import pytest
+import message_ids
+import message_format
+import message_extractor
+
+def test_table_is_current():
+    script_paths = [os.path.join(message_extractor.BASE_PATH, name) for name in message_extractor.SCRIPTS]
+    with open(message_extractor.TABLE_FILE, encoding="utf-8") as table:
+        assert table.read() == message_extractor.table_source(message_extractor.extract_messages(script_paths)), \
+            "message_ids.py is stale: run message_extractor.py"
+
+def test_ids_index_every_catalog():
+    msg_id = message_ids.IDS["Folder deleted."]
+    assert message_ids.M_FOLDER_DELETED == msg_id
+    assert message_ids.lookup("fr", msg_id) == "Dossier supprimé."
+    assert message_ids.lookup("en", msg_id) == "Folder deleted."
+    assert all(len(templates) == len(message_ids.MESSAGES) for templates in message_ids.CATALOGS.values())
+
+def test_current_table_answers_without_gettext(monkeypatch):
+    formatter = message_format.MessageFormatter("fr")
+    assert formatter.table is message_ids.CATALOGS["fr"]
+    monkeypatch.setattr(message_format.MessageFormatter, "translation", property(lambda self: pytest.fail("gettext loaded")))
+    assert formatter.gettext("Folder deleted.") == "Dossier supprimé."
+    assert formatter.gettext(message_ids.M_FOLDER_DELETED) == "Dossier supprimé."
+    assert formatter.format(message_ids.M_CHECKED_OUT_BRANCH_BRANCH_NAME, branch_name="main") == formatter.format(
+        "Checked out branch '{branch_name}'.", branch_name="main")
+
+def test_unknown_message_falls_back_to_gettext():
+    formatter = message_format.MessageFormatter("fr")
+    assert formatter.gettext("Not in the table") == "Not in the table"
+
+def test_stale_table_falls_back_to_gettext(tmp_path):
+    locale_path = tmp_path / "locale"
+    shutil.copytree(message_format.LOCALE_PATH, locale_path)
+    with open(locale_path / "en-fr" / "LC_MESSAGES" / "messages.mo", "ab") as mo_file:
+        mo_file.write(b"\0")  # Any change to the catalog makes the table stale
+    formatter = message_format.MessageFormatter("fr", str(locale_path))
+    assert formatter.table is None
+    assert formatter.gettext(message_ids.M_FOLDER_DELETED) == "Dossier supprimé."
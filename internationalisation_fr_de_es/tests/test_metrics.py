@@ -0,0 +1,68 @@
+import json
+import os
+import random
+import pytest
+import file_lock
+import metrics
+
+EDGES = [0, 1, 63, 64, 65, 127, 128, 1000, 4095, 4096, 123_456, 10**9, metrics.MAX_MICROSECONDS]
+
+def test_bucket_bounds_contain_the_value():
+    for value in EDGES + random.Random(7).sample(range(metrics.MAX_MICROSECONDS), 1000):
+        index = metrics.bucket_index(value)
+        lowest, highest = metrics.bucket_bounds(index)
+        assert lowest <= value <= highest
+        assert metrics.bucket_index(lowest) == metrics.bucket_index(highest) == index
+        # 32 sub-buckets per power of two: the bucket is at most ~3% of its value wide
+        assert highest - lowest <= max(lowest, 1) / metrics.SUB_BUCKETS
+
+def test_buckets_are_contiguous():
+    previous_highest = -1
+    for index in range(metrics.bucket_index(10**6) + 1):
+        lowest, highest = metrics.bucket_bounds(index)
+        assert lowest == previous_highest + 1
+        previous_highest = highest
+
+def stats_of(values, failures=0):
+    stats = metrics.new_stats()
+    for position, value in enumerate(values):
+        metrics.observe(stats, value, ok=position >= failures)
+    return stats
+
+def test_quantile_is_close_to_the_exact_one():
+    values = list(range(1, 100_001))
+    stats = stats_of(values)
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert abs(metrics.quantile(stats, q) - exact) <= exact / metrics.SUB_BUCKETS
+
+def test_quantile_stays_within_the_observed_range():
+    assert metrics.quantile(metrics.new_stats(), 0.5) is None
+    stats = stats_of([5000])
+    assert [metrics.quantile(stats, q) for q in (0.5, 0.99)] == [5000, 5000]
+
+def test_merge_of_summaries_matches_one_workspace_with_all_observations():
+    first, second = list(range(100, 5000, 7)), list(range(3000, 90_000, 11))
+    summaries = []
+    for source, values in (("host-a:/ws", first), ("host-b:/ws", second)):
+        summary = metrics.summarize({"sources": [source], "operations": {"clone": stats_of(values, failures=2)}})
+        summaries.append(json.loads(json.dumps(summary)))  # As read back from the summary files
+    merged = metrics.merge(summaries)
+    together = metrics.summarize({"sources": [], "operations": {"clone": metrics.merge_stats(
+        stats_of(first, failures=2), stats_of(second, failures=2))}})
+    assert merged["sources"] == ["host-a:/ws", "host-b:/ws"]
+    clone = merged["operations"]["clone"]
+    assert clone["count"] == len(first) + len(second) and clone["failures"] == 4
+    assert {key: clone[key] for key in ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "min_us", "max_us")} == \
+        {key: together["operations"]["clone"][key] for key in ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "min_us", "max_us")}
+
+@pytest.mark.skipif(file_lock.fcntl is None, reason="needs fcntl")
+def test_flush_takes_the_shared_lock(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "_pending", [(str(tmp_path), "clone", 0.25, True)])
+    with file_lock.locked(str(tmp_path), metrics.LOCK_FILE_NAME):
+        with file_lock.locked(str(tmp_path), metrics.LOCK_FILE_NAME, blocking=False) as acquired:
+            assert acquired is False
+    metrics.flush()
+    saved = metrics.load_metrics(metrics.metrics_path_for(str(tmp_path)))
+    assert saved["operations"]["clone"]["count"] == 1
+    assert os.path.exists(tmp_path / metrics.LOCK_FILE_NAME)
@@ -0,0 +1,99 @@
+import os
+import sys
+import json
+import time
+import pytest
+import cobol_index
+import open_file_detect
+from conftest import git, write
+
+STUB_EDITOR = """
+import os
+import sys
+import json
+with open(os.environ["STUB_EDITOR_LOG"], "a", encoding="utf-8") as log:
+    log.write(json.dumps(sys.argv[1:]) + "\\n")
+"""
+
+PROGRAM = "       IDENTIFICATION DIVISION.\n       PROGRAM-ID. HELLO.\n       DATA DIVISION.\n       WORKING-STORAGE SECTION.\n       COPY GREET.\n"
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    stub = tmp_path / "editor.py"
+    stub.write_text(STUB_EDITOR, encoding="utf-8")
+    monkeypatch.setenv("OPEN_FILE_EDITOR", f"{sys.executable} {stub}")
+    monkeypatch.setenv("STUB_EDITOR_LOG", str(tmp_path / "launches.jsonl"))
+    active = tmp_path / "workspace"
+    repo = str(active / "App")
+    os.makedirs(repo)
+    git(repo, "init", "-q")
+    write(repo, "cobol/hello.cbl", PROGRAM)
+    write(repo, "copybook/greet.cpy", "       01 GREETING PIC X(10).\n")
+    write(repo, "docs/guide.txt", "guide\n")
+    write(repo, "docs/notes.txt", "notes\n")
+    write(repo, "README.md", "readme\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "first")
+    return str(active), repo, tmp_path / "launches.jsonl"
+
+def launches(log_path, expected=1):
+    """Editor launches recorded by the stub (the launcher is not waited for)."""
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if log_path.exists():
+            lines = log_path.read_text(encoding="utf-8").splitlines()
+            if len(lines) >= expected:
+                return [json.loads(line) for line in lines]
+        time.sleep(0.05)
+    return []
+
+def open_files(active, names):
+    return open_file_detect.main("App", "https://example.com", names, active, "Please open these files for me")
+
+def test_one_launch_for_names_globs_and_lines(workspace):
+    active, repo, log_path = workspace
+    open_files(active, "HELLO, greet.cpy, README.md:3, docs/*.txt, GREET:4")
+    launch, = launches(log_path)
+    assert launch == [
+        "--reuse-window", "--goto",
+        f"{repo}/cobol/hello.cbl:2",
+        f"{repo}/copybook/greet.cpy:4",
+        f"{repo}/copybook/greet.cpy:1",
+        f"{repo}/README.md:3",
+        f"{repo}/docs/guide.txt:1",
+        f"{repo}/docs/notes.txt:1",
+    ]
+    time.sleep(0.2)
+    assert len(launches(log_path)) == 1
+
+def test_missing_names_are_reported_and_nothing_is_launched(workspace):
+    active, repo, log_path = workspace
+    result = open_files(active, "MISSING, nothere.cbl")
+    assert "MISSING" in result and "nothere.cbl" in result
+    time.sleep(0.3)
+    assert not log_path.exists()
+
+def test_plain_file_names_do_not_load_the_index(workspace, monkeypatch):
+    active, repo, log_path = workspace
+    monkeypatch.setattr(cobol_index, "lookup_index", lambda repo_path: pytest.fail("index loaded"))
+    open_files(active, "README.md, cobol/hello.cbl:5")
+    launch, = launches(log_path)
+    assert launch[2:] == [f"{repo}/README.md:1", f"{repo}/cobol/hello.cbl:5"]
+
+def test_walk_stops_once_every_name_is_found(workspace, monkeypatch):
+    active, repo, log_path = workspace
+    for folder in range(20):
+        write(repo, f"zz{folder:02}/other.txt", "other\n")
+    visited = []
+    real_walk = os.walk
+
+    def counting_walk(top):
+        for item in real_walk(top):
+            visited.append(item[0])
+            yield item
+
+    monkeypatch.setattr(open_file_detect.os, "walk", counting_walk)
+    monkeypatch.setattr(open_file_detect, "_", lambda message: message, raising=False)
+    found = open_file_detect.find_files_in_repo(repo, ["README.md"], os.path.join(active, "log.txt"))
+    assert found == {"README.md": [os.path.join(repo, "README.md")]}
+    assert visited == [repo]
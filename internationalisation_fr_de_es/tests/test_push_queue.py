@@ -0,0 +1,67 @@
+import os
+import pytest
+import push_queue
+from conftest import git
+
+@pytest.fixture
+def workspace(tmp_path):
+    remote = tmp_path / "remote.git"
+    git(None, "init", "-q", "--bare", str(remote))
+    repo = tmp_path / "workspace" / "App"
+    git(None, "clone", "-q", str(remote), str(repo))
+    commit(repo, "first")
+    git(repo, "push", "-q", "origin", "HEAD")
+    return str(remote), str(repo)
+
+def commit(repo, text):
+    with open(os.path.join(repo, "hello.cbl"), "a", encoding="utf-8") as source:
+        source.write(f"{text}\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", text)
+
+def test_replay_pushes_coalesced_commits_after_the_remote_returns(workspace):
+    remote, repo = workspace
+    branch = git(repo, "symbolic-ref", "--short", "HEAD").strip()
+    queue_dir = push_queue.queue_dir_for(repo)
+
+    commit(repo, "second")
+    assert push_queue.enqueue(repo, branch, start=False) == 1
+    commit(repo, "third")
+    assert push_queue.enqueue(repo, branch, start=False) == 2
+    assert len(push_queue.load_queue(queue_dir)["jobs"]) == 1
+
+    os.rename(remote, f"{remote}.offline")
+    delay = push_queue.run_once(queue_dir)
+    assert delay is not None and delay > 0
+    job, = push_queue.load_queue(queue_dir)["jobs"].values()
+    assert job["pending"] == 2 and job["attempts"] == 1 and job["last_error"]
+
+    os.rename(f"{remote}.offline", remote)
+    push_queue.run_once(queue_dir)  # Still backing off: nothing is pushed
+    assert git(remote, "rev-parse", branch).strip() != git(repo, "rev-parse", "HEAD").strip()
+
+    assert push_queue.replay(queue_dir) == 1
+    assert push_queue.run_once(queue_dir) is None
+    assert push_queue.load_queue(queue_dir)["jobs"] == {}
+    assert git(remote, "rev-parse", branch).strip() == git(repo, "rev-parse", "HEAD").strip()
+    with open(os.path.join(queue_dir, push_queue.LOG_FILE_NAME), encoding="utf-8") as log_file:
+        log = log_file.read()
+    assert log.count("Pushed branch") == 1 and "(2 queued commits)" in log
+    assert push_queue.status(queue_dir) == []
+
+def test_failed_job_is_retried_only_after_replay(workspace, monkeypatch):
+    remote, repo = workspace
+    branch = git(repo, "symbolic-ref", "--short", "HEAD").strip()
+    queue_dir = push_queue.queue_dir_for(repo)
+    monkeypatch.setattr(push_queue, "MAX_ATTEMPTS", 1)
+
+    commit(repo, "second")
+    push_queue.enqueue(repo, branch, start=False)
+    os.rename(remote, f"{remote}.offline")
+    assert push_queue.run_once(queue_dir) is None  # Gave up: nothing left to wait for
+    assert push_queue.status(queue_dir)[0].split(": ", 1)[1].startswith("1 commits, failed")
+
+    os.rename(f"{remote}.offline", remote)
+    push_queue.replay(queue_dir)
+    assert push_queue.run_once(queue_dir) is None
+    assert git(remote, "rev-parse", branch).strip() == git(repo, "rev-parse", "HEAD").strip()
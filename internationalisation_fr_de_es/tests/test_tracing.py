@@ -0,0 +1,95 @@
+import json
+import threading
+import subprocess
+import sys
+import pytest
+import tracing
+from conftest import git, write
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(tracing, "ENABLED", True)
+    monkeypatch.setattr(tracing, "_spans", [])
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as trace:
+        return [json.loads(line) for line in trace]
+
+def test_spans_keep_the_thread_they_ran_on(enabled, tmp_path):
+    idents = {}
+
+    def work(name):
+        with tracing.span(name):
+            idents[name] = threading.get_ident()
+
+    threads = [threading.Thread(target=work, args=(f"worker{index}",)) for index in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with tracing.span("main"):
+        idents["main"] = threading.get_ident()
+
+    tracing.flush(str(tmp_path / "trace.jsonl"), "jsonl")
+    spans = read_lines(tmp_path / "trace.jsonl")
+    assert {item["name"]: item["tid"] for item in spans} == idents
+
+def test_nested_spans_record_parent_and_errors(enabled, tmp_path):
+    with pytest.raises(ValueError):
+        with tracing.span("outer"):
+            with tracing.span("inner", file="hello.cbl"):
+                raise ValueError("boom")
+    tracing.flush(str(tmp_path / "trace.json"), "chrome")
+    with open(tmp_path / "trace.json", encoding="utf-8") as trace:
+        events = json.loads(trace.read().rstrip(",\n") + "]")
+    assert [(event["name"], event["args"].get("error")) for event in events] == [("inner", "ValueError"), ("outer", "ValueError")]
+    assert events[0]["args"]["file"] == "hello.cbl"
+
+def test_run_records_exit_code_and_captured_sizes(enabled, tmp_path):
+    tracing.run([sys.executable, "-c", "print('hello')"], stdout=subprocess.PIPE)
+    tracing.flush(str(tmp_path / "trace.jsonl"), "jsonl")
+    item, = read_lines(tmp_path / "trace.jsonl")
+    assert item["attrs"]["exit_code"] == 0
+    assert item["attrs"]["stdout_bytes"] == len("hello\n")
+    assert "stderr_bytes" not in item["attrs"]
+
+def test_disabled_tracing_returns_the_null_span(monkeypatch):
+    monkeypatch.setattr(tracing, "ENABLED", False)
+    assert tracing.span("anything") is tracing.NULL_SPAN
+
+def test_clone_and_pull_record_received_bytes(enabled, tmp_path):
+    origin = tmp_path / "origin"
+    git(None, "init", "-q", str(origin))
+    write(origin, "hello.cbl", "       DISPLAY 'HELLO'.\n" * 200)
+    git(origin, "add", ".")
+    git(origin, "commit", "-qm", "first")
+    (tmp_path / "work").mkdir()
+    tracing.run(["git", "clone", "-q", str(origin)], cwd=str(tmp_path / "work"), check=True)
+    clone = tmp_path / "origin-clone"
+    tracing.run(["git", "clone", "-q", str(origin), str(clone)], check=True)
+    write(origin, "second.cbl", "       STOP RUN.\n")
+    git(origin, "add", ".")
+    git(origin, "commit", "-qm", "second")
+    tracing.run(["git", "-C", str(clone), "pull", "-q"], check=True)
+
+    tracing.flush(str(tmp_path / "trace.jsonl"), "jsonl")
+    spans = read_lines(tmp_path / "trace.jsonl")
+    assert [item["name"] for item in spans] == ["subprocess git clone"] * 2 + ["subprocess git pull"]
+    assert all(item["attrs"]["received_bytes"] > 0 for item in spans)
+
+def test_captured_push_records_sent_bytes_without_progress_noise(enabled, tmp_path):
+    remote = tmp_path / "remote.git"
+    git(None, "init", "-q", "--bare", str(remote))
+    repo = tmp_path / "repo"
+    git(None, "init", "-q", str(repo))
+    write(repo, "hello.cbl", "       DISPLAY 'HELLO'.\n" * 200)
+    git(repo, "add", ".")
+    git(repo, "commit", "-qm", "first")
+    result = tracing.run(["git", "-C", str(repo), "push", str(remote), "HEAD:refs/heads/main"],
+                         stderr=subprocess.PIPE, text=True)
+
+    assert result.returncode == 0
+    assert "objects" not in result.stderr
+    tracing.flush(str(tmp_path / "trace.jsonl"), "jsonl")
+    item, = read_lines(tmp_path / "trace.jsonl")
+    assert item["attrs"]["sent_bytes"] > 0
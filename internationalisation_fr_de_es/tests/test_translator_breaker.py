@@ -0,0 +1,119 @@
+import os
+import sys
+import time
+import subprocess
+import translator_breaker
+from translator_breaker import CircuitBreaker, TranslationCache, guarded_translate
+
+class FakeTranslator:
+    """Local stand-in for the remote translator: counts calls, answers after a delay or fails."""
+
+    calls = []
+    delay = 0
+    fail = False
+
+    def __init__(self, source, target):
+        self.target = target
+
+    def translate(self, message):
+        FakeTranslator.calls.append(message)
+        time.sleep(FakeTranslator.delay)
+        if FakeTranslator.fail:
+            raise ConnectionError("translator unavailable")
+        return f"[{self.target}] {message}"
+
+def fake(delay=0, fail=False):
+    FakeTranslator.calls, FakeTranslator.delay, FakeTranslator.fail = [], delay, fail
+    return FakeTranslator
+
+def read_json(tmp_path):
+    return translator_breaker.read_json(str(tmp_path / "state.json"), {})
+
+def make_breaker(tmp_path, budget=10):
+    return CircuitBreaker(str(tmp_path / "state.json"), budget=budget, base_backoff=60)
+
+def test_translation_is_cached(tmp_path):
+    translator = fake()
+    breaker, cache = make_breaker(tmp_path), TranslationCache(str(tmp_path / "cache.json"))
+    assert guarded_translate("Folder deleted.", "fr", translator, breaker, cache) == "[fr] Folder deleted."
+    assert guarded_translate("Folder deleted.", "fr", translator, breaker, cache) == "[fr] Folder deleted."
+    assert translator.calls == ["Folder deleted."]
+    assert TranslationCache(str(tmp_path / "cache.json")).get("Folder deleted.", "fr") == "[fr] Folder deleted."
+
+def test_slow_translator_times_out_and_opens_the_breaker(tmp_path):
+    translator = fake(delay=1)
+    breaker, cache = make_breaker(tmp_path), TranslationCache(str(tmp_path / "cache.json"))
+    started = time.monotonic()
+    assert guarded_translate("Folder deleted.", "fr", translator, breaker, cache, timeout=0.1) == "Folder deleted."
+    assert time.monotonic() - started < 0.5
+    assert breaker.open
+    assert guarded_translate("Operation canceled.", "fr", translator, breaker, cache, timeout=0.1) == "Operation canceled."
+    assert translator.calls == ["Folder deleted."]
+
+def test_budget_caps_the_call_timeout(tmp_path):
+    translator = fake(delay=1)
+    breaker, cache = make_breaker(tmp_path, budget=0.2), TranslationCache(str(tmp_path / "cache.json"))
+    started = time.monotonic()
+    assert guarded_translate("Folder deleted.", "fr", translator, breaker, cache, timeout=5) == "Folder deleted."
+    assert time.monotonic() - started < 0.6
+
+def test_spent_budget_makes_no_call(tmp_path):
+    translator = fake()
+    breaker, cache = make_breaker(tmp_path, budget=0), TranslationCache(str(tmp_path / "cache.json"))
+    assert guarded_translate("Folder deleted.", "fr", translator, breaker, cache) == "Folder deleted."
+    assert translator.calls == []
+
+def test_failing_translator_falls_back_to_cache_or_english(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.json"))
+    cache.put("Folder deleted.", "fr", "Dossier supprimé.")
+    translator = fake(fail=True)
+    breaker = make_breaker(tmp_path)
+    assert guarded_translate("Operation canceled.", "fr", translator, breaker, cache) == "Operation canceled."
+    assert breaker.open
+    assert guarded_translate("Folder deleted.", "fr", translator, breaker, cache) == "Dossier supprimé."
+    assert guarded_translate("Repository cloned successfully.", "fr", translator, breaker, cache) == "Repository cloned successfully."
+    assert translator.calls == ["Operation canceled."]
+    state = read_json(tmp_path)
+    assert state["failures"] == 1 and state["open_until"] > time.time() + 50
+
+def test_backoff_doubles_and_success_closes(tmp_path):
+    breaker = make_breaker(tmp_path)
+    breaker.record_failure()
+    make_breaker(tmp_path).record_failure()
+    state = read_json(tmp_path)
+    assert state["failures"] == 2 and state["open_until"] > time.time() + 110
+    make_breaker(tmp_path).record_success()
+    assert read_json(tmp_path) == {"failures": 0, "open_until": 0}
+
+SECOND_PROCESS = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from translator_breaker import CircuitBreaker, TranslationCache, guarded_translate
+
+class CountingTranslator:
+    def __init__(self, source, target):
+        print("called")
+    def translate(self, message):
+        return "translated"
+
+breaker = CircuitBreaker(sys.argv[2])
+print(guarded_translate("Folder deleted.", "fr", CountingTranslator, breaker, TranslationCache(sys.argv[3])))
+print(breaker.open)
+"""
+
+def test_open_breaker_backs_off_a_second_process(tmp_path):
+    make_breaker(tmp_path).record_failure()
+    result = subprocess.run(
+        [sys.executable, "-c", SECOND_PROCESS, os.path.dirname(os.path.abspath(translator_breaker.__file__)),
+         str(tmp_path / "state.json"), str(tmp_path / "cache.json")],
+        stdout=subprocess.PIPE, text=True, check=True, cwd=str(tmp_path),
+    )
+    assert result.stdout.split() == ["Folder", "deleted.", "True"]
+
+def test_state_lives_in_a_private_per_user_folder(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    state_dir = translator_breaker.default_state_dir()
+    assert state_dir == str(tmp_path / "cache" / "i18n_translator")
+    TranslationCache(os.path.join(state_dir, "i18n_translation_cache.json")).put("Folder deleted.", "fr", "Dossier supprimé.")
+    if os.name == "posix":
+        assert os.stat(state_dir).st_mode & 0o077 == 0
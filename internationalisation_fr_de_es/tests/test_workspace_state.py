@@ -0,0 +1,62 @@
+import os
+import pytest
+import change_tracker
+import tracing
+import workspace_state
+from conftest import backdate, git, write
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.delenv("I18N_CHANGE_WATCH", raising=False)
+    repo = tmp_path / "App"
+    git(None, "init", "-q", "-b", "main", str(repo))
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO.\n")
+    backdate(repo)
+    git(repo, "add", ".")
+    git(repo, "commit", "-qm", "first")
+    return str(tmp_path)
+
+@pytest.fixture
+def git_calls(monkeypatch):
+    calls = []
+    run = tracing.run
+
+    def counting_run(command, **kwargs):
+        calls.append(command)
+        return run(command, **kwargs)
+
+    monkeypatch.setattr(tracing, "run", counting_run)
+    return calls
+
+def test_snapshot_is_reused_until_head_moves(workspace, monkeypatch):
+    first = workspace_state.snapshot(workspace, "App")
+    assert first["branch"] == "main"
+    monkeypatch.setattr(workspace_state, "build_snapshot", lambda *args: pytest.fail("snapshot rebuilt"))
+    assert workspace_state.snapshot(workspace, "App") == first
+
+def test_commit_invalidates_the_snapshot(workspace):
+    first = workspace_state.snapshot(workspace, "App")
+    repo = os.path.join(workspace, "App")
+    write(repo, "cobol/hello.cbl", "       PROGRAM-ID. HELLO2.\n")
+    git(repo, "commit", "-qam", "second")
+    second = workspace_state.snapshot(workspace, "App")
+    assert second["head_sha"] == git(repo, "rev-parse", "HEAD").strip() != first["head_sha"]
+
+def test_checkout_invalidates_the_snapshot(workspace):
+    repo = os.path.join(workspace, "App")
+    assert workspace_state.snapshot(workspace, "App")["branch"] == "main"
+    git(repo, "checkout", "-q", "-b", "feature")
+    assert workspace_state.snapshot(workspace, "App")["branch"] == "feature"
+
+def test_record_takes_the_dirty_flag_from_the_tracker(workspace, git_calls):
+    change_tracker.record(os.path.join(workspace, "App"))
+    del git_calls[:]
+    assert workspace_state.record(workspace, "App")["dirty"] is False
+    assert not any("status" in command for command in git_calls)
+
+def test_unknown_dirty_flag_is_computed_on_a_status_query(workspace, git_calls):
+    write(os.path.join(workspace, "App"), "cobol/new.cbl", "       STOP RUN.\n")
+    assert workspace_state.record(workspace, "App")["dirty"] is None
+    assert not any("status" in command for command in git_calls)
+    assert workspace_state.snapshot(workspace, "App", need_dirty=True)["dirty"] is True
+    assert workspace_state.load_state(workspace)["repos"]["App"]["dirty"] is True
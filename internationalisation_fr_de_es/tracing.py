@@ -0,0 +1,251 @@
+"""
+TRACING FILE
+
+Lightweight spans around the phases of a command (language detection,
+catalog load, file lookup, every git subprocess). Enable with
+I18N_TRACE=<output file>; I18N_TRACE_FORMAT=jsonl (default) or chrome picks
+JSON lines or the Chrome trace event format (chrome://tracing, Perfetto).
+When disabled, span() returns one shared no-op object. Subprocess spans
+record the size of the captured stdout/stderr and, for git clone/fetch/pull,
+how much the object store grew (received_bytes); git push spans record the
+pack size git reports with --progress (sent_bytes).
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import threading
+import subprocess
+
+TRACE_FILE = os.environ.get("I18N_TRACE")
+TRACE_FORMAT = os.environ.get("I18N_TRACE_FORMAT", "jsonl")
+ENABLED = bool(TRACE_FILE)
+
+_spans = []
+_local = threading.local()
+
+class NullSpan:
+    """Returned when tracing is off: every operation is a no-op."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+NULL_SPAN = NullSpan()
+
+class Span:
+    """A timed phase; nested spans record their parent."""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        self.tid = threading.get_ident()  # Spans are exported later, from whichever thread flushes
+        stack.append(self)
+        self.wall_ns = time.time_ns()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        _local.stack.pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _spans.append(self)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+# Start Span
+def span(name, **attrs):
+    """Time a phase: `with tracing.span("find_file", file=name) as sp: ... sp.set(found=True)`."""
+    if not ENABLED:
+        return NULL_SPAN
+    return Span(name, attrs)
+
+# Git commands that download objects into the local repository
+RECEIVING = ("git clone", "git fetch", "git pull")
+
+# "Writing objects: 100% (3/3), 1.20 KiB | 1.20 MiB/s, done."
+WRITING_RE = re.compile(r"Writing objects:.*?, ([\d.]+) (bytes|KiB|MiB|GiB)")
+PROGRESS_RE = re.compile(r"(Enumerating|Counting|Compressing|Writing) objects:|Delta compression using|Total \d+ \(delta")
+UNITS = {"bytes": 1, "KiB": 1 << 10, "MiB": 1 << 20, "GiB": 1 << 30}
+
+# Called as listener(command, seconds, exit_code) after every run(); exit_code is None on timeout
+listeners = []
+
+# Traced subprocess.run
+def run(command, **kwargs):
+    """subprocess.run inside a span recording the exit code, the captured output and the transfer size."""
+    if not ENABLED and not listeners:
+        return subprocess.run(command, **kwargs)
+    name = command_name(command)
+    receiving_repo = repo_for(command, kwargs.get("cwd")) if ENABLED and name in RECEIVING else None
+    store_before = object_store_bytes(receiving_repo) if receiving_repo else 0
+    # A captured push prints no progress, and so no pack size, unless asked to
+    measure_push = ENABLED and name == "git push" and kwargs.get("stderr") == subprocess.PIPE
+    if measure_push:
+        at = list(command).index("push") + 1
+        command = list(command[:at]) + ["--progress"] + list(command[at:])
+    with span(f"subprocess {name}", command=list(command)) as current:
+        started = time.perf_counter()
+        exit_code = None
+        outcome = None
+        try:
+            outcome = result = subprocess.run(command, **kwargs)
+            exit_code = result.returncode
+        except subprocess.CalledProcessError as error:
+            outcome = error
+            exit_code = error.returncode
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            for listener in listeners:
+                listener(command, elapsed, exit_code)
+            if outcome is not None:
+                current.set(exit_code=exit_code, **output_sizes(outcome.stdout, outcome.stderr))
+                if measure_push:
+                    sent, outcome.stderr = strip_progress(outcome.stderr)
+                    if sent is not None:
+                        current.set(sent_bytes=sent)
+            if receiving_repo:
+                current.set(received_bytes=max(0, object_store_bytes(receiving_repo) - store_before))
+        return result
+
+def command_name(command):
+    """'git clone', 'git pull', ... : the program and, for git, its subcommand."""
+    if os.path.basename(command[0]) != "git":
+        return command[0]
+    args = iter(command[1:])
+    for arg in args:
+        if arg == "-C":
+            next(args, None)
+        elif not arg.startswith("-"):
+            return f"git {arg}"
+    return "git"
+
+def repo_for(command, cwd=None):
+    """Work tree a git command writes objects into: the clone target, the -C folder, or cwd."""
+    base = cwd or os.getcwd()
+    args = iter(command[1:])
+    positional = []
+    for arg in args:
+        if arg in ("-C", "-c", "-o", "--origin", "-b", "--branch", "--depth", "--reference", "-j", "--jobs"):
+            value = next(args, None)
+            if arg == "-C" and value is not None:
+                base = os.path.join(base, value)
+        elif not arg.startswith("-"):
+            positional.append(arg)
+    if positional[:1] != ["clone"]:
+        return base
+    if len(positional) > 2:
+        return os.path.join(base, positional[2])
+    if len(positional) == 2:
+        url = positional[1].rstrip("/\\")
+        name = re.split(r"[/\\:]", url)[-1]
+        return os.path.join(base, name[:-4] if name.endswith(".git") else name)
+    return None
+
+def object_store_bytes(repo_path):
+    """Bytes of the packs and loose objects under <repo>/.git/objects; 0 before the clone exists."""
+    objects = os.path.join(repo_path, ".git", "objects")
+    total = 0
+    try:
+        folders = list(os.scandir(objects))
+    except OSError:
+        return 0
+    for folder in folders:
+        # Loose objects live in two-hex-digit folders; pack/ holds the downloaded packs
+        if folder.name != "pack" and len(folder.name) != 2:
+            continue
+        try:
+            entries = list(os.scandir(folder.path))
+        except OSError:
+            continue
+        for entry in entries:
+            if folder.name == "pack" and not entry.name.endswith(".pack"):
+                continue
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+    return total
+
+def strip_progress(stderr):
+    """(pack bytes git reported sending, stderr without the --progress lines we asked for)."""
+    if stderr is None:
+        return None, stderr
+    text = stderr.decode("utf-8", "surrogateescape") if isinstance(stderr, bytes) else stderr
+    sent = None
+    for match in WRITING_RE.finditer(text):
+        sent = int(float(match.group(1)) * UNITS[match.group(2)])
+    kept = []
+    for line in text.splitlines(keepends=True):
+        # splitlines() also breaks on the \r git uses to redraw a progress line
+        if not PROGRESS_RE.match(line.lstrip()):
+            kept.append(line)
+    text = "".join(kept)
+    return sent, text.encode("utf-8", "surrogateescape") if isinstance(stderr, bytes) else text
+
+def output_sizes(stdout, stderr):
+    """Bytes of captured stdout/stderr; output passed through to the terminal is not counted."""
+    sizes = {}
+    for key, value in (("stdout_bytes", stdout), ("stderr_bytes", stderr)):
+        if value is not None:
+            sizes[key] = len(value.encode("utf-8") if isinstance(value, str) else value)
+    return sizes
+
+# Export
+def to_jsonl(item):
+    return {
+        "name": item.name,
+        "parent": item.parent,
+        "start_ns": item.wall_ns,
+        "duration_ns": item.duration_ns,
+        "pid": os.getpid(),
+        "tid": item.tid,
+        "attrs": item.attrs,
+    }
+
+def to_chrome(item):
+    return {
+        "name": item.name,
+        "ph": "X",
+        "ts": item.wall_ns / 1000,
+        "dur": item.duration_ns / 1000,
+        "pid": os.getpid(),
+        "tid": item.tid,
+        "args": item.attrs,
+    }
+
+def flush(trace_file=None, trace_format=None):
+    """Append the recorded spans to the trace file; several processes may share it."""
+    trace_file = trace_file or TRACE_FILE
+    trace_format = trace_format or TRACE_FORMAT
+    if not trace_file or not _spans:
+        return
+    spans, _spans[:] = list(_spans), []
+    with open(trace_file, "a", encoding="utf-8") as trace:
+        if trace_format == "chrome":
+            # JSON array format: the closing ']' is optional, so events can be appended
+            if trace.tell() == 0:
+                trace.write("[\n")
+            trace.write("".join(json.dumps(to_chrome(item), default=str) + ",\n" for item in spans))
+        else:
+            trace.write("".join(json.dumps(to_jsonl(item), default=str) + "\n" for item in spans))
+
+if ENABLED:
+    atexit.register(flush)
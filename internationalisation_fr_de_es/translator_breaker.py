@@ -0,0 +1,166 @@
+"""
+TRANSLATOR BREAKER FILE
+
+Circuit breaker, time budget and cache for the remote translator. After the
+first failure or timeout the remaining messages of the command are served
+from the cache or left in English, and other processes back off too through
+a small shared state file. State and cache live in a per-user folder
+(I18N_TRANSLATOR_STATE_DIR, else $XDG_CACHE_HOME or ~/.cache), never in the
+shared temp folder where another user could plant translations.
+"""
+
+import os
+import json
+import time
+import threading
+from string import Formatter
+
+# State Folder
+def default_state_dir():
+    """Per-user folder for the breaker state and the translation cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "i18n_translator")
+
+STATE_DIR = os.environ.get("I18N_TRANSLATOR_STATE_DIR") or default_state_dir()
+STATE_FILE = os.path.join(STATE_DIR, "i18n_translator_state.json")
+CACHE_FILE = os.path.join(STATE_DIR, "i18n_translation_cache.json")
+
+BUDGET_SECONDS = float(os.environ.get("I18N_TRANSLATE_BUDGET", "10"))
+CALL_TIMEOUT_SECONDS = float(os.environ.get("I18N_TRANSLATE_TIMEOUT", "3"))
+BASE_BACKOFF_SECONDS = 30
+MAX_BACKOFF_SECONDS = 30 * 60
+
+# Read / Write JSON State
+def read_json(path, default):
+    """Read a small JSON file, returning default if it is missing or corrupt."""
+    try:
+        with open(path, "r", encoding="utf-8") as state:
+            return json.load(state)
+    except (OSError, ValueError):
+        return default
+
+def write_json(path, data):
+    """Write a small JSON file atomically so concurrent readers never see half a file."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as state:
+            json.dump(data, state, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # The breaker must never break a command
+
+# Call With Timeout
+def call_with_timeout(function, timeout):
+    """Run function in a daemon thread; raise TimeoutError if it does not finish in time."""
+    result = {}
+
+    def target():
+        try:
+            result["value"] = function()
+        except Exception as error:
+            result["error"] = error
+
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError(f"translation did not finish within {timeout:.1f}s")
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+class CircuitBreaker:
+    """Per-process breaker with a total time budget and backoff shared via STATE_FILE."""
+
+    def __init__(self, state_file=STATE_FILE, budget=BUDGET_SECONDS,
+                 base_backoff=BASE_BACKOFF_SECONDS, max_backoff=MAX_BACKOFF_SECONDS):
+        self.state_file = state_file
+        self.budget = budget
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.started = time.monotonic()
+        self.open = False
+
+    def remaining(self):
+        """Seconds left in this command's translation budget."""
+        return self.budget - (time.monotonic() - self.started)
+
+    def allow(self):
+        """Return True if a remote call may be attempted now."""
+        if self.open or self.remaining() <= 0:
+            return False
+        state = read_json(self.state_file, {})
+        if state.get("open_until", 0) > time.time():
+            self.open = True
+            return False
+        return True
+
+    def record_success(self):
+        """Close the shared breaker after a successful call."""
+        state = read_json(self.state_file, {})
+        if state.get("failures"):
+            write_json(self.state_file, {"failures": 0, "open_until": 0})
+
+    def record_failure(self):
+        """Open the breaker for this process and back off the other processes."""
+        self.open = True
+        state = read_json(self.state_file, {})
+        failures = state.get("failures", 0) + 1
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (failures - 1))
+        write_json(self.state_file, {"failures": failures, "open_until": time.time() + backoff})
+
+class TranslationCache:
+    """Translations remembered across commands, keyed by language then message."""
+
+    def __init__(self, cache_file=CACHE_FILE):
+        self.cache_file = cache_file
+        self.entries = None
+
+    def get(self, message, target_lang):
+        if self.entries is None:
+            self.entries = read_json(self.cache_file, {})
+        return self.entries.get(target_lang, {}).get(message)
+
+    def put(self, message, target_lang, translated):
+        if self.entries is None:
+            self.entries = read_json(self.cache_file, {})
+        self.entries.setdefault(target_lang, {})[message] = translated
+        write_json(self.cache_file, self.entries)
+
+# Placeholder Check
+def field_names(template):
+    """Set of {placeholder} names in a str.format template, or None if it does not parse."""
+    try:
+        return {field for _literal, field, _spec, _conversion in Formatter().parse(template) if field is not None}
+    except ValueError:
+        return None
+
+def same_fields(message, translated):
+    """A translator may translate or drop a {placeholder}; such a template cannot be formatted."""
+    return field_names(translated) == field_names(message)
+
+# Guarded Translate
+def guarded_translate(message, target_lang, translator_factory, breaker, cache, timeout=CALL_TIMEOUT_SECONDS):
+    """Translate through the cache and the breaker, falling back to English.
+
+    A translation whose placeholders differ from the message is never cached or returned.
+    """
+    cached = cache.get(message, target_lang)
+    if cached is not None and same_fields(message, cached):
+        return cached
+    if not breaker.allow():
+        return message
+    try:
+        translated = call_with_timeout(
+            lambda: translator_factory(source="en", target=target_lang).translate(message),
+            min(timeout, breaker.remaining()),
+        )
+    except Exception:
+        breaker.record_failure()
+        return message
+    breaker.record_success()
+    if translated and same_fields(message, translated):
+        cache.put(message, target_lang, translated)
+        return translated
+    return message
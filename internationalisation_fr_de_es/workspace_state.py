@@ -0,0 +1,175 @@
+"""
+WORKSPACE STATE FILE
+
+Snapshot of every clone in a workspace (HEAD SHA, branch, last fetch, file
+index version, dirty flag) kept in <active_path>/.workspace_state.json. A
+snapshot is trusted while the mtimes of .git/HEAD, the branch ref and
+.git/index are unchanged, so status queries need no git process. The dirty
+flag comes from the change tracker; when it cannot tell, git status runs
+only once a status query asks for the flag.
+"""
+
+import os
+import json
+import time
+import argparse
+import subprocess
+import change_tracker
+import cobol_index
+import tracing
+
+STATE_FILE_NAME = ".workspace_state.json"
+
+# State File
+def state_path_for(active_path):
+    return os.path.join(active_path, STATE_FILE_NAME)
+
+def load_state(active_path):
+    try:
+        with open(state_path_for(active_path), "r", encoding="utf-8") as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return {"repos": {}}
+
+def save_state(active_path, state):
+    state_path = state_path_for(active_path)
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as state_file:
+        json.dump(state, state_file, indent=1, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+# Git Directory
+def git_dir_for(repo_path):
+    """Return the git directory of a clone, following a 'gitdir:' file; None if not a repo."""
+    dot_git = os.path.join(repo_path, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        with open(dot_git, "r", encoding="utf-8") as git_file:
+            line = git_file.readline().strip()
+    except OSError:
+        return None
+    if line.startswith("gitdir:"):
+        return os.path.normpath(os.path.join(repo_path, line[7:].strip()))
+    return None
+
+def mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+# Read HEAD
+def read_head(git_dir):
+    """Return (branch or None, sha or None) straight from the ref files."""
+    with open(os.path.join(git_dir, "HEAD"), "r", encoding="utf-8") as head_file:
+        head = head_file.read().strip()
+    if not head.startswith("ref:"):
+        return None, head  # Detached HEAD
+    ref = head[4:].strip()
+    branch = ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+    try:
+        with open(os.path.join(git_dir, ref), "r", encoding="utf-8") as ref_file:
+            return branch, ref_file.read().strip()
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(git_dir, "packed-refs"), "r", encoding="utf-8") as packed:
+            for line in packed:
+                sha, _sep, name = line.strip().partition(" ")
+                if name == ref:
+                    return branch, sha
+    except OSError:
+        pass
+    return branch, None  # Unborn branch
+
+# Validators
+def validators(git_dir, branch):
+    """mtimes that change whenever HEAD, the branch tip, the index or a fetch change."""
+    ref_path = os.path.join(git_dir, "refs", "heads", branch) if branch else None
+    return {
+        "head": mtime_ns(os.path.join(git_dir, "HEAD")),
+        "ref": mtime_ns(ref_path) if ref_path else None,
+        "packed_refs": mtime_ns(os.path.join(git_dir, "packed-refs")),
+        "index": mtime_ns(os.path.join(git_dir, "index")),
+        "fetch_head": mtime_ns(os.path.join(git_dir, "FETCH_HEAD")),
+    }
+
+# Build Snapshot
+def build_snapshot(repo_path, git_dir, previous=None):
+    """Read HEAD from the ref files; dirty is None unless the change tracker knows it is clean."""
+    branch, sha = read_head(git_dir)
+    fetch_mtime = mtime_ns(os.path.join(git_dir, "FETCH_HEAD"))
+    return {
+        "head_sha": sha,
+        "branch": branch,
+        "last_fetch": fetch_mtime / 1e9 if fetch_mtime else (previous or {}).get("last_fetch"),
+        "file_index_version": mtime_ns(cobol_index.index_path_for(repo_path)),
+        "dirty": False if change_tracker.has_changes(repo_path) is False else None,
+        "updated": time.time(),
+        "validators": validators(git_dir, branch),
+    }
+
+# Dirty Flag
+def git_dirty(repo_path):
+    """Ask git status whether the work tree has changes; None if git fails."""
+    result = tracing.run(['git', '--no-optional-locks', '-C', repo_path, 'status', '--porcelain'], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    return bool(result.stdout.strip()) if result.returncode == 0 else None
+
+# Get Snapshot
+def snapshot(active_path, repo_name, refresh=False, need_dirty=False):
+    """Return the repo snapshot, rebuilding it only if it is stale (or refresh is set).
+
+    With need_dirty an unknown dirty flag is filled in from git status.
+    Returns None when the folder is not a git repository.
+    """
+    repo_path = os.path.join(active_path, repo_name)
+    git_dir = git_dir_for(repo_path)
+    if git_dir is None:
+        return None
+    state = load_state(active_path)
+    cached = state["repos"].get(repo_name)
+    if not cached or refresh or cached["validators"] != validators(git_dir, cached["branch"]):
+        cached = state["repos"][repo_name] = build_snapshot(repo_path, git_dir, cached)
+    elif not need_dirty or cached["dirty"] is not None:
+        return cached
+    if need_dirty and cached["dirty"] is None:
+        cached["dirty"] = git_dirty(repo_path)
+    save_state(active_path, state)
+    return cached
+
+# Record After Command
+def record(active_path, repo_name, fetched=False):
+    """Refresh the snapshot after a git command; mark the fetch time when it fetched."""
+    current = snapshot(active_path, repo_name, refresh=True)
+    if current is not None and fetched:
+        state = load_state(active_path)
+        state["repos"][repo_name]["last_fetch"] = time.time()
+        save_state(active_path, state)
+        current["last_fetch"] = state["repos"][repo_name]["last_fetch"]
+    return current
+
+# Forget Repository
+def forget(active_path, repo_name):
+    """Drop a repo from the snapshot file (e.g. after its folder is deleted)."""
+    state = load_state(active_path)
+    if state["repos"].pop(repo_name, None) is not None:
+        save_state(active_path, state)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Answer status queries from the workspace snapshot.")
+    parser.add_argument("query", choices=["status", "branch"], help="What to report")
+    parser.add_argument("active_path", type=str, help="Workspace folder holding the clones")
+    parser.add_argument("repo_name", type=str, help="Repository name")
+    parser.add_argument("--refresh", action="store_true", help="Ignore the snapshot and ask git")
+
+    args = parser.parse_args()
+    current = snapshot(args.active_path, args.repo_name, args.refresh, need_dirty=args.query == "status")
+    if current is None:
+        print(f"{args.repo_name} is not a git repository")
+    elif args.query == "branch":
+        print(current["branch"] or current["head_sha"])
+    else:
+        print(json.dumps({key: value for key, value in current.items() if key != "validators"}, indent=1))
+
+#  python3 workspace_state.py branch /Users/thrisham/Desktop/cobol_code/Internationalization MortgageApplication